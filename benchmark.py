@@ -0,0 +1,179 @@
+"""Headless rendering benchmark for PySlot.
+
+Builds the real SlotMachineGame on SDL's dummy video and audio drivers at
+one or more resolutions, scripts a few scenarios and times every frame
+(update + draw) with the game's FrameProfiler. Results are printed as a
+table, or as JSON with --json / --output so runs can be compared.
+
+    python3 benchmark.py --resolutions 1080p 1440p 4k --json
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import json
+import platform
+import random
+import sys
+import time
+
+import numpy as np
+import pygame
+
+import slotmachine
+from pyslot.engine import GAME, SlotEngine
+from pyslot.model import DEFAULT_GAME, load_game
+
+RESOLUTIONS = {
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    '1440p': (2560, 1440),
+    '4k': (3840, 2160),
+}
+BANKROLL = 10 ** 9
+
+
+def set_grid(game, grid):
+    """Pay for a spin, force its grid and settle it like a stopped spin"""
+    game.engine.start_spin()
+    game.engine.set_grid(grid)
+    game.check_wins()
+
+
+def idle(game, frame):
+    """Main screen with nothing happening"""
+
+
+def spinning(game, frame):
+    """Reels spinning at full speed, never reaching their stop"""
+    if not game.spinning:
+        game.start_spin()
+    game.reel_left = [max(left, 1000) for left in game.reel_left]
+
+
+def nine_line_win(game, frame):
+    """Five of a kind on all nine lines: win lines, particles and win message"""
+    if game.win_animation_timer <= 1:
+        model = game.engine.game
+        set_grid(game, [[model.symbols[0]] * model.rows] * model.reels)
+
+
+def bonus(game, frame):
+    """Scatter bonus trigger animation, retriggered as it ends"""
+    if game.bonus_animation_timer <= 1:
+        model = game.engine.game
+        set_grid(game, [[model.scatter] + [model.symbols[reel + 1]] * (model.rows - 1) for reel in range(model.reels)])
+
+
+def transition(game, frame):
+    """Back and forth between the main and bet configuration screens"""
+    if not game.transitioning:
+        game.start_transition("bet_config" if game.screen_state == "main" else "main")
+
+
+SCENARIOS = {
+    'idle': idle,
+    'spin': spinning,
+    'win_9_lines': nine_line_win,
+    'bonus': bonus,
+    'transition': transition,
+}
+
+
+def run_scenario(game, scenario, frames, warmup):
+    """Play `warmup` + `frames` frames of a scenario; returns the timing summary"""
+    profiler = slotmachine.FrameProfiler(history=frames)
+    game.profiler = profiler
+    for frame in range(warmup + frames):
+        if frame == warmup:
+            start = time.perf_counter()
+            profiler.frames = 0
+        scenario(game, frame)
+        profiler.start()
+        game.handle_events()
+        profiler.lap('events')
+        game.update_spin_animation()
+        profiler.lap('update')
+        game.update_transition()
+        profiler.lap('transition')
+        game.draw()
+        profiler.end_frame()
+    elapsed = time.perf_counter() - start
+
+    times = profiler.recent(frames)
+    total = times.sum(axis=1)
+    p50, p90, p99 = np.percentile(total, [50, 90, 99]).tolist()
+    phases = {name: {'p50': low, 'p99': high} for name, (low, high) in profiler.percentiles(frames).items()
+              if name not in ('work', 'frame', 'wait')}
+    return {
+        'frames': frames,
+        'fps': frames / elapsed,
+        'mean_ms': float(total.mean()),
+        'p50_ms': p50,
+        'p90_ms': p90,
+        'p99_ms': p99,
+        'max_ms': float(total.max()),
+        'phases': phases,
+    }
+
+
+def run(resolutions, scenarios=tuple(SCENARIOS), frames=300, warmup=30, low_power=False, seed=0, model=GAME):
+    """Benchmark every scenario at every resolution; returns a JSON-ready dict"""
+    results = {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'video_driver': os.environ.get("SDL_VIDEODRIVER"),
+        'low_power': low_power,
+        'game': model.name,
+        'frames': frames,
+        'warmup': warmup,
+        'results': {},
+    }
+    for name in resolutions:
+        size = RESOLUTIONS.get(name.lower()) or tuple(int(v) for v in name.lower().split("x"))
+        label = f"{size[0]}x{size[1]}"
+        slotmachine.init_display(size)
+        by_scenario = {}
+        for scenario in scenarios:
+            # Fresh game per scenario so leftover particles and timers don't leak between them
+            random.seed(seed)
+            game = slotmachine.SlotMachineGame(SlotEngine(BANKROLL, seed=seed, game=model), dirty_rendering=low_power)
+            by_scenario[scenario] = run_scenario(game, SCENARIOS[scenario], frames, warmup)
+            print(f"  {label} {scenario:<12} {by_scenario[scenario]['fps']:8.1f} fps", file=sys.stderr)
+        results['results'][label] = by_scenario
+    pygame.quit()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Headless PySlot rendering benchmark")
+    parser.add_argument("--resolutions", nargs="+", default=['1080p', '1440p', '4k'],
+                        help="720p, 1080p, 1440p, 4k or WIDTHxHEIGHT")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--game", default=DEFAULT_GAME, help="game definition file or bundled game name")
+    parser.add_argument("--low-power", action="store_true", help="benchmark dirty-rectangle rendering")
+    parser.add_argument("--json", action="store_true", help="print the full results as JSON")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = run(args.resolutions, args.scenarios, args.frames, args.warmup, args.low_power, args.seed,
+                  load_game(args.game))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'resolution':<11} {'scenario':<12} {'fps':>8} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for label, by_scenario in results['results'].items():
+            for scenario, stats in by_scenario.items():
+                print(f"{label:<11} {scenario:<12} {stats['fps']:8.1f} {stats['p50_ms']:8.2f} "
+                      f"{stats['p90_ms']:8.2f} {stats['p99_ms']:8.2f} {stats['max_ms']:8.2f}")
@@ -0,0 +1,6 @@
+"""PySlot game logic and tooling.
+
+The modules in this package never touch the display or the mixer, so they
+can be imported by simulations and services without initializing SDL.
+The pygame front end lives in slotmachine.py at the repository root.
+"""
@@ -0,0 +1,237 @@
+"""Vectorized batch spin simulator.
+
+Generates many grids at once as integer symbol IDs (one stop per reel
+strip, drawn by the game's alias-table sampler) and scores every active
+win line with NumPy, following the same rules as ``engine.evaluate_grid``:
+a left-to-right run of ``min_match`` or more matching symbols pays
+``pay * bet_per_line * match_count`` and enough scatters anywhere pay the
+scatter pay per scatter and award free spins. Every function takes the
+compiled game (``pyslot.model.GameModel``) to play, the default game
+unless told otherwise.
+
+Only the per-spin outcome is simulated here. The win streak multiplier and
+the free-spin bonus multiplier depend on the spins before, so they are left
+to the engine (or the session simulators).
+"""
+import numpy as np
+
+from pyslot.engine import GAME
+from pyslot.model import BLANK, DEFAULT_GAME, load_game
+
+DEFAULT_CHUNK = 1 << 18
+
+
+def line_cells(lines, game=GAME):
+    """Flat grid indices (reel * rows + row) of the cells on the first ``lines`` win lines"""
+    return game.line_cells[:lines]
+
+
+def random_grids(n, rng=None, game=GAME):
+    """Draw ``n`` grids of symbol IDs, shaped (n, reels, rows)"""
+    return random_cells(n, rng, game=game).T.reshape(n, game.reels, game.rows)
+
+
+def random_stops(n, rng=None, sampler=None, game=GAME):
+    """Draw ``n`` reel outcomes per reel, shape (reels, n); see outcomes()"""
+    sampler = sampler if sampler is not None else game.stop_sampler
+    return sampler.draw(n, rng)
+
+
+def outcomes(draws, game=GAME):
+    """Split (reels, n) sampler draws into stops and heights (None when every spin has the game's fixed heights)"""
+    if game.fixed_heights:
+        return draws, None
+    stops, options = np.divmod(draws, np.array(game.height_options, dtype=draws.dtype)[:, None])
+    heights = np.stack([np.array(choices, dtype=np.intp)[option]
+                        for choices, option in zip(game.reel_heights, options)])
+    return stops, heights
+
+
+def cells_at(stops, game=GAME, heights=None):
+    """Cell-major grids for (reels, n) stops: shape (reels * rows, n); cells below a reel's height are BLANK"""
+    rows = game.rows
+    cells = np.empty((game.reels * rows, stops.shape[1]), dtype=np.uint8)
+    for reel, strip in enumerate(game.strip_arrays):
+        for row in range(rows):
+            cell = cells[reel * rows + row]
+            if heights is None and row >= game.heights[reel]:
+                cell.fill(BLANK)
+                continue
+            np.take(strip, stops[reel] + row, out=cell)
+            if heights is not None:
+                cell[heights[reel] <= row] = BLANK
+    return cells
+
+
+def random_cells(n, rng=None, sampler=None, game=GAME):
+    """Draw ``n`` grids cell-major: shape (reels * rows, n), one contiguous row per cell"""
+    stops, heights = outcomes(random_stops(n, rng, sampler, game), game)
+    return cells_at(stops, game, heights)
+
+
+class BatchResult:
+    """Per-spin arrays for a batch of evaluated grids"""
+
+    def __init__(self, line_wins, match_counts, line_symbols, scatter_count, bet_per_line, game=GAME):
+        self.line_wins = line_wins          # (n, lines) win per line
+        self.match_counts = match_counts    # (n, lines) paying run length, 0 if the line lost
+        self.line_symbols = line_symbols    # (n, lines) symbol ID on the first reel of each line
+        self.scatter_count = scatter_count  # (n,)
+        triggered = scatter_count >= game.scatter_trigger
+        extra = scatter_count.astype(np.int64) - game.scatter_trigger
+        self.bonus_spins = np.where(triggered, game.free_spins + extra * game.free_spins_per_extra_scatter, 0)
+        scatter_pay = game.paytable[game.scatter_id] * bet_per_line
+        self.scatter_win = np.where(triggered, scatter_pay * scatter_count.astype(np.int64), 0)
+        self.total_win = line_wins.sum(axis=1) + self.scatter_win
+
+    def __len__(self):
+        return len(self.total_win)
+
+
+def evaluate_batch(grids, lines=None, bet_per_line=1, game=GAME):
+    """Score a (n, reels, rows) array of symbol IDs on the first ``lines`` win lines"""
+    n = len(grids)
+    cells = np.ascontiguousarray(np.asarray(grids, dtype=np.uint8).reshape(n, game.reels * game.rows).T)
+    return evaluate_cells(cells, lines, bet_per_line, game)
+
+
+def evaluate_cells(cells, lines=None, bet_per_line=1, game=GAME):
+    """Score cell-major grids as returned by random_cells()"""
+    if game.ways:
+        return evaluate_ways_cells(cells, bet_per_line, game)
+    lines = game.bet_lines(lines)
+    n = cells.shape[1]
+    match_counts = np.empty((lines, n), dtype=np.uint8)
+    firsts = np.empty((lines, n), dtype=np.uint8)
+    line_wins = np.empty((lines, n), dtype=np.int64)
+    for line, line_idx in enumerate(line_cells(lines, game)):
+        first = cells[line_idx[0]]
+        still_matching = np.ones(n, dtype=bool)
+        run = np.ones(n, dtype=np.uint8)
+        for reel in range(1, game.reels):
+            still_matching &= cells[line_idx[reel]] == first
+            run += still_matching
+        np.multiply(run, run >= game.min_match, out=match_counts[line])
+        np.multiply(game.paytable[first], match_counts[line], out=line_wins[line])
+        firsts[line] = first
+
+    if bet_per_line != 1:
+        line_wins *= bet_per_line
+    scatter_count = np.count_nonzero(cells == game.scatter_id, axis=0)
+    return BatchResult(line_wins.T, match_counts.T, firsts.T, scatter_count, bet_per_line, game)
+
+
+def evaluate_ways_cells(cells, bet_per_line=1, game=GAME):
+    """Score cell-major grids of a ways game.
+
+    Per-reel symbol counts come from one bincount over the reel's cells;
+    the run and way count of every symbol then take reels x symbols array
+    steps, so the cost does not depend on how many ways the grid has. The
+    per-line arrays of the result hold one column per symbol instead.
+    """
+    n = cells.shape[1]
+    rows = game.rows
+    symbol_count = len(game.symbols)
+    width = symbol_count + 1  # Last column collects BLANK cells
+    offsets = np.arange(n, dtype=np.intp) * width
+
+    ways = None
+    for reel in range(game.reels):
+        block = np.minimum(cells[reel * rows:(reel + 1) * rows], symbol_count).astype(np.intp)
+        counts = np.bincount((block + offsets).ravel(), minlength=n * width).reshape(n, width)[:, :symbol_count]
+        if ways is None:
+            ways = counts.astype(np.int64)
+            run = (counts > 0).astype(np.uint8)
+            alive = counts > 0
+            continue
+        alive &= counts > 0
+        ways = np.where(alive, ways * counts, ways)
+        run += alive
+
+    paying = run >= game.min_match
+    paying[:, game.scatter_id] = False
+    match_counts = np.where(paying, run, 0).astype(np.uint8)
+    wins = game.paytable * match_counts * np.where(paying, ways, 0)
+    if bet_per_line != 1:
+        wins *= bet_per_line
+    firsts = np.broadcast_to(np.arange(symbol_count, dtype=np.uint8), (n, symbol_count))
+    scatter_count = np.count_nonzero(cells == game.scatter_id, axis=0)
+    return BatchResult(wins, match_counts, firsts, scatter_count, bet_per_line, game)
+
+
+def spin_batch(n, lines=None, bet_per_line=1, rng=None, game=GAME):
+    """Draw and score ``n`` spins; returns (grids, BatchResult) with grids shaped (n, reels, rows)"""
+    cells = random_cells(n, rng, game=game)
+    return cells.T.reshape(n, game.reels, game.rows), evaluate_cells(cells, lines, bet_per_line, game)
+
+
+def simulate(spins, lines=None, bet_per_line=1, seed=None, chunk_size=DEFAULT_CHUNK, game=GAME):
+    """Estimate per-spin RTP and hit rates over ``spins`` spins.
+
+    Works in chunks so memory stays bounded. Returns a dict of totals and
+    rates; ``rtp`` is total win over total bet with no streak or free-spin
+    multipliers applied.
+    """
+    lines = game.bet_lines(lines)
+    rng = np.random.default_rng(seed)
+    total_win = 0
+    hits = 0
+    bonus_hits = 0
+    bonus_spins = 0
+    line_win = 0
+    scatter_win = 0
+    # Hits per (symbol, match count)
+    symbol_hits = np.zeros((len(game.symbols), game.reels + 1), dtype=np.int64)
+
+    done = 0
+    while done < spins:
+        n = min(chunk_size, spins - done)
+        result = evaluate_cells(random_cells(n, rng, game=game), lines, bet_per_line, game)
+        total_win += int(result.total_win.sum())
+        line_win += int(result.line_wins.sum())
+        scatter_win += int(result.scatter_win.sum())
+        hits += int(np.count_nonzero(result.total_win))
+        bonus_hits += int(np.count_nonzero(result.bonus_spins))
+        bonus_spins += int(result.bonus_spins.sum())
+
+        keys = result.line_symbols.astype(np.intp) * (game.reels + 1) + result.match_counts
+        symbol_hits += np.bincount(keys.ravel(), minlength=symbol_hits.size).reshape(symbol_hits.shape)
+        done += n
+
+    total_bet = spins * lines * bet_per_line
+    return {
+        'spins': spins,
+        'lines': lines,
+        'bet_per_line': bet_per_line,
+        'total_bet': total_bet,
+        'total_win': total_win,
+        'line_win': line_win,
+        'scatter_win': scatter_win,
+        'rtp': total_win / total_bet if total_bet else 0.0,
+        'hit_rate': hits / spins if spins else 0.0,
+        'bonus_rate': bonus_hits / spins if spins else 0.0,
+        'bonus_spins': bonus_spins,
+        'symbol_hits': {symbol: symbol_hits[i, game.min_match:].tolist() for i, symbol in enumerate(game.symbols)},
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Estimate PySlot RTP with the batch simulator")
+    parser.add_argument("--spins", type=int, default=10_000_000)
+    parser.add_argument("--game", default=DEFAULT_GAME, help="game definition file or bundled game name")
+    parser.add_argument("--lines", type=int, default=None, help="active lines (default: all)")
+    parser.add_argument("--bet", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = simulate(args.spins, args.lines, args.bet, args.seed, game=load_game(args.game))
+    elapsed = time.perf_counter() - start
+
+    print(f"Spins:      {stats['spins']:,} ({stats['spins'] / elapsed:,.0f} spins/sec)")
+    print(f"RTP:        {stats['rtp']:.4%}")
+    print(f"Hit rate:   {stats['hit_rate']:.4%}")
+    print(f"Bonus rate: {stats['bonus_rate']:.4%}")
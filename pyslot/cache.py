@@ -0,0 +1,110 @@
+"""On-disk cache for startup assets.
+
+Stores NumPy buffers (synthesized sound PCM) under a key derived from the
+parameters that produced them, and small JSON values (the resolved emoji
+font) in an index file. Anything missing, unreadable or stale is a cache
+miss: callers rebuild the asset and store it again, so a damaged or
+deleted cache only costs startup time.
+
+The default location is $XDG_CACHE_HOME/pyslot (~/.cache/pyslot).
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Bump to invalidate every cached asset after a format change
+CACHE_VERSION = 1
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "pyslot")
+
+
+def cache_key(*parts):
+    """Stable hex digest of JSON-serializable parameters"""
+    text = json.dumps([CACHE_VERSION, *parts], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:20]
+
+
+def file_signature(path):
+    """(size, mtime_ns) of a file, or None if it is gone"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class AssetCache:
+    """Key/value asset cache in one directory; every failure is a miss"""
+
+    INDEX = "index.json"
+
+    def __init__(self, directory=None, enabled=True):
+        self.directory = directory or default_cache_dir()
+        self.enabled = enabled
+        self._index = None
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _write(self, name, write):
+        """Write a file atomically: a crash mid-write never leaves a truncated entry"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = self._path(f".{name}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                write(f)
+            os.replace(tmp, self._path(name))
+        except OSError:
+            return False
+        return True
+
+    def load_array(self, name, key, dtype=None, shape=None):
+        """Cached array stored under (name, key), or None"""
+        if not self.enabled:
+            return None
+        try:
+            array = np.load(self._path(f"{name}-{key}.npy"), allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        if dtype is not None and array.dtype != dtype:
+            return None
+        if shape is not None and array.shape != tuple(shape):
+            return None
+        return array
+
+    def save_array(self, name, key, array):
+        if not self.enabled:
+            return False
+        return self._write(f"{name}-{key}.npy", lambda f: np.save(f, np.ascontiguousarray(array)))
+
+    @property
+    def index(self):
+        if self._index is None:
+            try:
+                with open(self._path(self.INDEX), encoding="utf-8") as f:
+                    self._index = json.load(f)
+                if not isinstance(self._index, dict) or self._index.get('version') != CACHE_VERSION:
+                    self._index = {}
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def get(self, name, default=None):
+        """Small JSON value stored under name"""
+        if not self.enabled:
+            return default
+        return self.index.get('values', {}).get(name, default)
+
+    def set(self, name, value):
+        if not self.enabled:
+            return False
+        index = self.index
+        index['version'] = CACHE_VERSION
+        index.setdefault('values', {})[name] = value
+        data = json.dumps(index, indent=2, ensure_ascii=False).encode("utf-8")
+        return self._write(self.INDEX, lambda f: f.write(data))
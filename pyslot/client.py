@@ -0,0 +1,126 @@
+"""Blocking client for pyslot.server, and a remote stand-in for SlotEngine.
+
+RemoteEngine has the attributes and methods the pygame front end uses on a
+SlotEngine, but every spin, bet and line change goes to a server session:
+the game plays there and the front end only renders it. The game
+definition is loaded locally, by name, for symbols and reel strips to
+draw, so client and server need the same bundled games.
+
+    python slotmachine.py --server 127.0.0.1:7777 --game megaways
+"""
+import json
+import socket
+
+from pyslot.model import DEFAULT_GAME, load_game
+from pyslot.server import STATE_FIELDS, parse_address
+
+
+class ServerError(ValueError):
+    """The server refused a request"""
+
+
+class Connection:
+    """One line-delimited JSON connection to a game server"""
+
+    def __init__(self, address, timeout=10.0):
+        kind, where = parse_address(address)
+        if kind == "unix":
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.sock = socket.socket(socket.AF_INET6 if ":" in where[0] else socket.AF_INET, socket.SOCK_STREAM)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.settimeout(timeout)
+        self.sock.connect(where)
+        self.file = self.sock.makefile("rb")
+
+    def request(self, op, **fields):
+        """Send one request and return its response; raises ServerError when the server refused it"""
+        self.sock.sendall((json.dumps({'op': op, **fields}, separators=(',', ':')) + "\n").encode("utf-8"))
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        response = json.loads(line)
+        if not response.get('ok') and 'played' not in response:
+            raise ServerError(response.get('error', "request failed"))
+        return response
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+class RemoteResult:
+    """SpinResult fields of a spin settled on the server"""
+
+    def __init__(self, result):
+        self.__dict__.update(result)
+        self.bonus_triggered = self.bonus_spins > 0
+
+
+class RemoteEngine:
+    """SlotEngine look-alike whose game state lives in a server session"""
+
+    def __init__(self, address, game=DEFAULT_GAME, coins=None, seed=None):
+        self.game = load_game(game)
+        self.strips = self.game.strips
+        self.connection = Connection(address)
+        # The server picks the bankroll and seed unless it trusts its clients (--trust-clients)
+        fixed = {key: value for key, value in (('coins', coins), ('seed', seed)) if value is not None}
+        opened = self.connection.request('open', game=game, **fixed)
+        self.session = opened['session']
+        self._apply(opened)
+        self._settled = None
+        # No local journal or recording: the server owns the session
+        self.journal = None
+        self.recorder = None
+        self.stats = None
+
+    def _apply(self, view):
+        for field in STATE_FIELDS:
+            setattr(self, field, view['state'][field])
+        if 'grid' in view:
+            self.grid = view['grid']
+            self.stops = view['stops']
+            self.heights = view['heights']
+
+    def set_lines(self, lines):
+        self._apply(self.connection.request('lines', session=self.session, lines=lines))
+        return self.lines
+
+    def set_bet(self, bet_per_line):
+        self._apply(self.connection.request('bet', session=self.session, bet=bet_per_line))
+        return self.bet_per_line
+
+    def start_spin(self):
+        """Play a spin on the server; shows the stake now and keeps the result for settle()"""
+        response = self.connection.request('spin', session=self.session)
+        if not response['played']:
+            return None
+        self._settled = response
+        for field, value in response['staked'].items():
+            setattr(self, field, value)
+        self.grid = response['grid']
+        self.stops = response['stops']
+        self.heights = response['heights']
+        return self.grid
+
+    def settle(self):
+        """Result of the spin started last, with the settled state applied"""
+        response, self._settled = self._settled, None
+        self._apply(response)
+        result = RemoteResult(response['result'])
+        if self.stats is not None:
+            self.stats.add(result.final_win, self.total_bet, result.free_spin)
+        return result
+
+    def spin(self):
+        if self.start_spin() is None:
+            return None
+        return self.settle()
+
+    def close(self):
+        try:
+            self.connection.request('close', session=self.session)
+        except (OSError, ValueError):
+            pass
+        self.connection.close()
@@ -0,0 +1,314 @@
+"""Headless slot machine engine.
+
+Holds the spin RNG, line and ways evaluation, the scatter/free-spin bonus
+and the win streak multiplier ladder. The numbers (grid size, symbols,
+pays, lines, strips) come from a compiled game definition (pyslot.model),
+and spins are scored on integer symbol IDs. Nothing here imports pygame,
+so a spin can be scored in a plain Python process.
+
+Importing the module loads nothing else: the default game (and with it
+NumPy) is compiled the first time it is needed, by default_game(), by a
+SlotEngine or evaluation without ``game``, or by reading GAME or one of
+the module constants that mirror it.
+"""
+STARTING_COINS = 1000
+
+# The default game's numbers, as module constants (GAME is the compiled game);
+# resolved on first access, see __getattr__
+DEFAULT_GAME_CONSTANTS = {
+    'REELS': 'reels',
+    'ROWS': 'rows',
+    'MIN_BET': 'min_bet',
+    'MAX_BET': 'max_bet',
+    'symbols': 'symbols',                              # Slot symbols (see pyslot/games/classic.json)
+    'symbol_rewards': 'rewards',                       # Line pay per symbol
+    'SCATTER': 'scatter',
+    'WIN_LINES': 'win_lines',                          # Row index on each reel, per win line
+    'MIN_MATCH': 'min_match',                          # Symbols in a row needed for a line win
+    'SCATTER_TRIGGER': 'scatter_trigger',              # Scatters needed to award free spins
+    'FREE_SPIN_MULTIPLIER': 'free_spin_multiplier',    # Extra multiplier on wins during free spins
+    'STREAK_MULTIPLIERS': 'streak_multipliers',        # (minimum win streak, multiplier), highest first
+    'REEL_STRIPS': 'strips',                           # One strip per reel
+    'REEL_STOP_WEIGHTS': 'stop_weights',               # Optional per-stop weights (virtual reels)
+}
+
+_default_game = None
+
+
+def default_game():
+    """The bundled default game, compiled on first use"""
+    global _default_game
+    if _default_game is None:
+        # Compiling a game needs NumPy; importing the engine does not
+        from pyslot.model import DEFAULT_GAME, load_game
+        _default_game = load_game(DEFAULT_GAME)
+    return _default_game
+
+
+def __getattr__(name):
+    if name == 'GAME':
+        return default_game()
+    if name in DEFAULT_GAME_CONSTANTS:
+        return getattr(default_game(), DEFAULT_GAME_CONSTANTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def multiplier_for_streak(win_streak, game=None):
+    """Return the streak multiplier for the given number of consecutive wins"""
+    if game is None:
+        game = default_game()
+    return game.multiplier_for_streak(win_streak)
+
+
+def bonus_spins_for_scatters(scatter_count, game=None):
+    """Free spins awarded for a scatter count"""
+    if game is None:
+        game = default_game()
+    return game.bonus_spins_for_scatters(scatter_count)
+
+
+def count_scatters(grid_ids, game=None):
+    """Count scatter symbols anywhere on a grid of symbol IDs"""
+    if game is None:
+        game = default_game()
+    scatter_id = game.scatter_id
+    return sum(column.count(scatter_id) for column in grid_ids)
+
+
+def evaluate_lines(grid_ids, lines, bet_per_line, game=None):
+    """Score the first ``lines`` win lines of a grid of symbol IDs, left to right"""
+    if game is None:
+        game = default_game()
+    winning_lines = []
+    pays = game.pays
+    min_match = game.min_match
+    for line_idx in range(lines):
+        line = game.win_lines[line_idx]
+        first_symbol = grid_ids[0][line[0]]
+        match_count = 1
+
+        for reel in range(1, game.reels):
+            if grid_ids[reel][line[reel]] == first_symbol:
+                match_count += 1
+            else:
+                break
+
+        if match_count >= min_match:
+            winning_lines.append({
+                'line_idx': line_idx,
+                'line': line,
+                'symbol': game.symbols[first_symbol],
+                'count': match_count,
+                'win': pays[first_symbol] * bet_per_line * match_count
+            })
+    return winning_lines
+
+
+def evaluate_ways(grid_ids, bet_per_line, game=None):
+    """Score every symbol on adjacent reels from the left, in any row.
+
+    A symbol found on the first ``k >= min_match`` reels pays
+    ``pay * k * ways``, where ``ways`` is the product of its per-reel
+    counts: one pass over the cells plus reels x symbols work, however
+    many ways the grid has.
+    """
+    if game is None:
+        game = default_game()
+    symbol_count = len(game.symbols)
+    counts = []
+    for column in grid_ids:
+        reel_counts = [0] * symbol_count
+        for symbol_id in column:
+            reel_counts[symbol_id] += 1
+        counts.append(reel_counts)
+
+    winning_ways = []
+    pays = game.pays
+    for symbol_id in game.way_ids:
+        ways = 1
+        match_count = 0
+        for reel_counts in counts:
+            count = reel_counts[symbol_id]
+            if not count:
+                break
+            ways *= count
+            match_count += 1
+
+        if match_count >= game.min_match:
+            winning_ways.append({
+                'symbol_id': symbol_id,
+                # First matching row on every matched reel, for drawing
+                'line': [grid_ids[reel].index(symbol_id) for reel in range(match_count)],
+                'symbol': game.symbols[symbol_id],
+                'count': match_count,
+                'ways': ways,
+                'win': pays[symbol_id] * bet_per_line * match_count * ways
+            })
+    return winning_ways
+
+
+class SpinResult:
+    """Outcome of one evaluated grid, filled in further when a spin is settled"""
+
+    def __init__(self, grid, winning_lines, scatter_count, bet_per_line, game=None):
+        if game is None:
+            game = default_game()
+        self.grid = grid
+        self.winning_lines = winning_lines
+        self.scatter_count = scatter_count
+        self.line_win = sum(win['win'] for win in winning_lines)
+        self.bonus_spins = game.bonus_spins_for_scatters(scatter_count)
+        self.bonus_triggered = self.bonus_spins > 0
+        self.scatter_win = game.pays[game.scatter_id] * scatter_count * bet_per_line if self.bonus_triggered else 0
+        self.total_win = self.line_win + self.scatter_win
+
+        # Set by SlotEngine.settle
+        self.free_spin = False
+        self.total_bet = 0
+        self.win_streak = 0
+        self.multiplier = 1
+        self.multiplier_increased = False
+        self.final_multiplier = 1
+        self.final_win = 0
+        self.coins = 0
+
+
+def evaluate_ids(grid, grid_ids, lines, bet_per_line, game=None):
+    """Score a grid given as symbols and as symbol IDs"""
+    if game is None:
+        game = default_game()
+    if game.ways:
+        winning_lines = evaluate_ways(grid_ids, bet_per_line, game)
+    else:
+        winning_lines = evaluate_lines(grid_ids, lines, bet_per_line, game)
+    return SpinResult(grid, winning_lines, count_scatters(grid_ids, game), bet_per_line, game)
+
+
+def evaluate_grid(grid, lines, bet_per_line, game=None):
+    """Score a grid of symbols without touching any session state"""
+    if game is None:
+        game = default_game()
+    return evaluate_ids(grid, game.ids_for(grid), lines, bet_per_line, game)
+
+
+class SlotEngine:
+    """Session state for one player: coins, bet, streak and free spins"""
+
+    def __init__(self, coins=STARTING_COINS, seed=None, game=None):
+        if game is None:
+            game = default_game()
+        self.game = game
+        self.strips = game.strips
+        self.sampler = game.sampler(seed)
+
+        self.coins = coins
+        self.bet_per_line = 1
+        self.min_bet = game.min_bet
+        self.max_bet = game.max_bet
+        self.lines = game.max_lines
+        self.total_bet = 0
+
+        self.stops, self.heights = game.outcome(self.sampler.next_stops())
+        self.grid_ids = game.window_ids(self.stops, self.heights)
+        self.grid = game.window_symbols(self.stops, self.heights)
+
+        # Multiplier/Combo system
+        self.win_streak = 0
+        self.multiplier = 1
+        self.max_streak = 0
+
+        # Free spins bonus
+        self.free_spins = 0
+        self.free_spins_active = False
+
+        # Optional pyslot.journal.JournalWriter that records every settled spin
+        self.journal = None
+        # Optional pyslot.replay.SessionRecorder that records the input timeline
+        self.recorder = None
+        # Optional pyslot.streaming.StreamingStats fed with every settled spin
+        self.stats = None
+
+    def set_lines(self, lines):
+        """Set the number of active win lines, clamped to the available lines (fixed for ways games)"""
+        self.lines = max(self.game.min_lines, min(self.game.max_lines, lines))
+        if self.recorder is not None:
+            self.recorder.event('lines', self.lines)
+        return self.lines
+
+    def set_bet(self, bet_per_line):
+        """Set the bet per line, clamped to the bet limits"""
+        self.bet_per_line = max(self.min_bet, min(self.max_bet, bet_per_line))
+        if self.recorder is not None:
+            self.recorder.event('bet', self.bet_per_line)
+        return self.bet_per_line
+
+    def start_spin(self):
+        """Pay for the spin (or use a free spin) and pick the reel stops.
+
+        Returns the new grid, or None when the bet can't be covered.
+        """
+        self.total_bet = self.bet_per_line * self.lines
+
+        if self.free_spins > 0:
+            self.free_spins -= 1
+            self.free_spins_active = True
+        else:
+            if self.coins < self.total_bet:
+                return None
+            self.coins -= self.total_bet
+            self.free_spins_active = False
+
+        self.stops, self.heights = self.game.outcome(self.sampler.next_stops())
+        self.grid_ids = self.game.window_ids(self.stops, self.heights)
+        self.grid = self.game.window_symbols(self.stops, self.heights)
+        if self.recorder is not None:
+            self.recorder.event('spin')
+        return self.grid
+
+    def set_grid(self, grid):
+        """Replace the drawn grid with a given one (demos and benchmarks); stops are left as they are"""
+        self.grid = [list(column) for column in grid]
+        self.grid_ids = self.game.ids_for(self.grid)
+        self.heights = [len(column) for column in self.grid]
+
+    def settle(self):
+        """Evaluate the current grid and apply the win, streak and bonus rules"""
+        result = evaluate_ids(self.grid, self.grid_ids, self.lines, self.bet_per_line, self.game)
+        result.free_spin = self.free_spins_active
+        result.total_bet = 0 if self.free_spins_active else self.total_bet
+
+        self.free_spins += result.bonus_spins
+
+        if result.total_win > 0:
+            old_multiplier = self.multiplier
+            self.win_streak += 1
+            self.max_streak = max(self.max_streak, self.win_streak)
+            self.multiplier = self.game.multiplier_for_streak(self.win_streak)
+            result.multiplier_increased = self.multiplier > old_multiplier
+
+            # Apply multiplier to win (extra bonus during free spins)
+            bonus_multiplier = self.game.free_spin_multiplier if self.free_spins_active else 1
+            result.final_multiplier = self.multiplier * bonus_multiplier
+            result.final_win = int(result.total_win * result.final_multiplier)
+            self.coins += result.final_win
+        else:
+            # Reset streak on loss
+            self.win_streak = 0
+            self.multiplier = 1
+
+        result.win_streak = self.win_streak
+        result.multiplier = self.multiplier
+        result.coins = self.coins
+        if self.journal is not None:
+            self.journal.record(self, result)
+        if self.recorder is not None:
+            self.recorder.event('settle', self.coins, self.win_streak, self.free_spins)
+        if self.stats is not None:
+            self.stats.add(result.final_win, self.total_bet, result.free_spin)
+        return result
+
+    def spin(self):
+        """Play one complete spin; returns the SpinResult or None if the bet can't be covered"""
+        if self.start_spin() is None:
+            return None
+        return self.settle()
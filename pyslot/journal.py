@@ -0,0 +1,267 @@
+"""Append-only binary journal of settled spins.
+
+A journal file is a 64-byte header followed by fixed-width little-endian
+records, one per settled spin (see record_dtype). Records never change once
+written, so a file can be read while a session is still appending to it,
+and a crash can only lose the tail: a partial last record is ignored by the
+readers and cut off when the file is opened for appending again.
+
+The game loop never touches the file. JournalWriter.record() puts a tuple
+on a queue, and a background thread packs queued spins into a NumPy
+structured array, writes them in one call and syncs them to disk following
+the fsync policy:
+
+    always     fsync after every batch
+    interval   fsync at most every ``fsync_interval`` seconds [default]
+    close      fsync only when the journal is closed
+
+Readers map the records as a read-only NumPy structured array, so
+aggregating millions of spins is a handful of vectorized reductions:
+
+    header, records = open_journal("session.pyslot")
+    records['win'].sum() / records['stake'].sum()
+"""
+import os
+import queue
+import struct
+import threading
+import time
+
+import numpy as np
+
+from pyslot.model import BLANK
+
+MAGIC = b"PYSLJNL1"
+VERSION = 1
+# magic, version, reels, rows, record size, game name
+HEADER = struct.Struct("<8sHHHH48s")
+FSYNC_POLICIES = ('always', 'interval', 'close')
+DEFAULT_FSYNC_INTERVAL = 1.0
+DEFAULT_BATCH = 256
+
+
+class JournalError(ValueError):
+    """A journal file is not a journal, or belongs to a different grid size"""
+
+
+def record_dtype(reels, rows):
+    """Structured dtype of one spin record for a reels x rows grid"""
+    return np.dtype([
+        ('spin', '<u8'),                   # record number in the file
+        ('time', '<f8'),                   # Unix time the spin settled
+        ('grid', 'u1', (reels * rows,)),   # symbol IDs reel by reel, BLANK below a short reel
+        ('lines', '<u2'),                  # active lines, or the bet cost of a ways game
+        ('bet_per_line', '<u4'),
+        ('stake', '<i8'),                  # coins paid for the spin, 0 on free spins
+        ('win', '<i8'),                    # coins won after multipliers
+        ('multiplier', '<u2'),             # streak x free spin multiplier applied to the win
+        ('free_spin', 'u1'),
+        ('scatters', 'u1'),
+        ('streak', '<u4'),                 # win streak after the spin
+        ('free_spins', '<u4'),             # free spins left after the spin
+        ('coins', '<i8'),                  # balance after the spin
+    ])
+
+
+def read_header(f):
+    """Parse the header at the start of an open binary file; returns a dict"""
+    data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise JournalError("file is too short to hold a journal header")
+    magic, version, reels, rows, record_size, name = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise JournalError("not a PySlot spin journal")
+    if version != VERSION:
+        raise JournalError(f"unsupported journal version {version}")
+    dtype = record_dtype(reels, rows)
+    if dtype.itemsize != record_size:
+        raise JournalError(f"record size {record_size} does not match a {reels}x{rows} grid")
+    return {'version': version, 'reels': reels, 'rows': rows, 'dtype': dtype,
+            'game': name.rstrip(b"\0").decode("utf-8", "replace")}
+
+
+def _header_name(name):
+    """Game name as stored in a header (and read back by read_header)"""
+    return name.encode("utf-8")[:HEADER.size - 16]
+
+
+def _pack_header(reels, rows, name):
+    return HEADER.pack(MAGIC, VERSION, reels, rows, record_dtype(reels, rows).itemsize, _header_name(name))
+
+
+def open_journal(path):
+    """(header, records) for a journal file; records is a read-only memory-mapped structured array"""
+    with open(path, "rb") as f:
+        header = read_header(f)
+    dtype = header['dtype']
+    count = (os.path.getsize(path) - HEADER.size) // dtype.itemsize
+    if count == 0:
+        return header, np.zeros(0, dtype=dtype)
+    return header, np.memmap(path, dtype=dtype, mode="r", offset=HEADER.size, shape=(count,))
+
+
+def grids(header, records):
+    """Record grids as a (n, reels, rows) array of symbol IDs"""
+    return records['grid'].reshape(len(records), header['reels'], header['rows'])
+
+
+def summarize(records):
+    """Session totals of a record array, as a dict"""
+    spins = len(records)
+    stake = int(records['stake'].sum())
+    won = int(records['win'].sum())
+    return {
+        'spins': spins,
+        'stake': stake,
+        'won': won,
+        'rtp': won / stake if stake else 0.0,
+        'hit_rate': float(np.count_nonzero(records['win'])) / spins if spins else 0.0,
+        'free_spins': int(np.count_nonzero(records['free_spin'])),
+        'max_streak': int(records['streak'].max()) if spins else 0,
+        'max_win': int(records['win'].max()) if spins else 0,
+        'final_coins': int(records['coins'][-1]) if spins else None,
+    }
+
+
+class JournalWriter:
+    """Appends settled spins to a journal file from a background thread"""
+
+    def __init__(self, path, game, fsync="interval", fsync_interval=DEFAULT_FSYNC_INTERVAL,
+                 batch_size=DEFAULT_BATCH):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
+        self.path = path
+        self.reels, self.rows = game.reels, game.rows
+        self.dtype = record_dtype(self.reels, self.rows)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.batch_size = batch_size
+        self.error = None
+
+        self.file = self._open(path, game)
+        self.count = (self.file.tell() - HEADER.size) // self.dtype.itemsize
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="pyslot-journal", daemon=True)
+        self._thread.start()
+
+    def _open(self, path, game):
+        """Open for appending: write a header to a new file, check it and drop a partial tail on an old one"""
+        f = open(path, "a+b")
+        try:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                f.write(_pack_header(self.reels, self.rows, game.name))
+                f.flush()
+                return f
+            f.seek(0)
+            header = read_header(f)
+            if (header['reels'], header['rows']) != (self.reels, self.rows):
+                raise JournalError(f"{path} records a {header['reels']}x{header['rows']} grid, "
+                                   f"not {self.reels}x{self.rows}")
+            # Lines and bets mean different things in another game (ways games stake a fixed cost)
+            if header['game'] != _header_name(game.name).decode("utf-8", "replace"):
+                raise JournalError(f"{path} records {header['game']!r}, not {game.name!r}")
+            size = f.seek(0, os.SEEK_END)
+            whole = HEADER.size + (size - HEADER.size) // self.dtype.itemsize * self.dtype.itemsize
+            if whole != size:
+                f.truncate(whole)
+            f.seek(whole)
+        except BaseException:
+            f.close()
+            raise
+        return f
+
+    def record(self, engine, result):
+        """Queue the spin just settled by ``engine``; never blocks on I/O"""
+        if self._closed:
+            return
+        self._queue.put((time.time(), engine.grid_ids, engine.lines, engine.bet_per_line, result.total_bet,
+                         result.final_win, result.final_multiplier, result.free_spin, result.scatter_count,
+                         engine.win_streak, engine.free_spins, engine.coins))
+
+    def _pack(self, spins):
+        records = np.zeros(len(spins), dtype=self.dtype)
+        grid = np.full((len(spins), self.reels, self.rows), BLANK, dtype=np.uint8)
+        for i, spin in enumerate(spins):
+            for reel, column in enumerate(spin[1]):
+                grid[i, reel, :len(column)] = column
+        records['grid'] = grid.reshape(len(spins), -1)
+        records['spin'] = np.arange(self.count, self.count + len(spins))
+        for field, column in zip(('time', None, 'lines', 'bet_per_line', 'stake', 'win', 'multiplier', 'free_spin',
+                                  'scatters', 'streak', 'free_spins', 'coins'), zip(*spins)):
+            if field is not None:
+                records[field] = column
+        return records
+
+    def _run(self):
+        last_sync = time.monotonic()
+        done = False
+        while not done:
+            spins = [self._queue.get()]
+            while len(spins) < self.batch_size:
+                try:
+                    spins.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if spins[-1] is None:
+                spins.pop()
+                done = True
+            if not spins or self.error is not None:
+                continue
+            try:
+                self.file.write(self._pack(spins).tobytes())
+                self.count += len(spins)
+                self.file.flush()
+                now = time.monotonic()
+                if self.fsync == "always" or (self.fsync == "interval" and now - last_sync >= self.fsync_interval):
+                    os.fsync(self.file.fileno())
+                    last_sync = now
+            except OSError as e:
+                # Keep draining so close() still returns; close() raises the error
+                self.error = e
+
+    def close(self):
+        """Write everything queued, fsync and close the file; raises the writer's I/O error if it had one"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            if self.error is None:
+                self.file.flush()
+                os.fsync(self.file.fileno())
+        finally:
+            self.file.close()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize PySlot spin journals")
+    parser.add_argument("paths", nargs="+", help="journal files")
+    args = parser.parse_args()
+
+    for path in args.paths:
+        try:
+            header, records = open_journal(path)
+        except (OSError, JournalError) as e:
+            print(f"⚠ {path}: {e}")
+            continue
+        stats = summarize(records)
+        print(f"{path}: {header['game']} ({header['reels']}x{header['rows']})")
+        print(f"  Spins:       {stats['spins']:,} ({stats['free_spins']:,} free)")
+        print(f"  Staked/won:  {stats['stake']:,} / {stats['won']:,}  (RTP {stats['rtp']:.4%})")
+        print(f"  Hit rate:    {stats['hit_rate']:.4%}")
+        print(f"  Max win:     {stats['max_win']:,}  max streak {stats['max_streak']}")
+        if stats['final_coins'] is not None:
+            print(f"  Final coins: {stats['final_coins']:,}")
@@ -0,0 +1,186 @@
+"""Load generator for pyslot.server.
+
+Each generator process runs one event loop with ``connections`` client
+connections. Every connection opens a session and spins back to back for
+``duration`` seconds: one request in flight, the next sent as soon as the
+response is read, so throughput is what the server sustains and latency
+is the full round trip. Latencies go into a QuantileSketch
+(pyslot.streaming), and the processes' sketches merge into the total.
+
+Sessions start with the bankroll the server gives them. When one can no
+longer cover its bet the connection closes it and opens a new one; those
+spins are counted as busts, not played spins. ``--serve N`` starts a
+server with N workers on the address first, and stops it afterwards.
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pyslot.model import DEFAULT_GAME
+from pyslot.server import DEFAULT_PORT, parse_address
+from pyslot.streaming import QuantileSketch
+
+DEFAULT_CONNECTIONS = 32
+DEFAULT_DURATION = 10.0
+QUANTILES = [0.5, 0.9, 0.99, 0.999]
+
+
+async def _open(address):
+    kind, where = parse_address(address)
+    if kind == "unix":
+        return await asyncio.open_unix_connection(where)
+    return await asyncio.open_connection(*where)
+
+
+async def _request(reader, writer, line):
+    writer.write(line)
+    response = await reader.readline()
+    if not response:
+        raise ConnectionError("server closed the connection")
+    return json.loads(response)
+
+
+async def _open_session(reader, writer, game, bet):
+    """Open a session at ``bet`` per line; returns its ID and the spin request line for it"""
+    opened = await _request(reader, writer, json.dumps({'op': 'open', 'game': game}).encode() + b"\n")
+    if not opened['ok']:
+        raise ValueError(opened['error'])
+    session = opened['session']
+    await _request(reader, writer, json.dumps({'op': 'bet', 'session': session, 'bet': bet}).encode() + b"\n")
+    return session, json.dumps({'op': 'spin', 'session': session}).encode() + b"\n"
+
+
+async def _spin_loop(address, game, bet, deadline, latencies, counts):
+    reader, writer = await _open(address)
+    try:
+        session, line = await _open_session(reader, writer, game, bet)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await _request(reader, writer, line)
+            latencies.add((time.perf_counter() - start) * 1000)
+            if response['ok']:
+                counts['spins'] += 1
+            elif response.get('played') is False:
+                # Out of coins: start over with a fresh session
+                counts['busts'] += 1
+                await _request(reader, writer, json.dumps({'op': 'close', 'session': session}).encode() + b"\n")
+                session, line = await _open_session(reader, writer, game, bet)
+            else:
+                counts['errors'] += 1
+    finally:
+        writer.close()
+
+
+async def _generate(address, connections, duration, game, bet):
+    latencies = QuantileSketch()
+    counts = {'spins': 0, 'busts': 0, 'errors': 0}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(_spin_loop(address, game, bet, deadline, latencies, counts)
+                           for _ in range(connections)))
+    return latencies, counts, time.perf_counter() - start
+
+
+def run_generator(address, connections=DEFAULT_CONNECTIONS, duration=DEFAULT_DURATION, game=DEFAULT_GAME, bet=1):
+    """Drive the server from this process; returns a plain dict, latency sketch (ms) included"""
+    latencies, counts, elapsed = asyncio.run(_generate(address, connections, duration, game, bet))
+    return {'pid': os.getpid(), 'connections': connections, 'elapsed': elapsed, **counts,
+            'latency_ms': latencies.to_dict()}
+
+
+def summarize(part):
+    """Spins/sec and latency percentiles of one generator's (or the merged) result"""
+    latencies = QuantileSketch.from_dict(part['latency_ms'])
+    return {
+        'spins': part['spins'],
+        'busts': part['busts'],
+        'errors': part['errors'],
+        'spins_per_sec': part['spins'] / part['elapsed'] if part['elapsed'] else 0.0,
+        'latency_ms': {f"p{q * 100:g}": latencies.quantile(q) for q in QUANTILES},
+    }
+
+
+def run(address, processes=1, connections=DEFAULT_CONNECTIONS, duration=DEFAULT_DURATION, game=DEFAULT_GAME, bet=1):
+    """Run ``processes`` generators side by side; returns (per-process summaries, merged summary)"""
+    args = (address, connections, duration, game, bet)
+    if processes == 1:
+        parts = [run_generator(*args)]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(run_generator, *args) for _ in range(processes)]
+            parts = [future.result() for future in futures]
+
+    latencies = QuantileSketch.from_dict(parts[0]['latency_ms'])
+    for part in parts[1:]:
+        latencies.merge(QuantileSketch.from_dict(part['latency_ms']))
+    total = {key: sum(part[key] for part in parts) for key in ('spins', 'busts', 'errors')}
+    total.update(elapsed=max(part['elapsed'] for part in parts), latency_ms=latencies.to_dict())
+    return [summarize(part) for part in parts], summarize(total)
+
+
+def start_server(address, workers, timeout=10.0):
+    """Start ``python -m pyslot.server`` on ``address`` and wait until it takes connections"""
+    server = subprocess.Popen([sys.executable, "-m", "pyslot.server", "--listen", address,
+                               "--workers", str(workers)], stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            asyncio.run(_ping(address))
+            return server
+        except OSError:
+            if server.poll() is not None or time.monotonic() > deadline:
+                server.kill()
+                raise RuntimeError(f"server on {address} did not come up")
+            time.sleep(0.05)
+
+
+async def _ping(address):
+    reader, writer = await _open(address)
+    await _request(reader, writer, b'{"op":"ping"}\n')
+    writer.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load test a PySlot game server")
+    parser.add_argument("--address", default=f"127.0.0.1:{DEFAULT_PORT}", help="host:port, or unix:/path/to/socket")
+    parser.add_argument("--processes", type=int, default=1, help="load generator processes (0: every core)")
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS, help="sessions per generator process")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="seconds to spin")
+    parser.add_argument("--game", default=DEFAULT_GAME, help="bundled game the sessions play")
+    parser.add_argument("--bet", type=int, default=1, help="bet per line")
+    parser.add_argument("--serve", type=int, default=None, metavar="WORKERS",
+                        help="start a local server with this many workers for the test")
+    parser.add_argument("--json", action="store_true", help="print the reports as JSON")
+    args = parser.parse_args()
+
+    processes = args.processes or os.cpu_count() or 1
+    server = start_server(args.address, args.serve) if args.serve else None
+    try:
+        per_process, total = run(args.address, processes, args.connections, args.duration, args.game, args.bet)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        print(json.dumps({'processes': per_process, 'total': total}, indent=2))
+    else:
+        def line(label, report):
+            latency = "  ".join(f"{q} {ms:.3f}" for q, ms in report['latency_ms'].items() if ms is not None)
+            return f"{label:<10}{report['spins_per_sec']:>12,.0f} spins/sec   latency ms: {latency}"
+
+        for number, report in enumerate(per_process):
+            print(line(f"core {number}", report))
+        print(line("total", total))
+        if args.serve:
+            print(f"{'':<10}{total['spins_per_sec'] / args.serve:>12,.0f} spins/sec per server worker")
+        if total['busts']:
+            print(f"{'':<10}{total['busts']:>12,} sessions ran out of coins and were reopened")
+        if total['errors']:
+            print(f"⚠ {total['errors']:,} requests failed")
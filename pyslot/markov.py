@@ -0,0 +1,184 @@
+"""Exact long-run return of the full game rules, as a Markov chain.
+
+The win streak multiplier and free spins make consecutive spins
+dependent, so the per-spin RTP from pyslot.rtp is not what a player gets
+back over time. Between spins the game's state is the win streak (only up
+to the top of the multiplier ladder matters) and the free spins left. A
+spin moves the state according to two facts about its outcome: whether
+it won, and how many free spins its scatters awarded. Their joint
+distribution comes straight from pyslot.rtp: a spin loses with
+probability ``1 - hit_frequency``, and every bonus trigger pays its
+scatters, so a trigger is always a win.
+
+The chain has (ladder top + 1) x (max_free_spins + 1) states. Its
+stationary distribution pi solves pi P = pi with sparse linear algebra
+(scipy.sparse when installed, a dense NumPy solve otherwise). The
+expected win of a spin is the per-spin return times the multiplier that
+applies in its state. The long-run RTP is therefore
+
+    sum(pi * multiplier) * spin_rtp / P(paid spin)
+
+Free spins left above ``max_free_spins`` are clamped to it; the
+probability mass on that boundary is reported so the cut-off can be
+checked. A second, streak-free chain over the free spins left gives the
+length distribution of a bonus round, retriggers included.
+"""
+import numpy as np
+
+from pyslot.engine import GAME
+from pyslot.model import DEFAULT_GAME, load_game
+from pyslot.montecarlo import streak_ladder
+from pyslot.rtp import calculate
+
+try:
+    import scipy.sparse
+    import scipy.sparse.linalg
+except ImportError:  # NumPy-only installs
+    scipy = None
+
+DEFAULT_MAX_FREE_SPINS = 200
+# Bonus round lengths are followed until this much probability is left
+LENGTH_TOLERANCE = 1e-12
+
+
+def spin_outcomes(stats, game=GAME):
+    """Outcomes of one spin as (won, free spins awarded, probability) from calculate() statistics"""
+    if game.pays[game.scatter_id] <= 0:
+        raise ValueError("the solver needs a paying scatter, so that every bonus trigger counts as a win")
+    if stats['hit_frequency'] is None:
+        raise ValueError("hit frequency is not available for this game")
+    outcomes = [(False, 0, 1.0 - stats['hit_frequency'])]
+    triggered = 0.0
+    for scatters, p in enumerate(stats['scatter_distribution']):
+        awarded = game.bonus_spins_for_scatters(scatters)
+        if awarded and p > 0:
+            outcomes.append((True, awarded, p))
+            triggered += p
+    outcomes.append((True, 0, stats['hit_frequency'] - triggered))
+    return outcomes
+
+
+def transition_matrix(outcomes, streak_cap, max_free_spins):
+    """Sparse (COO arrays) transition matrix over states ``free_left * (streak_cap + 1) + streak``"""
+    streaks = streak_cap + 1
+    streak, free = np.meshgrid(np.arange(streaks), np.arange(max_free_spins + 1))
+    streak, free = streak.ravel(), free.ravel()
+    source = free * streaks + streak
+    rows, cols, values = [], [], []
+    for won, awarded, p in outcomes:
+        next_streak = np.minimum(streak + 1, streak_cap) if won else np.zeros_like(streak)
+        next_free = np.minimum(np.maximum(free - 1, 0) + awarded, max_free_spins)
+        rows.append(source)
+        cols.append(next_free * streaks + next_streak)
+        values.append(np.full(len(source), p))
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(values), len(source)
+
+
+def stationary_distribution(rows, cols, values, size):
+    """Solve pi P = pi, sum(pi) = 1 for a transition matrix given as COO arrays"""
+    # (P^T - I) pi = 0 with the last equation replaced by the normalization
+    if scipy is not None:
+        a = scipy.sparse.coo_matrix((values, (cols, rows)), shape=(size, size)).tocsr()
+        a = (a - scipy.sparse.identity(size, format="csr")).tolil()
+        a[size - 1, :] = np.ones(size)
+        b = np.zeros(size)
+        b[-1] = 1.0
+        pi = scipy.sparse.linalg.spsolve(a.tocsc(), b)
+    else:
+        a = np.zeros((size, size))
+        np.add.at(a, (cols, rows), values)
+        a -= np.eye(size)
+        a[-1] = 1.0
+        b = np.zeros(size)
+        b[-1] = 1.0
+        pi = np.linalg.solve(a, b)
+    return np.maximum(pi, 0.0) / np.maximum(pi, 0.0).sum()
+
+
+def bonus_lengths(outcomes, awards, max_free_spins=DEFAULT_MAX_FREE_SPINS, tolerance=LENGTH_TOLERANCE):
+    """Distribution of free spins played per bonus round, retriggers included.
+
+    ``awards`` maps the free spins of the triggering spin to their
+    probability; returns an array whose entry n is P(round lasts n spins).
+    """
+    retrigger = np.zeros(max_free_spins + 1)
+    for _, awarded, p in outcomes:
+        retrigger[min(awarded, max_free_spins)] += p
+    left = np.zeros(max_free_spins + 1)
+    total = sum(awards.values())
+    for awarded, p in awards.items():
+        left[min(awarded, max_free_spins)] += p / total
+
+    lengths = [0.0]
+    while left[1:].sum() > tolerance:
+        # Play one free spin in every round still going, then add what its scatters awarded
+        after = np.convolve(left[1:], retrigger)
+        left = after[:max_free_spins + 1]
+        left[max_free_spins] += after[max_free_spins + 1:].sum()
+        lengths.append(left[0])
+        left[0] = 0.0
+    return np.array(lengths)
+
+
+def solve(lines=None, game=GAME, max_free_spins=DEFAULT_MAX_FREE_SPINS):
+    """Long-run statistics under the full rules, as a dict"""
+    stats = calculate(lines, game)
+    outcomes = spin_outcomes(stats, game)
+    ladder, streak_cap = streak_ladder(game)
+    rows, cols, values, size = transition_matrix(outcomes, streak_cap, max_free_spins)
+    pi = stationary_distribution(rows, cols, values, size).reshape(max_free_spins + 1, streak_cap + 1)
+
+    # Multiplier a win in each state gets: streak after the win, doubled on free spins
+    multiplier = np.broadcast_to(ladder[np.minimum(np.arange(streak_cap + 1) + 1, streak_cap)], pi.shape).copy()
+    multiplier[1:] *= game.free_spin_multiplier
+    paid = float(pi[0].sum())
+    mean_multiplier = float((pi * multiplier).sum())
+
+    awards = {awarded: p for won, awarded, p in outcomes if awarded}
+    lengths = bonus_lengths(outcomes, awards, max_free_spins)
+    spins = np.arange(len(lengths))
+    mean_length = float((lengths * spins).sum())
+    cumulative = np.cumsum(lengths)
+
+    return {
+        'lines': stats['lines'],
+        'spin_rtp': stats['rtp'],
+        'rtp': stats['rtp'] * mean_multiplier / paid,
+        'free_spin_share': 1.0 - paid,
+        'mean_multiplier': mean_multiplier,
+        'streak_distribution': pi.sum(axis=0).tolist(),
+        'truncated_mass': float(pi[-1].sum()),
+        'bonus_rate': stats['bonus_rate'],
+        'bonus_length_mean': mean_length,
+        'bonus_length_percentiles': {f"p{q}": int(np.searchsorted(cumulative, q / 100))
+                                     for q in (50, 90, 99, 99.9)},
+        'bonus_length_distribution': lengths.tolist(),
+        'states': size,
+        'sparse': scipy is not None,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Exact long-run PySlot RTP with streaks and free spins")
+    parser.add_argument("--game", default=DEFAULT_GAME, help="game definition file or bundled game name")
+    parser.add_argument("--lines", type=int, default=None, help="active lines (default: all)")
+    parser.add_argument("--max-free-spins", type=int, default=DEFAULT_MAX_FREE_SPINS,
+                        help="free spins left beyond this are clamped")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = solve(args.lines, load_game(args.game), args.max_free_spins)
+    elapsed = time.perf_counter() - start
+
+    solver = "sparse" if result['sparse'] else "dense NumPy"
+    print(f"States:         {result['states']:,} ({solver} solve in {elapsed * 1000:.0f} ms)")
+    print(f"Per-spin RTP:   {result['spin_rtp']:.6%}")
+    print(f"Long-run RTP:   {result['rtp']:.6%}  (house edge {1 - result['rtp']:.6%})")
+    print(f"Free spins:     {result['free_spin_share']:.4%} of spins, mean multiplier {result['mean_multiplier']:.4f}")
+    percentiles = "  ".join(f"{q} {n}" for q, n in result['bonus_length_percentiles'].items())
+    print(f"Bonus rounds:   mean {result['bonus_length_mean']:.2f} spins  {percentiles}")
+    if result['truncated_mass'] > 1e-9:
+        print(f"⚠ {result['truncated_mass']:.2e} of the probability sits at --max-free-spins; raise it")
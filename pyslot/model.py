@@ -0,0 +1,376 @@
+"""Game definitions: load, validate and compile a slot's math model.
+
+A game is described by a JSON or TOML file (see pyslot/games/). Loading it
+checks every field and compiles the model into the tables the spin code
+uses directly:
+
+- symbol IDs (list positions) instead of symbol strings,
+- ``pays`` / ``paytable``: line pay per symbol ID, as a list and a NumPy array,
+- ``win_lines`` / ``line_rows`` / ``line_cells``: the row (and flat
+  ``reel * rows + row`` cell) every line reads on every reel, or
+  ``way_ids`` for ways games,
+- ``strip_ids`` / ``strip_arrays``: reel strips as symbol IDs, extended by
+  ``rows - 1`` wrapped stops so a window is a plain slice,
+- the stop sampler tables.
+
+Definition fields (``?`` marks optional ones, defaults in brackets):
+
+    name?                 display name [file name]
+    evaluation?           "lines" (paylines) or "ways" (any cells on adjacent
+                          reels from the left) [lines]
+    reels, rows           grid size; ``rows`` defaults to the tallest reel
+                          when reel_heights is given
+    reel_heights?         visible cells per reel: an int, or a list of
+                          heights picked at random every spin (ways only)
+                          [rows on every reel]
+    symbols               list of {symbol, name?, weight, pay}; ``weight`` is
+                          the copies per strip, an int or one int per reel
+    scatter               symbol that pays anywhere and triggers free spins
+    min_match?            left-to-right run that pays a line [3]
+    lines                 one row index per reel for every win line (lines only)
+    strips?               explicit strips, one list of symbols per reel
+                          [built from the weights]
+    strip_seed?           arrangement seed for built strips [0]
+    stop_weights?         one weight per stop of every strip (virtual reels)
+    bet?                  {min, max} bet per line [1, 100]; ways games also
+                          need ``cost``, the coins staked per bet step
+    bonus?                {scatter_trigger [3], free_spins [5],
+                           free_spins_per_extra_scatter [2],
+                           free_spin_multiplier [2]}
+    streak_multipliers?   [[min streak, multiplier], ...] [none]
+"""
+import json
+import os
+import random
+
+import numpy as np
+
+from pyslot.sampler import ReelSampler
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+GAMES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games")
+DEFAULT_GAME = "classic"
+# Symbol IDs are stored as uint8 in the batch tables, with BLANK for cells below a short reel
+MAX_SYMBOLS = 255
+BLANK = 255
+EVALUATIONS = ('lines', 'ways')
+
+
+class GameDefinitionError(ValueError):
+    """A game definition file is missing, unreadable or inconsistent"""
+
+
+def build_strip(weights, seed=0):
+    """Circular reel strip of symbol IDs holding each symbol ``weight`` times, spread evenly.
+
+    Copies of a symbol get one random position within each of ``weight``
+    equal slices of the strip, so they never bunch up. The seed only picks
+    the arrangement; the symbol counts are exact.
+    """
+    rng = random.Random(seed)
+    slots = []
+    for symbol_id, weight in enumerate(weights):
+        for i in range(weight):
+            slots.append(((i + rng.random()) / weight, symbol_id))
+    slots.sort()
+    return [symbol_id for _, symbol_id in slots]
+
+
+def _fail(where, message):
+    raise GameDefinitionError(f"{where}: {message}")
+
+
+def _int(data, key, where, default=None, minimum=0):
+    value = data.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, int):
+        _fail(f"{where}{key}", f"expected an integer, got {value!r}")
+    if value < minimum:
+        _fail(f"{where}{key}", f"must be at least {minimum}, got {value}")
+    return value
+
+
+def _list(data, key, where, default=None):
+    value = data.get(key, default)
+    if not isinstance(value, list) or not value:
+        _fail(f"{where}{key}", "expected a non-empty list")
+    return value
+
+
+class GameModel:
+    """A validated game definition compiled into lookup tables"""
+
+    def __init__(self, data, name=None):
+        if not isinstance(data, dict):
+            _fail(name or "game", "expected a table of fields")
+        self.name = data.get('name', name or "game")
+        self.reels = _int(data, 'reels', "", minimum=1)
+        self.evaluation = data.get('evaluation', 'lines')
+        if self.evaluation not in EVALUATIONS:
+            _fail("evaluation", f"expected one of {', '.join(EVALUATIONS)}, got {self.evaluation!r}")
+        self.ways = self.evaluation == 'ways'
+        self._compile_heights(data)
+        self.min_match = _int(data, 'min_match', "", default=3, minimum=2)
+        if self.min_match > self.reels:
+            _fail("min_match", f"{self.min_match} is more than the {self.reels} reels")
+
+        self._compile_symbols(_list(data, 'symbols', ""))
+        scatter = data.get('scatter')
+        if scatter not in self.symbol_ids:
+            _fail("scatter", f"{scatter!r} is not one of the symbols")
+        self.scatter = scatter
+        self.scatter_id = self.symbol_ids[scatter]
+
+        if self.ways:
+            self.win_lines = []
+            self.line_rows = np.zeros((0, self.reels), dtype=np.intp)
+            self.line_cells = self.line_rows
+            self.way_ids = [i for i in range(len(self.symbols)) if i != self.scatter_id]
+        else:
+            if not self.fixed_heights:
+                _fail("reel_heights", "heights that change every spin need \"evaluation\": \"ways\"")
+            self._compile_lines(_list(data, 'lines', ""))
+        self._compile_strips(data)
+
+        bet = data.get('bet', {})
+        self.min_bet = _int(bet, 'min', "bet.", default=1, minimum=1)
+        self.max_bet = _int(bet, 'max', "bet.", default=100, minimum=self.min_bet)
+        # Bet multiplier: active lines (player's choice), or the fixed cost of a ways game
+        if self.ways:
+            self.min_lines = self.max_lines = _int(bet, 'cost', "bet.", minimum=1)
+        else:
+            self.min_lines, self.max_lines = 1, len(self.win_lines)
+
+        bonus = data.get('bonus', {})
+        self.scatter_trigger = _int(bonus, 'scatter_trigger', "bonus.", default=3, minimum=1)
+        self.free_spins = _int(bonus, 'free_spins', "bonus.", default=5)
+        self.free_spins_per_extra_scatter = _int(bonus, 'free_spins_per_extra_scatter', "bonus.", default=2)
+        self.free_spin_multiplier = _int(bonus, 'free_spin_multiplier', "bonus.", default=2, minimum=1)
+
+        ladder = data.get('streak_multipliers', [])
+        if not isinstance(ladder, list) or any(
+                not isinstance(step, list) or len(step) != 2 or
+                not all(isinstance(v, int) and not isinstance(v, bool) and v >= 1 for v in step)
+                for step in ladder):
+            _fail("streak_multipliers", "expected [[min streak, multiplier], ...] of positive integers")
+        # Highest streak first, as multiplier_for_streak expects
+        self.streak_multipliers = sorted((tuple(step) for step in ladder), reverse=True)
+
+        self.stop_sampler = self.sampler()
+
+    def _compile_symbols(self, entries):
+        if len(entries) > MAX_SYMBOLS:
+            _fail("symbols", f"at most {MAX_SYMBOLS} symbols are supported")
+        self.symbols = []
+        self.names = []
+        self.pays = []
+        self.weights = []  # (reels, symbols)
+        for i, entry in enumerate(entries):
+            where = f"symbols[{i}]."
+            if not isinstance(entry, dict):
+                _fail(f"symbols[{i}]", "expected a table with symbol, weight and pay")
+            symbol = entry.get('symbol')
+            if not isinstance(symbol, str) or not symbol:
+                _fail(f"{where}symbol", "expected a non-empty string")
+            if symbol in self.symbols:
+                _fail(f"{where}symbol", f"{symbol!r} is listed twice")
+            self.symbols.append(symbol)
+            self.names.append(str(entry.get('name', symbol)))
+            self.pays.append(_int(entry, 'pay', where))
+
+            weight = entry.get('weight')
+            if isinstance(weight, list):
+                if len(weight) != self.reels:
+                    _fail(f"{where}weight", f"expected one weight per reel ({self.reels}), got {len(weight)}")
+                self.weights.append([_int({'weight': w}, 'weight', where) for w in weight])
+            else:
+                self.weights.append([_int(entry, 'weight', where)] * self.reels)
+        self.weights = [list(column) for column in zip(*self.weights)]
+        self.symbol_ids = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.rewards = dict(zip(self.symbols, self.pays))
+        self.paytable = np.array(self.pays, dtype=np.int64)
+
+    def _compile_heights(self, data):
+        heights = data.get('reel_heights')
+        if heights is None:
+            self.rows = _int(data, 'rows', "", minimum=1)
+            self.reel_heights = [[self.rows] for _ in range(self.reels)]
+        else:
+            if not isinstance(heights, list) or len(heights) != self.reels:
+                _fail("reel_heights", f"expected one entry per reel ({self.reels})")
+            self.reel_heights = []
+            for reel, options in enumerate(heights):
+                if not isinstance(options, list):
+                    options = [options]
+                if not options:
+                    _fail(f"reel_heights[{reel}]", "expected a height or a non-empty list of heights")
+                self.reel_heights.append([_int({'height': h}, 'height', f"reel_heights[{reel}].", minimum=1)
+                                          for h in options])
+            tallest = max(max(options) for options in self.reel_heights)
+            self.rows = _int(data, 'rows', "", default=tallest, minimum=tallest)
+        self.fixed_heights = all(len(options) == 1 for options in self.reel_heights)
+        # Heights when they are fixed (every spin draws them otherwise)
+        self.heights = [options[0] for options in self.reel_heights]
+        self.max_ways = 1
+        for options in self.reel_heights:
+            self.max_ways *= max(options)
+
+    def _compile_lines(self, lines):
+        for i, line in enumerate(lines):
+            if not isinstance(line, list) or len(line) != self.reels:
+                _fail(f"lines[{i}]", f"expected {self.reels} row indices")
+            for reel, row in enumerate(line):
+                if isinstance(row, bool) or not isinstance(row, int) or not 0 <= row < self.heights[reel]:
+                    _fail(f"lines[{i}][{reel}]", f"row must be 0..{self.heights[reel] - 1}, got {row!r}")
+        self.win_lines = [list(line) for line in lines]
+        self.line_rows = np.array(self.win_lines, dtype=np.intp)
+        self.line_cells = np.arange(self.reels, dtype=np.intp) * self.rows + self.line_rows
+
+    def _compile_strips(self, data):
+        strips = data.get('strips')
+        if strips is None:
+            seed = _int(data, 'strip_seed', "", default=0)
+            strip_ids = [build_strip(weights, seed + reel) for reel, weights in enumerate(self.weights)]
+        else:
+            if not isinstance(strips, list) or len(strips) != self.reels:
+                _fail("strips", f"expected one strip per reel ({self.reels})")
+            strip_ids = []
+            for reel, strip in enumerate(strips):
+                if not isinstance(strip, list):
+                    _fail(f"strips[{reel}]", "expected a list of symbols")
+                unknown = [symbol for symbol in strip if symbol not in self.symbol_ids]
+                if unknown:
+                    _fail(f"strips[{reel}]", f"unknown symbol {unknown[0]!r}")
+                strip_ids.append([self.symbol_ids[symbol] for symbol in strip])
+        for reel, ids in enumerate(strip_ids):
+            if len(ids) < self.rows:
+                _fail(f"strips[{reel}]", f"needs at least {self.rows} stops, has {len(ids)}")
+
+        self.strip_ids = strip_ids
+        self.strips = [[self.symbols[i] for i in ids] for ids in strip_ids]
+        # Wrapped copies of the first rows - 1 stops: the window at any stop is strip[stop:stop + rows]
+        self.strip_windows = [ids + ids[:self.rows - 1] for ids in strip_ids]
+        self.symbol_windows = [strip + strip[:self.rows - 1] for strip in self.strips]
+        self.strip_arrays = [np.array(ids, dtype=np.uint8) for ids in self.strip_windows]
+
+        self.stop_weights = data.get('stop_weights')
+        try:
+            sampler = ReelSampler.for_strips(self.strips, self.stop_weights)
+        except (TypeError, ValueError) as exc:
+            _fail("stop_weights", str(exc))
+        # With varying heights a reel outcome is stop * len(options) + option, drawn in one go
+        self.height_options = [len(options) for options in self.reel_heights]
+        self.outcome_weights = [np.repeat(table.probabilities, count)
+                                for table, count in zip(sampler.tables, self.height_options)]
+
+    def sampler(self, seed=None):
+        """Fresh sampler of reel outcomes: the stop, combined with the height when heights vary"""
+        if self.fixed_heights:
+            return ReelSampler.for_strips(self.strips, self.stop_weights, seed)
+        return ReelSampler(self.outcome_weights, seed)
+
+    def outcome(self, draws):
+        """(stops, heights) for one spin's sampler draws"""
+        if self.fixed_heights:
+            return draws, self.heights
+        stops = []
+        heights = []
+        for draw, count, options in zip(draws, self.height_options, self.reel_heights):
+            stop, option = divmod(draw, count)
+            stops.append(stop)
+            heights.append(options[option])
+        return stops, heights
+
+    def window_ids(self, stops, heights=None):
+        """Grid of symbol IDs for the given stops, indexed grid[reel][row]"""
+        return [ids[stop:stop + height]
+                for ids, stop, height in zip(self.strip_windows, stops, heights or self.heights)]
+
+    def window_symbols(self, stops, heights=None):
+        """Grid of symbols for the given stops, indexed grid[reel][row]"""
+        return [strip[stop:stop + height]
+                for strip, stop, height in zip(self.symbol_windows, stops, heights or self.heights)]
+
+    def bet_lines(self, lines=None):
+        """Bet multiplier for ``lines`` active lines: all lines by default, always the cost of a ways game"""
+        return max(self.min_lines, min(self.max_lines, lines or self.max_lines))
+
+    def ids_for(self, grid):
+        """Symbol grid converted to symbol IDs"""
+        return [[self.symbol_ids[symbol] for symbol in column] for column in grid]
+
+    def multiplier_for_streak(self, win_streak):
+        """Return the streak multiplier for the given number of consecutive wins"""
+        for min_streak, multiplier in self.streak_multipliers:
+            if win_streak >= min_streak:
+                return multiplier
+        return 1
+
+    def bonus_spins_for_scatters(self, scatter_count):
+        """Free spins awarded for a scatter count"""
+        if scatter_count < self.scatter_trigger:
+            return 0
+        return self.free_spins + (scatter_count - self.scatter_trigger) * self.free_spins_per_extra_scatter
+
+
+def game_path(name):
+    """Path of a game definition: an existing file, or the name of a bundled game"""
+    if os.path.isfile(name):
+        return name
+    for ext in (".json", ".toml"):
+        path = os.path.join(GAMES_DIR, name + ext)
+        if os.path.isfile(path):
+            return path
+    raise GameDefinitionError(f"{name}: no such game file or bundled game ({', '.join(list_games())})")
+
+
+def list_games():
+    """Names of the bundled games"""
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(GAMES_DIR)
+                  if name.endswith((".json", ".toml")))
+
+
+def load_game(name=DEFAULT_GAME):
+    """Load, validate and compile a game definition file or bundled game"""
+    path = game_path(name)
+    toml = path.endswith(".toml")
+    if toml and tomllib is None:
+        raise GameDefinitionError(f"{path}: reading TOML needs Python 3.11+")
+    try:
+        if toml:
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        else:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+    except (OSError, ValueError) as exc:
+        raise GameDefinitionError(f"{path}: {exc}") from exc
+    try:
+        return GameModel(data, os.path.splitext(os.path.basename(path))[0])
+    except GameDefinitionError as exc:
+        raise GameDefinitionError(f"{path}: {exc}") from None
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate PySlot game definitions")
+    parser.add_argument("games", nargs="*", help="game files or bundled game names (default: all bundled)")
+    args = parser.parse_args()
+
+    failed = False
+    for name in args.games or list_games():
+        try:
+            game = load_game(name)
+        except GameDefinitionError as exc:
+            print(f"⚠ {exc}")
+            failed = True
+            continue
+        lengths = "/".join(str(len(strip)) for strip in game.strips)
+        pays = f"{game.max_ways:,} ways" if game.ways else f"{len(game.win_lines)} lines"
+        print(f"✓ {name}: {game.name}, {game.reels}x{game.rows}, {pays}, "
+              f"{len(game.symbols)} symbols, strips {lengths}")
+    raise SystemExit(1 if failed else 0)
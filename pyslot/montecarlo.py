@@ -0,0 +1,232 @@
+"""Multi-core Monte Carlo runner for the spin engine.
+
+The run is cut into fixed-size tasks. Every task gets its own PCG64 stream
+spawned from one master ``SeedSequence`` and plays an independent sequence
+of spins from a fresh engine state. The partial statistics are merged in
+task order, so a run is reproducible from (seed, spins, task_size) no
+matter how many worker processes take part.
+
+Unlike ``batch.simulate`` the tasks follow the full engine rules: the win
+streak multiplier ladder, free spins (no bet, double wins) and free-spin
+retriggers are applied along each sequence. The bankroll is unlimited.
+Win multiple variance, quantiles and session drawdowns are kept in
+constant memory by pyslot.streaming.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pyslot.batch import evaluate_cells, random_cells
+from pyslot.engine import GAME
+from pyslot.model import DEFAULT_GAME, load_game
+from pyslot.streaming import StreamingStats
+
+DEFAULT_TASK_SPINS = 10_000_000
+DEFAULT_CHUNK = 1 << 18
+
+# Win histogram bucket edges, in multiples of the total bet
+WIN_BUCKETS = [1, 2, 5, 10, 25, 50, 100, 250, 500]
+
+
+def streak_ladder(game):
+    """Multiplier for every streak length up to the top of the game's ladder; index with min(streak, cap)"""
+    cap = game.streak_multipliers[0][0] if game.streak_multipliers else 0
+    return np.array([game.multiplier_for_streak(streak) for streak in range(cap + 1)], dtype=np.int64), cap
+
+
+class SimulationStats:
+    """Partial or merged statistics of a Monte Carlo run"""
+
+    def __init__(self, lines, bet_per_line, game=GAME):
+        self.symbols = game.symbols
+        self.min_match = game.min_match
+        self.lines = lines
+        self.bet_per_line = bet_per_line
+        self.spins = 0
+        self.free_spins = 0
+        self.total_bet = 0
+        self.total_win = 0
+        self.hits = 0
+        self.bonus_triggers = 0
+        self.max_streak = 0
+        # histogram[0] counts losing spins, histogram[k] wins in [WIN_BUCKETS[k-2], WIN_BUCKETS[k-1]) x bet
+        self.histogram = np.zeros(len(WIN_BUCKETS) + 2, dtype=np.int64)
+        # Paying lines per (symbol, match count)
+        self.symbol_hits = np.zeros((len(game.symbols), game.reels + 1), dtype=np.int64)
+        # Win multiple variance and quantiles, session drawdowns
+        self.stream = StreamingStats()
+
+    def merge(self, other):
+        """Fold another partial result into this one"""
+        self.spins += other.spins
+        self.free_spins += other.free_spins
+        self.total_bet += other.total_bet
+        self.total_win += other.total_win
+        self.hits += other.hits
+        self.bonus_triggers += other.bonus_triggers
+        self.max_streak = max(self.max_streak, other.max_streak)
+        self.histogram += other.histogram
+        self.symbol_hits += other.symbol_hits
+        self.stream.merge(other.stream)
+        return self
+
+    @property
+    def rtp(self):
+        return self.total_win / self.total_bet if self.total_bet else 0.0
+
+    def report(self):
+        """Plain dict summary, safe to dump as JSON"""
+        labels = ["0"] + [f"<{WIN_BUCKETS[0]}x"]
+        labels += [f"{lo}-{hi}x" for lo, hi in zip(WIN_BUCKETS, WIN_BUCKETS[1:])] + [f"{WIN_BUCKETS[-1]}x+"]
+        return {
+            'spins': self.spins,
+            'lines': self.lines,
+            'bet_per_line': self.bet_per_line,
+            'free_spins': self.free_spins,
+            'total_bet': self.total_bet,
+            'total_win': self.total_win,
+            'rtp': self.rtp,
+            'hits': self.hits,
+            'hit_rate': self.hits / self.spins if self.spins else 0.0,
+            'bonus_triggers': self.bonus_triggers,
+            'max_streak': self.max_streak,
+            'win_histogram': dict(zip(labels, self.histogram.tolist())),
+            'symbol_hits': {symbol: self.symbol_hits[i, self.min_match:].tolist()
+                            for i, symbol in enumerate(self.symbols)},
+            'stream': self.stream.report(),
+        }
+
+
+def _free_spin_mask(awards, free_left):
+    """Mark the spins played as free spins; returns (mask, free spins carried past the chunk)"""
+    n = len(awards)
+    edges = np.zeros(n + 1, dtype=np.int64)
+    start, end = 0, free_left
+    for i in np.flatnonzero(awards):
+        if i < end:
+            # Retrigger during free spins extends the current run
+            end += int(awards[i])
+        else:
+            edges[start] += 1
+            edges[min(end, n)] -= 1
+            start, end = i + 1, i + 1 + int(awards[i])
+    edges[min(start, n)] += 1
+    edges[min(end, n)] -= 1
+    return np.cumsum(edges[:n]) > 0, max(0, end - n)
+
+
+def _streaks(won, streak):
+    """Win streak after every spin, continuing from the streak carried in"""
+    idx = np.arange(len(won))
+    last_loss = np.maximum.accumulate(np.where(won, -1 - streak, idx))
+    return np.where(won, idx - last_loss, 0)
+
+
+def run_task(seed, spins, lines=None, bet_per_line=1, chunk_size=DEFAULT_CHUNK, game=GAME):
+    """Play one independent sequence of ``spins`` spins from ``seed`` (a SeedSequence)"""
+    lines = game.bet_lines(lines)
+    rng = np.random.Generator(np.random.PCG64(seed))
+    stats = SimulationStats(lines, bet_per_line, game)
+    ladder, streak_cap = streak_ladder(game)
+    total_bet = lines * bet_per_line
+    edges = np.array(WIN_BUCKETS, dtype=np.float64) * total_bet
+
+    streak = 0
+    free_left = 0
+    done = 0
+    while done < spins:
+        n = min(chunk_size, spins - done)
+        result = evaluate_cells(random_cells(n, rng, game=game), lines, bet_per_line, game)
+        base = result.total_win
+        won = base > 0
+
+        free, free_left = _free_spin_mask(result.bonus_spins, free_left)
+        streaks = _streaks(won, streak)
+        if n:
+            streak = int(streaks[-1])
+
+        final_win = base * ladder[np.minimum(streaks, streak_cap)]
+        final_win[free] *= game.free_spin_multiplier
+
+        n_free = int(np.count_nonzero(free))
+        stats.spins += n
+        stats.free_spins += n_free
+        stats.total_bet += (n - n_free) * total_bet
+        stats.total_win += int(final_win.sum())
+        stats.hits += int(np.count_nonzero(won))
+        stats.bonus_triggers += int(np.count_nonzero(result.bonus_spins))
+        stats.max_streak = max(stats.max_streak, int(streaks.max(initial=0)))
+
+        buckets = np.where(won, np.searchsorted(edges, final_win, side='right') + 1, 0)
+        stats.histogram += np.bincount(buckets, minlength=len(stats.histogram))
+        keys = result.line_symbols.astype(np.intp) * (game.reels + 1) + result.match_counts
+        stats.symbol_hits += np.bincount(keys.ravel(), minlength=stats.symbol_hits.size).reshape(stats.symbol_hits.shape)
+        stats.stream.update(final_win, total_bet, free)
+        done += n
+
+    return stats
+
+
+def run(spins, lines=None, bet_per_line=1, seed=0, workers=None, task_spins=DEFAULT_TASK_SPINS, game=GAME):
+    """Spread ``spins`` spins over a process pool and merge the results.
+
+    The result depends only on (game, spins, lines, bet_per_line, seed,
+    task_spins); ``workers`` (default: every core) only changes the speed.
+    """
+    lines = game.bet_lines(lines)
+    tasks = [task_spins] * (spins // task_spins)
+    if spins % task_spins:
+        tasks.append(spins % task_spins)
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+
+    stats = SimulationStats(lines, bet_per_line, game)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        for task_seed, task in zip(seeds, tasks):
+            stats.merge(run_task(task_seed, task, lines, bet_per_line, game=game))
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_task, task_seed, task, lines, bet_per_line, game=game)
+                   for task_seed, task in zip(seeds, tasks)]
+        for future in futures:
+            stats.merge(future.result())
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Multi-core PySlot Monte Carlo run")
+    parser.add_argument("--spins", type=float, default=1e8)
+    parser.add_argument("--game", default=DEFAULT_GAME, help="game definition file or bundled game name")
+    parser.add_argument("--lines", type=int, default=None, help="active lines (default: all)")
+    parser.add_argument("--bet", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--task-spins", type=float, default=DEFAULT_TASK_SPINS)
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = run(int(args.spins), args.lines, args.bet, args.seed, args.workers, int(args.task_spins),
+                load_game(args.game))
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(stats.report(), ensure_ascii=False, indent=2))
+    else:
+        print(f"Spins:      {stats.spins:,} in {elapsed:.1f}s ({stats.spins / elapsed:,.0f} spins/sec)")
+        print(f"RTP:        {stats.rtp:.4%}")
+        print(f"Hit rate:   {stats.hits / stats.spins:.4%}")
+        print(f"Max streak: {stats.max_streak}")
+        print(f"Free spins: {stats.free_spins:,} ({stats.bonus_triggers:,} triggers)")
+        stream = stats.stream.report()
+        print(f"Volatility: {stream['volatility_index']:.2f} (std {stream['std']:.2f} x bet)")
+        print(f"Win p99.9:  {stream['win_quantiles']['p99.9']:.1f} x bet")
+        if stream['sessions']:
+            print(f"Drawdown:   median {stream['drawdown_quantiles']['p50']:.0f}, "
+                  f"p99 {stream['drawdown_quantiles']['p99']:.0f} x bet per {stream['session_spins']:,} spins")
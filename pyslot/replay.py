@@ -0,0 +1,184 @@
+"""Seeded session recording and headless replay.
+
+Spin outcomes depend only on the spin RNG seed and on the player's inputs,
+so a session is fully described by its seed and input timeline. A
+recording is a JSON lines file: a header line, then one event per line as
+it happens:
+
+    {"version": 1, "game": "classic", "seed": 8231..., "coins": 1000}
+    ["lines", 5]                      set_lines, with the resulting value
+    ["bet", 3]                        set_bet, with the resulting value
+    ["spin"]                          start_spin that went ahead
+    ["settle", 1040, 2, 0]            settle: coins, win streak, free spins after
+
+SessionRecorder hooks into SlotEngine (engine.recorder) and writes events
+as the engine sees them, so every input path of the GUI is captured and a
+session cut short still replays up to its last event. replay() re-runs a
+recording on a bare engine, with no rendering and no animation timing,
+and checks every settled spin against the recorded state. Pass another
+game to find out how a math change would have played out for the same
+player.
+"""
+import json
+import os
+import secrets
+import time
+
+from pyslot.engine import SlotEngine
+from pyslot.model import DEFAULT_GAME, load_game
+
+VERSION = 1
+
+
+class ReplayError(ValueError):
+    """A recording is unreadable or asks for something the engine refused"""
+
+
+def new_seed():
+    """Fresh 64-bit seed for a recorded session"""
+    return secrets.randbits(64)
+
+
+class SessionRecorder:
+    """Writes the seed and input timeline of one engine to a recording file"""
+
+    def __init__(self, path, engine, game, seed):
+        self.path = path
+        self.file = open(path, "w", encoding="utf-8")
+        self._write({'version': VERSION, 'game': game, 'seed': seed, 'coins': engine.coins,
+                     'lines': engine.lines, 'bet': engine.bet_per_line})
+
+    def _write(self, item):
+        # One event per line, flushed at once: inputs arrive at human speed
+        self.file.write(json.dumps(item, separators=(',', ':')) + "\n")
+        self.file.flush()
+
+    def event(self, *event):
+        if not self.file.closed:
+            self._write(list(event))
+
+    def close(self):
+        self.file.close()
+
+
+def record_session(path, coins, game=DEFAULT_GAME, seed=None):
+    """New engine seeded explicitly, with a recorder attached; returns the engine"""
+    seed = new_seed() if seed is None else seed
+    engine = SlotEngine(coins, seed=seed, game=load_game(game))
+    engine.recorder = SessionRecorder(path, engine, game, seed)
+    return engine
+
+
+def read_recording(path):
+    """(header, events) of a recording file"""
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    try:
+        header = json.loads(lines[0]) if lines else None
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get('version') != VERSION:
+        raise ReplayError(f"{path}: not a version {VERSION} PySlot session recording")
+    events = []
+    for line in lines[1:]:
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            # A line cut short by a crash ends the recording
+            break
+    return header, events
+
+
+class ReplayReport:
+    """What a replay did and where it disagreed with the recording"""
+
+    def __init__(self, path):
+        self.path = path
+        self.spins = 0
+        self.mismatches = []  # (event number, field, recorded, replayed)
+        self.coins = None
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return not self.mismatches
+
+
+def replay(path, game=None, stop_at_mismatch=True):
+    """Re-run a recording headlessly and verify coins, streaks and free spins; returns a ReplayReport.
+
+    ``game`` (name or path) replaces the recorded game definition. With
+    ``stop_at_mismatch`` the replay ends at the first divergence, since
+    everything after it differs anyway.
+    """
+    header, events = read_recording(path)
+    report = ReplayReport(path)
+    start = time.perf_counter()
+    engine = SlotEngine(header['coins'], seed=header['seed'], game=load_game(game or header['game']))
+    engine.set_lines(header['lines'])
+    engine.set_bet(header['bet'])
+
+    for number, event in enumerate(events, 1):
+        kind = event[0]
+        if kind == 'lines':
+            engine.set_lines(event[1])
+        elif kind == 'bet':
+            engine.set_bet(event[1])
+        elif kind == 'spin':
+            if engine.start_spin() is None:
+                report.mismatches.append((number, 'spin', 'played', 'bet not covered'))
+                break
+        elif kind == 'settle':
+            engine.settle()
+            report.spins += 1
+            replayed = (engine.coins, engine.win_streak, engine.free_spins)
+            for field, recorded, actual in zip(('coins', 'streak', 'free_spins'), event[1:], replayed):
+                if recorded != actual:
+                    report.mismatches.append((number, field, recorded, actual))
+            if report.mismatches and stop_at_mismatch:
+                break
+        else:
+            raise ReplayError(f"{path}: unknown event {event!r} at line {number + 1}")
+
+    report.coins = engine.coins
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay and verify recorded PySlot sessions")
+    parser.add_argument("paths", nargs="+", help="session recordings (directories are searched for *.jsonl)")
+    parser.add_argument("--game", default=None, help="replay against this game definition instead of the recorded one")
+    parser.add_argument("--all-mismatches", action="store_true", help="keep going after the first mismatch")
+    args = parser.parse_args()
+
+    paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            paths.extend(sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".jsonl")))
+        else:
+            paths.append(path)
+
+    failed = 0
+    spins = 0
+    start = time.perf_counter()
+    for path in paths:
+        try:
+            report = replay(path, args.game, stop_at_mismatch=not args.all_mismatches)
+        except (OSError, ValueError) as e:
+            print(f"⚠ {path}: {e}")
+            failed += 1
+            continue
+        spins += report.spins
+        if report.ok:
+            print(f"✓ {path}: {report.spins:,} spins, {report.coins:,} coins")
+            continue
+        failed += 1
+        print(f"⚠ {path}: {len(report.mismatches)} mismatch(es) in {report.spins:,} spins")
+        for number, field, recorded, replayed in report.mismatches[:10]:
+            print(f"    event {number}: {field} recorded {recorded}, replayed {replayed}")
+    elapsed = time.perf_counter() - start
+    print(f"{len(paths) - failed}/{len(paths)} sessions verified, {spins:,} spins "
+          f"({spins / elapsed if elapsed else 0:,.0f} spins/sec)")
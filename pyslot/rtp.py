@@ -0,0 +1,266 @@
+"""Exact per-spin return and hit frequency for a set of reel strips.
+
+A spin stops every reel at a random index of its strip (uniform, or
+weighted by the stop weights of virtual reels), and the reels are
+independent. Each line reads one cell per reel, so a line pays ``k`` of a
+symbol with probability ``p_0 * ... * p_(k-1) * (1 - p_k)`` where ``p_r``
+is the chance of the symbol showing in that line's row of reel ``r`` (no
+``1 - p`` factor for five of a kind). The scatter count is the convolution
+of every reel's window scatter counts.
+
+Hit frequency needs the joint outcome because the lines share cells. A
+line's payout is decided by its first MIN_MATCH reels, so the calculator
+enumerates every stop combination of those reels (207 ** 3 for the default
+game, in NumPy) and folds the remaining reels in through their scatter
+count distribution.
+
+Ways games pay ``pay * k * c_0 * ... * c_(k-1)`` for a run of ``k`` reels
+where ``c_r`` counts the symbol on reel ``r``. The reels are independent,
+so the expected product is the product of per-reel mean counts, times the
+chance the symbol is missing from reel ``k``. Reel outcomes include the
+height drawn for the spin. Hit frequency folds the first MIN_MATCH reels
+together as bit masks of the symbols they show.
+
+Streak and free-spin multipliers depend on earlier spins and are not part
+of this per-spin figure.
+"""
+import itertools
+
+import numpy as np
+
+from pyslot.engine import GAME
+from pyslot.model import DEFAULT_GAME, load_game
+
+
+def _windows(strip_ids, rows):
+    """Symbol IDs in view for every stop of a strip, shape (len(strip), rows)"""
+    stops = np.arange(len(strip_ids))[:, None] + np.arange(rows)
+    return strip_ids[stops % len(strip_ids)]
+
+
+def _outcome_windows(game):
+    """Cells in view and chance of every reel outcome (stop, or stop and height), per reel.
+
+    Cells below the reel's height hold len(game.symbols), which matches no symbol.
+    """
+    blank = len(game.symbols)
+    windows = []
+    for ids, options in zip(game.strip_ids, game.reel_heights):
+        stop_windows = _windows(np.array(ids, dtype=np.intp), game.rows)
+        # Outcome order matches the sampler: stop-major, then height option
+        reel = np.repeat(stop_windows, len(options), axis=0)
+        heights = np.tile(np.array(options), len(ids))
+        reel[np.arange(game.rows)[None, :] >= heights[:, None]] = blank
+        windows.append(reel)
+    return windows, game.stop_sampler.probabilities
+
+
+def _symbol_counts(windows, symbol_count):
+    """Count of every symbol in every window, shape (len(windows), symbol_count)"""
+    width = symbol_count + 1
+    keys = windows + np.arange(len(windows))[:, None] * width
+    return np.bincount(keys.ravel(), minlength=len(windows) * width).reshape(len(windows), width)[:, :symbol_count]
+
+
+def _scatter_distribution(windows, stop_probs, scatter_id):
+    """Probability of 0..rows scatters in view on one reel"""
+    counts = np.count_nonzero(windows == scatter_id, axis=1)
+    return np.bincount(counts, weights=stop_probs, minlength=windows.shape[1] + 1)
+
+
+def _convolve(distributions, length):
+    """Distribution of the sum of independent counts, padded to ``length``"""
+    total = np.ones(1)
+    for dist in distributions:
+        total = np.convolve(total, dist)
+    return np.pad(total, (0, max(0, length - len(total))))[:length]
+
+
+def _no_hit_probability(windows, stop_probs, scatter_id, line_rows, scatter_dists, lead, trigger):
+    """Probability that no active line pays and fewer than ``trigger`` scatters land"""
+    # P(scatters on the reels after the lead ones < k) for k = 0..trigger
+    rest = _convolve(scatter_dists[lead:], trigger + 1)
+    below = np.concatenate([[0.0], np.cumsum(rest)[:trigger]])
+
+    # Scatters in view per stop of each lead reel
+    scatters = [np.count_nonzero(w == scatter_id, axis=1) for w in windows[:lead]]
+
+    # Loop over the stops of all but the last two lead reels, broadcast those two against each other
+    a, b = windows[lead - 2], windows[lead - 1]
+    pair_scatters = scatters[lead - 2][:, None] + scatters[lead - 1][None, :]
+    pair_probs = stop_probs[lead - 2][:, None] * stop_probs[lead - 1][None, :]
+    no_hit = 0.0
+    for outer in itertools.product(*(np.flatnonzero(p) for p in stop_probs[:lead - 2])):
+        outer_prob = np.prod([stop_probs[reel][stop] for reel, stop in enumerate(outer)])
+        outer_scatters = sum(scatters[reel][stop] for reel, stop in enumerate(outer))
+        hit = np.zeros((len(a), len(b)), dtype=bool)
+        for line in line_rows:
+            if not outer:
+                hit |= a[:, line[0]][:, None] == b[:, line[1]][None, :]
+                continue
+            # The outer reels must already agree with the first reel on this line
+            first = windows[0][outer[0], line[0]]
+            if any(windows[reel][stop, line[reel]] != first for reel, stop in enumerate(outer)):
+                continue
+            hit |= (a[:, line[lead - 2]][:, None] == first) & (b[:, line[lead - 1]][None, :] == first)
+        needed = np.clip(trigger - outer_scatters - pair_scatters, 0, trigger)
+        no_hit += float(outer_prob * (below[needed] * pair_probs)[~hit].sum())
+    return no_hit
+
+
+def _aggregate(masks, scatters, probs, base):
+    """Merge outcomes with the same (symbol mask, scatter count)"""
+    keys, inverse = np.unique(masks * np.uint64(base) + scatters.astype(np.uint64), return_inverse=True)
+    return keys // np.uint64(base), (keys % np.uint64(base)).astype(np.intp), np.bincount(inverse, weights=probs)
+
+
+def _ways_no_hit_probability(counts, scatters, outcome_probs, scatter_dists, way_ids, lead, trigger):
+    """Probability that no symbol shows on every one of the first ``lead`` reels and fewer than ``trigger`` scatters land.
+
+    A ways win needs its symbol on each of the lead reels, so every lead
+    reel reduces to a distribution over (bit mask of symbols shown,
+    scatters capped at ``trigger``) and the reels fold together with a
+    bitwise AND. Returns None when the masks do not fit in 64 bits.
+    """
+    base = trigger + 1
+    if len(way_ids) + int(base - 1).bit_length() > 64:
+        return None
+    rest = _convolve(scatter_dists[lead:], trigger + 1)
+    below = np.concatenate([[0.0], np.cumsum(rest)[:trigger]])
+
+    bits = np.zeros(counts[0].shape[1], dtype=np.uint64)
+    bits[way_ids] = np.left_shift(np.uint64(1), np.arange(len(way_ids), dtype=np.uint64))
+    masks, shown, probs = None, None, None
+    for reel in range(lead):
+        reel_masks = np.bitwise_or.reduce(np.where(counts[reel] > 0, bits, np.uint64(0)), axis=1)
+        reel_shown = np.minimum(scatters[reel], trigger)
+        if masks is None:
+            masks, shown, probs = _aggregate(reel_masks, reel_shown, outcome_probs[reel], base)
+            continue
+        reel_masks, reel_shown, reel_probs = _aggregate(reel_masks, reel_shown, outcome_probs[reel], base)
+        masks, shown, probs = _aggregate((masks[:, None] & reel_masks[None, :]).ravel(),
+                                         np.minimum(shown[:, None] + reel_shown[None, :], trigger).ravel(),
+                                         (probs[:, None] * reel_probs[None, :]).ravel(), base)
+    missed = masks == 0
+    return float((probs[missed] * below[trigger - shown[missed]]).sum())
+
+
+def _ways_returns(counts, outcome_probs, game):
+    """Per-coin ways RTP, chance of paying per symbol and match count, and the expected paying symbols per spin"""
+    # Expected count of every symbol per reel, and the chance it is missing, shape (reels, symbols)
+    mean = np.array([p @ c for c, p in zip(counts, outcome_probs)])
+    absent = np.array([p @ (c == 0) for c, p in zip(counts, outcome_probs)])
+    contributions = {}
+    line_rtp = 0.0
+    pay_rate = 0.0
+    for symbol_id in game.way_ids:
+        by_count = {}
+        for count in range(game.min_match, game.reels + 1):
+            tail = absent[count, symbol_id] if count < game.reels else 1.0
+            # Reels are independent, so E[product of counts] is the product of the means
+            ways = np.prod(mean[:count, symbol_id]) * tail
+            by_count[count] = float(game.pays[symbol_id] * count * ways / game.max_lines)
+            line_rtp += by_count[count]
+            pay_rate += float(np.prod(1 - absent[:count, symbol_id]) * tail)
+        contributions[game.symbols[symbol_id]] = by_count
+    return line_rtp, pay_rate, contributions
+
+
+def calculate(lines=None, game=GAME):
+    """Exact per-spin statistics of a game, as a dict.
+
+    ``rtp`` is the expected win per coin bet (bet_per_line cancels out),
+    split into ``line_rtp`` and ``scatter_rtp``; ``contributions`` gives the
+    RTP share of every symbol and match count. For ways games ``lines`` is
+    the bet cost, ``line_rtp`` the ways return and ``line_pay_rate`` the
+    expected number of paying symbols per spin.
+    """
+    lines = game.bet_lines(lines)
+    reels, rows = game.reels, game.rows
+    scatter_id = game.scatter_id
+    symbol_count = len(game.symbols)
+    windows, stop_probs = _outcome_windows(game)
+
+    if game.ways:
+        counts = [_symbol_counts(w, symbol_count) for w in windows]
+        line_rtp, line_pay_rate, contributions = _ways_returns(counts, stop_probs, game)
+    else:
+        line_rows = game.line_rows[:lines]
+        # Chance of every symbol in every row of every reel, shape (reels, rows, symbols)
+        probs = np.array([[np.bincount(w[:, row], weights=p, minlength=symbol_count + 1)[:symbol_count]
+                           for row in range(rows)] for w, p in zip(windows, stop_probs)])
+
+        # One line: run of exactly k of a symbol from the left. Per-coin RTP is the mean return of the active lines
+        contributions = {}
+        line_rtp = 0.0
+        line_pay_rate = 0.0
+        reel_idx = np.arange(reels)
+        for symbol_id, symbol in enumerate(game.symbols):
+            p = probs[reel_idx, line_rows, symbol_id]  # (lines, reels)
+            by_count = {}
+            for count in range(game.min_match, reels + 1):
+                chance = p[:, :count].prod(axis=1) * ((1 - p[:, count]) if count < reels else 1.0)
+                by_count[count] = float(game.pays[symbol_id] * count * chance.mean())
+                line_rtp += by_count[count]
+                line_pay_rate += float(chance.mean())
+            contributions[symbol] = by_count
+
+    # Scatters anywhere
+    scatter_dists = [_scatter_distribution(w, p, scatter_id) for w, p in zip(windows, stop_probs)]
+    scatter_dist = _convolve(scatter_dists, reels * rows + 1)
+    landed = np.arange(len(scatter_dist))
+    triggered = landed >= game.scatter_trigger
+    scatter_rtp = float((scatter_dist * landed * triggered).sum()) * game.pays[scatter_id] / lines
+    bonus_rate = float(scatter_dist[triggered].sum())
+    free_spins = float(sum(scatter_dist[k] * game.bonus_spins_for_scatters(k) for k in landed))
+    contributions.setdefault(game.scatter, {})['scatter'] = scatter_rtp
+
+    if game.ways:
+        scatters = [np.count_nonzero(w == scatter_id, axis=1) for w in windows]
+        no_hit = _ways_no_hit_probability(counts, scatters, stop_probs, scatter_dists, game.way_ids,
+                                          game.min_match, game.scatter_trigger)
+    else:
+        no_hit = _no_hit_probability(windows, stop_probs, scatter_id, line_rows, scatter_dists,
+                                     game.min_match, game.scatter_trigger)
+    hit_frequency = None if no_hit is None else 1.0 - no_hit
+
+    return {
+        'lines': lines,
+        'ways': game.max_ways if game.ways else None,
+        'rtp': line_rtp + scatter_rtp,
+        'line_rtp': line_rtp,
+        'scatter_rtp': scatter_rtp,
+        'hit_frequency': hit_frequency,
+        'line_pay_rate': line_pay_rate,
+        'bonus_rate': bonus_rate,
+        'free_spins_per_spin': free_spins,
+        'scatter_distribution': scatter_dist.tolist(),
+        'contributions': contributions,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Exact PySlot RTP and hit frequency")
+    parser.add_argument("--game", default=DEFAULT_GAME, help="game definition file or bundled game name")
+    parser.add_argument("--lines", type=int, default=None, help="active lines (default: all)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = calculate(args.lines, load_game(args.game))
+    elapsed = time.perf_counter() - start
+
+    if stats['ways']:
+        print(f"Ways:           up to {stats['ways']:,} (cost {stats['lines']}, computed in {elapsed * 1000:.0f} ms)")
+    else:
+        print(f"Lines:          {stats['lines']} (computed in {elapsed * 1000:.0f} ms)")
+    print(f"RTP:            {stats['rtp']:.6%}  (lines {stats['line_rtp']:.6%}, scatter {stats['scatter_rtp']:.6%})")
+    if stats['hit_frequency'] is not None:
+        print(f"Hit frequency:  {stats['hit_frequency']:.6%}")
+    print(f"Bonus rate:     {stats['bonus_rate']:.6%}  ({stats['free_spins_per_spin']:.5f} free spins/spin)")
+    print("Contributions:")
+    for symbol, by_count in stats['contributions'].items():
+        parts = "  ".join(f"{count}: {rtp:.6%}" for count, rtp in by_count.items())
+        print(f"  {symbol}  {parts}")
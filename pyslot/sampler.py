@@ -0,0 +1,88 @@
+"""Weighted sampling with Walker's alias method.
+
+An AliasTable is built once from a list of weights (Vose's O(n) setup) and
+then draws in constant time from one uniform number: its integer part
+picks a column, its fraction decides between the column itself and the
+column's alias. Equal weights skip the table and draw integers directly.
+
+ReelSampler keeps one table per reel and produces stops for every reel in
+vectorized blocks. The engine takes one spin at a time out of a
+pre-generated block. The batch simulator draws whole chunks from the same
+tables, so GUI play and offline analysis sample stops the same way.
+"""
+import numpy as np
+
+DEFAULT_BLOCK = 4096
+
+
+class AliasTable:
+    """Alias table for one set of non-negative weights"""
+
+    def __init__(self, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1 or len(weights) == 0 or (weights < 0).any() or not weights.sum() > 0:
+            raise ValueError("weights must be a non-empty list of non-negative numbers with a positive sum")
+        self.size = len(weights)
+        self.probabilities = weights / weights.sum()
+        self.uniform = bool((weights == weights[0]).all())
+
+        # Vose: pair every under-full column with an over-full one that tops it up
+        scaled = self.probabilities * self.size
+        self.prob = np.ones(self.size)
+        self.alias = np.arange(self.size, dtype=np.intp)
+        small = [i for i in range(self.size) if scaled[i] < 1.0]
+        large = [i for i in range(self.size) if scaled[i] >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self.prob[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+        # Whatever is left is full up to rounding and keeps prob 1
+
+    def sample(self, rng, n):
+        """Draw ``n`` indices as an intp array"""
+        if self.uniform:
+            return rng.integers(0, self.size, size=n, dtype=np.intp)
+        u = rng.random(n) * self.size
+        column = u.astype(np.intp)
+        return np.where(u - column < self.prob[column], column, self.alias[column])
+
+
+class ReelSampler:
+    """Stop sampler with one alias table per reel"""
+
+    def __init__(self, weight_tables, seed=None, block_size=DEFAULT_BLOCK):
+        self.tables = [AliasTable(weights) for weights in weight_tables]
+        self.rng = np.random.default_rng(seed)
+        self.block_size = block_size
+        self._block = []
+        self._next = 0
+
+    @classmethod
+    def for_strips(cls, strips, stop_weights=None, seed=None, block_size=DEFAULT_BLOCK):
+        """Sampler over the stops of reel strips; uniform unless stop_weights has one list per reel"""
+        if stop_weights is None:
+            stop_weights = [[1] * len(strip) for strip in strips]
+        if len(stop_weights) != len(strips) or any(len(w) != len(s) for w, s in zip(stop_weights, strips)):
+            raise ValueError("stop_weights needs one weight per stop of every reel strip")
+        return cls(stop_weights, seed, block_size)
+
+    @property
+    def probabilities(self):
+        """Chance of every stop, one array per reel"""
+        return [table.probabilities for table in self.tables]
+
+    def draw(self, n, rng=None):
+        """Draw ``n`` stops on every reel, shape (reels, n)"""
+        rng = rng if rng is not None else self.rng
+        return np.stack([table.sample(rng, n) for table in self.tables])
+
+    def next_stops(self):
+        """Stops for one spin as a list of ints, served from the current block"""
+        if self._next >= len(self._block):
+            self._block = self.draw(self.block_size).T.tolist()
+            self._next = 0
+        stops = self._block[self._next]
+        self._next += 1
+        return stops
@@ -0,0 +1,280 @@
+"""Asyncio game server: many independent sessions behind one socket.
+
+Each session is a SlotEngine, the same headless spin, bet, streak and
+free spin state the pygame front end plays on. Clients speak line-delimited
+JSON over TCP or a Unix socket: one request object per line, answered by
+one response object per line, in order. A request names an ``op`` and,
+except for ``open``, ``games`` and ``ping``, the ``session`` it acts on;
+an optional ``id`` is echoed back.
+
+    {"op": "open", "game": "classic"}
+        -> {"ok": true, "session": 1, "game": "classic", "state": {...}, "grid": [...], ...}
+    {"op": "spin", "session": 1}
+        -> {"ok": true, "played": true, "staked": {...}, "result": {...}, "state": {...}, "grid": [...], ...}
+    {"op": "bet", "session": 1, "bet": 5}       {"op": "lines", "session": 1, "lines": 9}
+    {"op": "state", "session": 1}              {"op": "close", "session": 1}
+    {"op": "games"}                            {"op": "ping"}
+
+Errors come back as {"ok": false, "error": "..."}. Sessions belong to the
+connection that opened them and end with it. Only bundled games can be
+opened. Sessions start with the engine's starting bankroll and an
+unpredictable RNG seed; only a server started with ``--trust-clients``
+(for tests and load tests) lets ``open`` pick ``coins`` and ``seed``.
+A spin is played and settled in one request; ``staked`` is the
+state between paying and settling, so a renderer can show the bet going
+out before the win comes in (see pyslot.client).
+
+``--workers N`` forks N processes that share the listening socket, one
+event loop per core.
+"""
+import asyncio
+import itertools
+import json
+import os
+import signal
+import socket
+
+from pyslot.engine import STARTING_COINS, SlotEngine
+from pyslot.model import DEFAULT_GAME, GameDefinitionError, list_games, load_game
+
+DEFAULT_PORT = 7777
+# Sessions one server process holds at most
+MAX_SESSIONS = 100_000
+# Pending response bytes that make a connection wait for the client to read
+HIGH_WATER = 1 << 16
+STATE_FIELDS = ('coins', 'bet_per_line', 'min_bet', 'max_bet', 'lines', 'total_bet', 'win_streak', 'multiplier',
+                'max_streak', 'free_spins', 'free_spins_active')
+
+
+class RequestError(ValueError):
+    """A request that cannot be served; its message goes back to the client"""
+
+
+def parse_address(address):
+    """("unix", path) for "unix:/path", else ("tcp", (host, port)) for "host:port" or ":port" """
+    if address.startswith("unix:"):
+        return "unix", address[5:]
+    host, _, port = address.rpartition(":")
+    return "tcp", (host or "127.0.0.1", int(port or DEFAULT_PORT))
+
+
+def listen(address, backlog=1024):
+    """Bound, listening socket for an address (see parse_address)"""
+    kind, where = parse_address(address)
+    if kind == "unix":
+        if os.path.exists(where):
+            os.unlink(where)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        sock = socket.socket(socket.AF_INET6 if ":" in where[0] else socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(where)
+    sock.listen(backlog)
+    sock.setblocking(False)
+    return sock
+
+
+def engine_state(engine):
+    return {field: getattr(engine, field) for field in STATE_FIELDS}
+
+
+def engine_view(engine):
+    """State plus what is on the reels"""
+    return {'state': engine_state(engine), 'grid': engine.grid, 'stops': list(engine.stops),
+            'heights': list(engine.heights)}
+
+
+def result_view(result):
+    return {'winning_lines': result.winning_lines, 'scatter_count': result.scatter_count,
+            'bonus_spins': result.bonus_spins, 'total_win': result.total_win, 'free_spin': result.free_spin,
+            'multiplier_increased': result.multiplier_increased, 'final_multiplier': result.final_multiplier,
+            'final_win': result.final_win}
+
+
+class GameServer:
+    """Session table and request dispatch, independent of the transport"""
+
+    def __init__(self, games=None, max_sessions=MAX_SESSIONS, trust_clients=False):
+        self.allowed = set(games or list_games())
+        self.max_sessions = max_sessions
+        # Whether 'open' may set the bankroll and the RNG seed
+        self.trust_clients = trust_clients
+        self.sessions = {}
+        self.games = {}
+        self._ids = itertools.count(1)
+
+    def game(self, name):
+        if not isinstance(name, str):
+            raise RequestError("game must be a string")
+        if name not in self.allowed:
+            raise RequestError(f"unknown game {name!r}; available: {', '.join(sorted(self.allowed))}")
+        if name not in self.games:
+            try:
+                self.games[name] = load_game(name)
+            except GameDefinitionError as e:
+                raise RequestError(str(e)) from None
+        return self.games[name]
+
+    def session(self, request, owned):
+        sid = _integer(request, 'session')
+        if sid not in owned:
+            raise RequestError(f"no open session {sid!r} on this connection")
+        return self.sessions[sid]
+
+    def handle(self, request, owned):
+        """Serve one request dict; ``owned`` is the set of session IDs of the connection"""
+        op = request.get('op')
+        if op == 'spin':
+            engine = self.session(request, owned)
+            if engine.start_spin() is None:
+                return {'played': False, 'error': "bet not covered", **engine_view(engine)}
+            staked = {'coins': engine.coins, 'free_spins': engine.free_spins,
+                      'free_spins_active': engine.free_spins_active, 'total_bet': engine.total_bet}
+            result = engine.settle()
+            return {'played': True, 'staked': staked, 'result': result_view(result), **engine_view(engine)}
+        if op == 'bet':
+            engine = self.session(request, owned)
+            engine.set_bet(_integer(request, 'bet'))
+            return {'state': engine_state(engine)}
+        if op == 'lines':
+            engine = self.session(request, owned)
+            engine.set_lines(_integer(request, 'lines'))
+            return {'state': engine_state(engine)}
+        if op == 'state':
+            return engine_view(self.session(request, owned))
+        if op == 'open':
+            if len(self.sessions) >= self.max_sessions:
+                raise RequestError("server is full")
+            name = request.get('game', DEFAULT_GAME)
+            game = self.game(name)
+            coins, seed = STARTING_COINS, None
+            if 'coins' in request or 'seed' in request:
+                if not self.trust_clients:
+                    raise RequestError("coins and seed are set by the server")
+                coins = _integer(request, 'coins', STARTING_COINS)
+                if coins <= 0:
+                    raise RequestError("coins must be positive")
+                if request.get('seed') is not None:
+                    seed = _integer(request, 'seed')
+            engine = SlotEngine(coins, seed=seed, game=game)
+            sid = next(self._ids)
+            self.sessions[sid] = engine
+            owned.add(sid)
+            return {'session': sid, 'game': name, **engine_view(engine)}
+        if op == 'close':
+            self.session(request, owned)
+            owned.discard(request['session'])
+            del self.sessions[request['session']]
+            return {}
+        if op == 'games':
+            return {'games': sorted(self.allowed)}
+        if op == 'ping':
+            return {}
+        raise RequestError(f"unknown op {op!r}")
+
+    def respond(self, line, owned):
+        """Response line (bytes) for one request line"""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("expected a JSON object")
+            request_id = request.get('id')
+            response = self.handle(request, owned)
+            response['ok'] = 'error' not in response
+        except (RequestError, ValueError) as e:
+            response = {'ok': False, 'error': str(e)}
+        except Exception as e:
+            # A bug serving one request must not take down the connection and its sessions
+            response = {'ok': False, 'error': f"internal error: {type(e).__name__}"}
+        if request_id is not None:
+            response['id'] = request_id
+        return (json.dumps(response, ensure_ascii=False, separators=(',', ':')) + "\n").encode("utf-8")
+
+    async def serve_client(self, reader, writer):
+        owned = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(self.respond(line, owned))
+                if writer.transport.get_write_buffer_size() > HIGH_WATER:
+                    await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            for sid in owned:
+                self.sessions.pop(sid, None)
+            writer.close()
+
+
+def _integer(request, key, default=None):
+    value = request.get(key, default)
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise RequestError(f"{key} must be an integer")
+    return value
+
+
+async def serve(sock, games=None, trust_clients=False):
+    """Serve clients on a listening socket until SIGTERM (or cancellation)"""
+    server = GameServer(games, trust_clients=trust_clients)
+    if sock.family == getattr(socket, "AF_UNIX", None):
+        listener = await asyncio.start_unix_server(server.serve_client, sock=sock)
+    else:
+        listener = await asyncio.start_server(server.serve_client, sock=sock)
+    stopped = asyncio.get_running_loop().create_future()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopped.set_result, None)
+    except (NotImplementedError, AttributeError):  # no signal handlers on Windows event loops
+        pass
+    async with listener:
+        await stopped
+
+
+def run(address, workers=1, games=None, trust_clients=False):
+    """Listen on ``address`` and serve with ``workers`` forked processes (one where fork is unavailable)"""
+    sock = listen(address)
+    children = []
+    if not hasattr(os, "fork"):
+        workers = 1
+    for _ in range(workers - 1):
+        pid = os.fork()
+        if pid == 0:
+            children = None
+            break
+        children.append(pid)
+    try:
+        asyncio.run(serve(sock, games, trust_clients))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if children is not None:
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                    os.waitpid(pid, 0)
+                except (ProcessLookupError, ChildProcessError):
+                    pass
+            kind, where = parse_address(address)
+            if kind == "unix" and os.path.exists(where):
+                os.unlink(where)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="PySlot multi-session game server")
+    parser.add_argument("--listen", default=f"127.0.0.1:{DEFAULT_PORT}",
+                        help="host:port, or unix:/path/to/socket")
+    parser.add_argument("--workers", type=int, default=1, help="server processes sharing the socket (0: every core)")
+    parser.add_argument("--games", nargs="*", default=None, help="games sessions may open (default: every bundled game)")
+    parser.add_argument("--trust-clients", action="store_true",
+                        help="let clients pick their bankroll and RNG seed (tests only: seeded spins are predictable)")
+    args = parser.parse_args()
+
+    workers = args.workers or os.cpu_count() or 1
+    print(f"✓ Serving {', '.join(args.games or list_games())} on {args.listen} with {workers} worker(s)")
+    if args.trust_clients:
+        print("⚠ Clients choose their own bankroll and seed (--trust-clients)")
+    run(args.listen, workers, args.games, args.trust_clients)
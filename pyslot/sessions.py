@@ -0,0 +1,251 @@
+"""Vectorized simulation of whole player sessions.
+
+Every session starts from the engine's starting bankroll and plays spins
+under a betting strategy until it busts, reaches an optional win target or
+hits the spin limit. All live sessions advance together: one step draws
+and scores one spin for every session at once, and the bankroll, bet,
+lines, win streak and free spins of each session are NumPy state arrays.
+A step follows SlotEngine exactly: free spins cost nothing and pay
+``free_spin_multiplier`` times, wins are multiplied along the win streak
+ladder and scatters award (and retrigger) free spins.
+
+Strategies, applied before every spin:
+
+    flat      the starting bet on every spin
+    double    bet_double after a losing spin, back to the starting bet after a win
+    half      bet_half after a losing spin, back to the starting bet after a win
+    max       the maximum bet on every spin
+    lines     the starting bet on a random line count every spin, cut to the
+              lines the bankroll covers
+
+A session that cannot cover its bet lowers it to what it can afford, like
+a player pressing bet down; it busts when not even the minimum bet (on
+the fewest lines, for ``lines``) is covered and no free spins are left.
+Sessions are cut into tasks with their own random streams, so a run is
+reproducible from (seed, sessions, task_sessions) however many processes
+take part, as in pyslot.montecarlo.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from pyslot.batch import evaluate_cells, random_cells
+from pyslot.engine import GAME, STARTING_COINS
+from pyslot.model import DEFAULT_GAME, load_game
+from pyslot.montecarlo import streak_ladder
+
+STRATEGIES = ('flat', 'double', 'half', 'max', 'lines')
+DEFAULT_TASK_SESSIONS = 100_000
+DEFAULT_MAX_SPINS = 500
+# Above the minimum bet, so bet_half has room to lower it
+DEFAULT_BET = 2
+
+# End bankroll buckets, in multiples of the starting bankroll
+BANKROLL_BUCKETS = [0.25, 0.5, 0.75, 1, 1.5, 2, 5]
+PERCENTILES = [1, 5, 25, 50, 75, 95, 99]
+
+
+class SessionResults:
+    """Per-session outcomes of one task, or of a merged run"""
+
+    def __init__(self, strategy, coins, bet_per_line, end_coins=None, lengths=None, busted=None,
+                 total_bet=0, total_win=0):
+        self.strategy = strategy
+        self.coins = coins
+        self.bet_per_line = bet_per_line
+        self.end_coins = end_coins if end_coins is not None else np.zeros(0, dtype=np.int64)
+        self.lengths = lengths if lengths is not None else np.zeros(0, dtype=np.int32)
+        self.busted = busted if busted is not None else np.zeros(0, dtype=bool)
+        self.total_bet = total_bet
+        self.total_win = total_win
+
+    def merge(self, other):
+        """Append another task's sessions"""
+        self.end_coins = np.concatenate([self.end_coins, other.end_coins])
+        self.lengths = np.concatenate([self.lengths, other.lengths])
+        self.busted = np.concatenate([self.busted, other.busted])
+        self.total_bet += other.total_bet
+        self.total_win += other.total_win
+        return self
+
+    def __len__(self):
+        return len(self.end_coins)
+
+    def report(self):
+        """Plain dict summary, safe to dump as JSON"""
+        sessions = len(self)
+        edges = np.array(BANKROLL_BUCKETS) * self.coins
+        labels = ["0"] + [f"<{BANKROLL_BUCKETS[0]}x"]
+        labels += [f"{lo}-{hi}x" for lo, hi in zip(BANKROLL_BUCKETS, BANKROLL_BUCKETS[1:])]
+        labels += [f"{BANKROLL_BUCKETS[-1]}x+"]
+        buckets = np.where(self.end_coins > 0, np.searchsorted(edges, self.end_coins, side='right') + 1, 0)
+        histogram = np.bincount(buckets, minlength=len(labels))
+        busted_lengths = self.lengths[self.busted]
+        return {
+            'strategy': self.strategy,
+            'sessions': sessions,
+            'starting_coins': self.coins,
+            'bet_per_line': self.bet_per_line,
+            'bust_rate': float(self.busted.mean()) if sessions else 0.0,
+            'rtp': self.total_win / self.total_bet if self.total_bet else 0.0,
+            'spins': int(self.lengths.sum()),
+            'mean_length': float(self.lengths.mean()) if sessions else 0.0,
+            'length_percentiles': _percentiles(self.lengths),
+            'mean_bust_length': float(busted_lengths.mean()) if len(busted_lengths) else None,
+            'mean_end_coins': float(self.end_coins.mean()) if sessions else 0.0,
+            'end_coins_percentiles': _percentiles(self.end_coins),
+            'end_coins_histogram': dict(zip(labels, histogram.tolist())),
+            'ahead_rate': float((self.end_coins > self.coins).mean()) if sessions else 0.0,
+        }
+
+
+def _percentiles(values):
+    if not len(values):
+        return {}
+    return dict(zip((f"p{p}" for p in PERCENTILES), np.percentile(values, PERCENTILES).tolist()))
+
+
+def run_task(seed, sessions, strategy="flat", bet_per_line=1, lines=None, coins=STARTING_COINS,
+             max_spins=DEFAULT_MAX_SPINS, target=None, game=GAME):
+    """Play ``sessions`` sessions from ``seed`` (a SeedSequence) side by side; returns SessionResults"""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"strategy must be one of {', '.join(STRATEGIES)}")
+    rng = np.random.Generator(np.random.PCG64(seed))
+    ladder, streak_cap = streak_ladder(game)
+    base_bet = game.max_bet if strategy == "max" else max(game.min_bet, min(game.max_bet, bet_per_line))
+    base_lines = game.bet_lines(lines)
+
+    # Final results by session index
+    end_coins = np.zeros(sessions, dtype=np.int64)
+    lengths = np.zeros(sessions, dtype=np.int32)
+    busted = np.zeros(sessions, dtype=bool)
+    total_bet = total_win = 0
+
+    # State of the live sessions; ids maps them back to session indices
+    ids = np.arange(sessions)
+    bank = np.full(sessions, coins, dtype=np.int64)
+    bet = np.full(sessions, base_bet, dtype=np.int64)
+    line_count = np.full(sessions, base_lines, dtype=np.int64)
+    streak = np.zeros(sessions, dtype=np.int64)
+    free = np.zeros(sessions, dtype=np.int64)
+
+    for spin in range(max_spins + 1):
+        free_spin = free > 0
+        if strategy == "lines":
+            # A random line count, cut to what the bankroll covers at the minimum bet
+            line_count = rng.integers(game.min_lines, game.max_lines + 1, size=len(ids))
+            line_count = np.where(free_spin, line_count,
+                                  np.maximum(np.minimum(line_count, bank // game.min_bet), game.min_lines))
+        # Lower the bet to what the bankroll covers; bust when even the minimum is out of reach
+        bet = np.where(free_spin, bet, np.minimum(bet, bank // line_count))
+        broke = ~free_spin & (bet < game.min_bet)
+        done = broke.copy()
+        if target is not None:
+            done |= bank >= target
+        if spin == max_spins:
+            done[:] = True
+        if done.any():
+            end_coins[ids[done]] = bank[done]
+            lengths[ids[done]] = spin
+            busted[ids[done]] = broke[done]
+            keep = ~done
+            ids, bank, bet, line_count, streak, free, free_spin = (
+                ids[keep], bank[keep], bet[keep], line_count[keep], streak[keep], free[keep], free_spin[keep])
+        if not len(ids):
+            break
+
+        stake = np.where(free_spin, 0, bet * line_count)
+        bank -= stake
+        free -= free_spin
+
+        result = evaluate_cells(random_cells(len(ids), rng, game=game), None, 1, game)
+        if game.ways:
+            line_win = result.line_wins.sum(axis=1)
+        else:
+            # Wins of the first k lines for every session's own line count
+            line_win = np.cumsum(result.line_wins, axis=1)[np.arange(len(ids)), line_count - 1]
+        win = (line_win + result.scatter_win) * bet
+        won = win > 0
+        free += result.bonus_spins
+
+        streak = np.where(won, streak + 1, 0)
+        win *= ladder[np.minimum(streak, streak_cap)] * np.where(free_spin, game.free_spin_multiplier, 1)
+        bank += win
+        total_bet += int(stake.sum())
+        total_win += int(win.sum())
+
+        if strategy == "double":
+            bet = np.where(won, base_bet, np.minimum(bet * 2, game.max_bet))
+        elif strategy == "half":
+            bet = np.where(won, base_bet, np.maximum(bet // 2, game.min_bet))
+        else:
+            bet = np.full(len(ids), base_bet, dtype=np.int64)
+
+    return SessionResults(strategy, coins, base_bet, end_coins, lengths, busted, total_bet, total_win)
+
+
+def run(sessions, strategy="flat", bet_per_line=1, lines=None, coins=STARTING_COINS, max_spins=DEFAULT_MAX_SPINS,
+        target=None, seed=0, workers=None, task_sessions=DEFAULT_TASK_SESSIONS, game=GAME):
+    """Spread ``sessions`` sessions over a process pool and merge the results in task order"""
+    tasks = [task_sessions] * (sessions // task_sessions)
+    if sessions % task_sessions:
+        tasks.append(sessions % task_sessions)
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    args = (strategy, bet_per_line, lines, coins, max_spins, target, game)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        parts = [run_task(task_seed, task, *args) for task_seed, task in zip(seeds, tasks)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_task, task_seed, task, *args) for task_seed, task in zip(seeds, tasks)]
+            parts = [future.result() for future in futures]
+
+    results = SessionResults(strategy, coins, parts[0].bet_per_line if parts else bet_per_line)
+    for part in parts:
+        results.merge(part)
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Simulate PySlot player sessions under betting strategies")
+    parser.add_argument("--sessions", type=float, default=1e6)
+    parser.add_argument("--strategy", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--game", default=DEFAULT_GAME, help="game definition file or bundled game name")
+    parser.add_argument("--bet", type=int, default=DEFAULT_BET, help="starting bet per line")
+    parser.add_argument("--lines", type=int, default=None, help="active lines (default: all)")
+    parser.add_argument("--coins", type=int, default=STARTING_COINS, help="starting bankroll")
+    parser.add_argument("--max-spins", type=int, default=DEFAULT_MAX_SPINS, help="spins before a session stops")
+    parser.add_argument("--target", type=int, default=None, help="stop a session once its bankroll reaches this")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--task-sessions", type=float, default=DEFAULT_TASK_SESSIONS)
+    parser.add_argument("--json", action="store_true", help="print the full reports as JSON")
+    args = parser.parse_args()
+
+    game = load_game(args.game)
+    reports = []
+    for strategy in args.strategy:
+        start = time.perf_counter()
+        results = run(int(args.sessions), strategy, args.bet, args.lines, args.coins, args.max_spins, args.target,
+                      args.seed, args.workers, int(args.task_sessions), game)
+        elapsed = time.perf_counter() - start
+        report = results.report()
+        reports.append(report)
+        if args.json:
+            continue
+        lengths, ends = report['length_percentiles'], report['end_coins_percentiles']
+        print(f"{strategy}: {report['sessions']:,} sessions, {report['spins']:,} spins in {elapsed:.1f}s "
+              f"({report['spins'] / elapsed:,.0f} spins/sec)")
+        print(f"  Bust rate:     {report['bust_rate']:.3%}  (ahead {report['ahead_rate']:.3%}, RTP {report['rtp']:.3%})")
+        print(f"  Length:        mean {report['mean_length']:.1f}  median {lengths['p50']:.0f}  "
+              f"p5 {lengths['p5']:.0f}  p95 {lengths['p95']:.0f}")
+        print(f"  End bankroll:  mean {report['mean_end_coins']:,.0f}  median {ends['p50']:,.0f}  "
+              f"p5 {ends['p5']:,.0f}  p95 {ends['p95']:,.0f}  p99 {ends['p99']:,.0f}")
+    if args.json:
+        print(json.dumps(reports, ensure_ascii=False, indent=2))
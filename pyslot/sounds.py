@@ -0,0 +1,64 @@
+"""Sound effect synthesis.
+
+Every effect is described by plain data (a recipe) and rendered with NumPy
+into 16-bit mono PCM. Recipes are JSON-friendly so the rendered buffers can
+be cached on disk keyed by the recipe itself (see pyslot.cache).
+
+A recipe has a ``duration`` in seconds, an optional overall ``decay``
+(exp(-t * decay) envelope) and a list of ``partials``. Each partial is a
+sine with ``freq`` (Hz, or [start, end] for a sweep) and ``amp``, plus
+optional ``decay`` (its own envelope), ``window`` ([start, end] seconds it
+sounds for) and ``tremolo`` (multiplied by sin(t * tremolo)).
+"""
+import numpy as np
+
+# Major-chord notes used by the win effects
+C5, E5, G5, C6, E6 = 523, 659, 784, 1047, 1319
+
+SOUND_RECIPES = {
+    # Spin sound - rising tone
+    'spin': {'duration': 0.1, 'partials': [{'freq': [200, 400], 'amp': 0.3}]},
+    # Reel stop sound - quick beep
+    'stop': {'duration': 0.08, 'partials': [{'freq': 600, 'amp': 0.2, 'decay': 20}]},
+    # Win sound - happy ascending tones (C, E, G, C)
+    'win': {'duration': 0.5, 'decay': 3,
+            'partials': [{'freq': freq, 'amp': 0.15} for freq in [C5, E5, G5, C6]]},
+    # Big win sound - extended chord with some sparkle
+    'bigwin': {'duration': 0.8, 'decay': 2,
+               'partials': [{'freq': freq, 'amp': 0.12} for freq in [C5, E5, G5, C6, E6]]
+               + [{'freq': 2093, 'amp': 0.1, 'tremolo': 20}]},
+    # Button click sound
+    'click': {'duration': 0.05, 'partials': [{'freq': 800, 'amp': 0.2, 'decay': 50}]},
+    # Coin sound - metallic ping
+    'coin': {'duration': 0.15, 'partials': [{'freq': 1200, 'amp': 0.2, 'decay': 15},
+                                            {'freq': 1800, 'amp': 0.1, 'decay': 20}]},
+    # Multiplier sound - power up (A, C#, E)
+    'multiplier': {'duration': 0.3, 'decay': 5,
+                   'partials': [{'freq': freq, 'amp': 0.12} for freq in [440, 554, 659]]},
+    # Bonus trigger sound - triumphant fanfare, one note after another
+    'bonus': {'duration': 1.0, 'decay': 2,
+              'partials': [{'freq': freq, 'amp': 0.15, 'window': [i * 0.15, (i + 1) * 0.15]}
+                           for i, freq in enumerate([C5, E5, G5, C6, E6])]},
+}
+
+
+def synthesize(recipe, sample_rate):
+    """Render a recipe to 16-bit mono PCM"""
+    t = np.linspace(0, recipe['duration'], int(sample_rate * recipe['duration']))
+    wave = np.zeros_like(t)
+    for partial in recipe['partials']:
+        freq = partial['freq']
+        if isinstance(freq, (list, tuple)):
+            freq = np.linspace(freq[0], freq[1], len(t))
+        tone = np.sin(2 * np.pi * freq * t) * partial['amp']
+        if 'decay' in partial:
+            tone *= np.exp(-t * partial['decay'])
+        if 'tremolo' in partial:
+            tone *= np.sin(t * partial['tremolo'])
+        if 'window' in partial:
+            start, end = partial['window']
+            tone *= (t >= start) & (t < end)
+        wave += tone
+    if 'decay' in recipe:
+        wave *= np.exp(-t * recipe['decay'])
+    return (wave * 32767).astype(np.int16)
@@ -0,0 +1,285 @@
+"""Constant-memory, mergeable statistics over a stream of spins.
+
+StreamingStats takes spins one at a time (live play) or as NumPy arrays
+(simulation) and never keeps them. It tracks:
+
+- exact coin totals for RTP and hit rate (Python ints),
+- mean and variance of the win multiple (win / total bet), merged with
+  Chan's parallel update so partial results combine without loss,
+- a quantile sketch of win multiples, which doubles as the log-bucketed
+  win histogram,
+- a quantile sketch of the maximum drawdown of every session of
+  ``session_spins`` consecutive spins.
+
+QuantileSketch is a DDSketch-style log histogram: a value lands in bucket
+``ceil(log(x) / log(gamma))`` with ``gamma = (1 + a) / (1 - a)``, so every
+quantile is returned within relative accuracy ``a`` of the true value.
+The buckets cover a fixed range (values outside are clamped into the end
+buckets), which keeps memory constant, and two sketches with the same
+parameters merge by adding counts. Both classes convert to and from plain
+dicts, so workers or cabinets can ship partial results as JSON.
+
+A session still open when two StreamingStats merge is dropped from the
+drawdown sketch; everything else merges exactly.
+"""
+import math
+
+import numpy as np
+
+DEFAULT_ACCURACY = 0.01
+DEFAULT_SESSION_SPINS = 1000
+# z for the 90% volatility index: VI = z * standard deviation of the win multiple
+VOLATILITY_Z = 1.645
+QUANTILES = [0.5, 0.9, 0.99, 0.999, 0.9999]
+
+
+class QuantileSketch:
+    """Mergeable log-bucketed sketch of non-negative values with relative accuracy ``accuracy``"""
+
+    def __init__(self, accuracy=DEFAULT_ACCURACY, min_value=1e-3, max_value=1e7):
+        self.accuracy = accuracy
+        self.min_value = min_value
+        self.max_value = max_value
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.offset = math.ceil(math.log(min_value) / self.log_gamma)
+        self.counts = np.zeros(math.ceil(math.log(max_value) / self.log_gamma) - self.offset + 1, dtype=np.int64)
+        self.zeros = 0
+
+    @property
+    def count(self):
+        return self.zeros + int(self.counts.sum())
+
+    def _index(self, value):
+        return min(max(math.ceil(math.log(value) / self.log_gamma) - self.offset, 0), len(self.counts) - 1)
+
+    def add(self, value):
+        """Add one value"""
+        if value <= 0:
+            self.zeros += 1
+        else:
+            self.counts[self._index(value)] += 1
+
+    def update(self, values):
+        """Add an array of values"""
+        values = np.asarray(values, dtype=np.float64)
+        positive = values[values > 0]
+        self.zeros += len(values) - len(positive)
+        if len(positive):
+            idx = np.ceil(np.log(positive) / self.log_gamma).astype(np.int64) - self.offset
+            self.counts += np.bincount(np.clip(idx, 0, len(self.counts) - 1), minlength=len(self.counts))
+
+    def merge(self, other):
+        """Fold in a sketch built with the same parameters"""
+        if (other.accuracy, other.min_value, other.max_value) != (self.accuracy, self.min_value, self.max_value):
+            raise ValueError("can only merge sketches with the same accuracy and range")
+        self.counts += other.counts
+        self.zeros += other.zeros
+        return self
+
+    def value(self, index):
+        """Representative value of a bucket: within ``accuracy`` of everything in it"""
+        return 2 * self.gamma ** (index + self.offset) / (self.gamma + 1)
+
+    def quantile(self, q):
+        """Value at quantile ``q`` (0-1), or None when the sketch is empty"""
+        count = self.count
+        if not count:
+            return None
+        rank = q * (count - 1)
+        if rank < self.zeros:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self.counts), rank - self.zeros, side='right'))
+        return self.value(min(index, len(self.counts) - 1))
+
+    def histogram(self):
+        """Counts per power of two: {"0": zeros, "[lo, hi)": count, ...} for the non-empty octaves"""
+        octaves = {}
+        for index in np.flatnonzero(self.counts):
+            low = 2.0 ** math.floor(math.log2(self.value(index)))
+            octaves[low] = octaves.get(low, 0) + int(self.counts[index])
+        histogram = {"0": self.zeros}
+        histogram.update((f"[{low:g}, {low * 2:g})", octaves[low]) for low in sorted(octaves))
+        return histogram
+
+    def to_dict(self):
+        nonzero = np.flatnonzero(self.counts)
+        return {'accuracy': self.accuracy, 'min_value': self.min_value, 'max_value': self.max_value,
+                'zeros': self.zeros, 'buckets': dict(zip(nonzero.tolist(), self.counts[nonzero].tolist()))}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['accuracy'], data['min_value'], data['max_value'])
+        sketch.zeros = data['zeros']
+        for index, count in data['buckets'].items():
+            sketch.counts[int(index)] = count
+        return sketch
+
+
+class StreamingStats:
+    """Running RTP, hit rate, win multiple variance and quantile sketches of a spin stream"""
+
+    def __init__(self, session_spins=DEFAULT_SESSION_SPINS, accuracy=DEFAULT_ACCURACY):
+        self.session_spins = session_spins
+        self.spins = 0
+        self.paid_spins = 0
+        self.hits = 0
+        self.total_bet = 0
+        self.total_win = 0
+        # Win multiple moments (Chan et al.)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.wins = QuantileSketch(accuracy)
+        self.drawdowns = QuantileSketch(accuracy)
+        # Open session: spins, balance and peak in bets since it started, and its deepest drawdown
+        self._session_len = 0
+        self._balance = 0.0
+        self._peak = 0.0
+        self._drawdown = 0.0
+
+    def _moments(self, n, mean, m2):
+        total = self.spins + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.spins * n / total
+
+    def add(self, win, bet, free_spin=False):
+        """Record one spin: coins won, total bet, and whether it was a free spin (nothing staked)"""
+        multiple = win / bet
+        self._moments(1, multiple, 0.0)
+        self.spins += 1
+        self.hits += win > 0
+        self.total_win += int(win)
+        if not free_spin:
+            self.paid_spins += 1
+            self.total_bet += int(bet)
+        self.wins.add(multiple)
+        self._session_step(multiple - (0 if free_spin else 1))
+
+    def _session_step(self, net):
+        self._balance += net
+        self._peak = max(self._peak, self._balance)
+        self._drawdown = max(self._drawdown, self._peak - self._balance)
+        self._session_len += 1
+        if self._session_len == self.session_spins:
+            self._close_session()
+
+    def _close_session(self):
+        self.drawdowns.add(self._drawdown)
+        self._session_len = 0
+        self._balance = self._peak = self._drawdown = 0.0
+
+    def update(self, wins, bet, free=None):
+        """Record an array of spins; ``bet`` is the total bet (scalar or array), ``free`` marks free spins"""
+        wins = np.asarray(wins)
+        n = len(wins)
+        if not n:
+            return
+        bets = np.broadcast_to(np.asarray(bet, dtype=np.float64), wins.shape)
+        paid = np.ones(n, dtype=bool) if free is None else ~np.asarray(free, dtype=bool)
+        multiples = wins / bets
+        mean = float(multiples.mean())
+        self._moments(n, mean, float(((multiples - mean) ** 2).sum()))
+        self.hits += int(np.count_nonzero(wins))
+        self.total_win += int(wins.sum())
+        self.paid_spins += int(np.count_nonzero(paid))
+        self.total_bet += int(np.rint(bets[paid].sum()))
+        self.wins.update(multiples)
+
+        # Drawdowns per session: cut the chunk where sessions end
+        net = multiples - paid
+        done = 0
+        while done < n:
+            room = self.session_spins - self._session_len
+            part = net[done:done + room]
+            balance = self._balance + np.cumsum(part)
+            peak = np.maximum(np.maximum.accumulate(balance), self._peak)
+            self._drawdown = max(self._drawdown, float((peak - balance).max()))
+            self._balance, self._peak = float(balance[-1]), float(peak[-1])
+            self.spins += len(part)
+            self._session_len += len(part)
+            done += len(part)
+            if len(part) == room:
+                self._close_session()
+
+    def merge(self, other):
+        """Fold in another StreamingStats; its open session is dropped and this one's carries on"""
+        if not other.spins:
+            return self
+        self._moments(other.spins, other.mean, other.m2)
+        self.spins += other.spins
+        self.paid_spins += other.paid_spins
+        self.hits += other.hits
+        self.total_bet += other.total_bet
+        self.total_win += other.total_win
+        self.wins.merge(other.wins)
+        self.drawdowns.merge(other.drawdowns)
+        return self
+
+    @property
+    def rtp(self):
+        return self.total_win / self.total_bet if self.total_bet else 0.0
+
+    @property
+    def variance(self):
+        """Sample variance of the win multiple per spin"""
+        return self.m2 / (self.spins - 1) if self.spins > 1 else 0.0
+
+    def report(self):
+        """Plain dict summary, safe to dump as JSON"""
+        std = math.sqrt(self.variance)
+        return {
+            'spins': self.spins,
+            'rtp': self.rtp,
+            'hit_rate': self.hits / self.spins if self.spins else 0.0,
+            'mean_multiple': self.mean,
+            'variance': self.variance,
+            'std': std,
+            'volatility_index': VOLATILITY_Z * std,
+            'win_quantiles': {f"p{q * 100:g}": self.wins.quantile(q) for q in QUANTILES},
+            'win_histogram': self.wins.histogram(),
+            'sessions': self.drawdowns.count,
+            'session_spins': self.session_spins,
+            'drawdown_quantiles': {f"p{q * 100:g}": self.drawdowns.quantile(q) for q in QUANTILES},
+        }
+
+    def to_dict(self):
+        return {'session_spins': self.session_spins, 'spins': self.spins, 'paid_spins': self.paid_spins,
+                'hits': self.hits, 'total_bet': self.total_bet, 'total_win': self.total_win,
+                'mean': self.mean, 'm2': self.m2, 'wins': self.wins.to_dict(), 'drawdowns': self.drawdowns.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data['session_spins'], data['wins']['accuracy'])
+        for key in ('spins', 'paid_spins', 'hits', 'total_bet', 'total_win', 'mean', 'm2'):
+            setattr(stats, key, data[key])
+        stats.wins = QuantileSketch.from_dict(data['wins'])
+        stats.drawdowns = QuantileSketch.from_dict(data['drawdowns'])
+        return stats
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    from pyslot.journal import JournalError, open_journal
+
+    parser = argparse.ArgumentParser(description="Streaming statistics of PySlot spin journals")
+    parser.add_argument("paths", nargs="+", help="spin journal files, merged into one report")
+    parser.add_argument("--session-spins", type=int, default=DEFAULT_SESSION_SPINS)
+    parser.add_argument("--chunk", type=int, default=1 << 20, help="records read per step")
+    args = parser.parse_args()
+
+    total = StreamingStats(args.session_spins)
+    for path in args.paths:
+        try:
+            _, records = open_journal(path)
+        except (OSError, JournalError) as e:
+            print(f"⚠ {path}: {e}")
+            continue
+        stats = StreamingStats(args.session_spins)
+        for start in range(0, len(records), args.chunk):
+            chunk = records[start:start + args.chunk]
+            stats.update(chunk['win'], chunk['bet_per_line'].astype(np.int64) * chunk['lines'], chunk['free_spin'])
+        total.merge(stats)
+    print(json.dumps(total.report(), indent=2))
@@ -5,67 +5,61 @@ import sys
 import os
 import platform
 import subprocess
+import math
+import time
+import cProfile
+import pstats
 import numpy as np
 
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+from pyslot.cache import AssetCache, cache_key, file_signature
+from pyslot.client import RemoteEngine
+from pyslot.engine import STARTING_COINS, SlotEngine
+from pyslot.journal import FSYNC_POLICIES, JournalWriter
+from pyslot.model import DEFAULT_GAME, load_game
+from pyslot.replay import record_session
+from pyslot.sounds import SOUND_RECIPES, synthesize
+from pyslot.streaming import StreamingStats
 
-# Get display info for fullscreen
-display_info = pygame.display.Info()
-SCREEN_WIDTH = display_info.current_w
-SCREEN_HEIGHT = display_info.current_h
-FPS = 60
+# Screen size and display mode flags, filled in by init_display()
+SCREEN_WIDTH = 0
+SCREEN_HEIGHT = 0
+SCREEN_FLAGS = pygame.FULLSCREEN
+FPS = 60  # Default render frame cap
+SAMPLE_RATE = 22050  # Mixer rate the sound effects are synthesized for
+TICK_RATE = 60  # Simulation ticks per second; animation timers and speeds count ticks
+MAX_TICKS_PER_FRAME = 8  # Beyond this the simulation slows down instead of spiralling
+TRANSITION_SPEED = 0.08  # Screen transition progress per tick
+REEL_SPEED = 30  # Full reel scroll speed, pixels per tick
+REEL_DECELERATION = 3  # Pixels per tick lost every tick while a reel slows onto its stop
+EMOJI_BITMAP_SIZE = 109  # Only bitmap strike in Noto Color Emoji
+MAX_PARTICLES = 400
+MAX_WIN_PARTICLES = 300
 
-# Game constants
-REELS = 5
-ROWS = 4
-coins = 1000
-spin_cost = 20
+coins = STARTING_COINS
 
-# Slot symbols with weights (more = appears more often)
-symbols = [
-    "🍒",  # Cherry - classic slot symbol
-    "🍋",  # Lemon - classic fruit
-    "🍊",  # Orange - classic fruit
-    "🍇",  # Grapes - classic fruit
-    "🍉",  # Watermelon - high value fruit
-    "🔔",  # Bell - traditional slot symbol
-    "⭐",  # Star - medium value
-    "💰",  # Money bag - high value
-    "💎",  # Diamond - very high value
-    "7️⃣",   # Lucky 7 - jackpot symbol
-    "�",  # Slot machine - special symbol
-    "🎁"   # Gift/Scatter - triggers bonus
-]
-symbol_weights = [35, 30, 28, 25, 22, 18, 15, 12, 8, 3, 6, 5]
-symbol_rewards = {
-    "🍒": 5,      # Cherry - lowest
-    "🍋": 8,      # Lemon
-    "🍊": 10,     # Orange
-    "🍇": 12,     # Grapes
-    "🍉": 15,     # Watermelon
-    "🔔": 20,     # Bell
-    "⭐": 30,     # Star
-    "💰": 40,     # Money bag
-    "💎": 60,     # Diamond
-    "7️⃣": 150,    # Lucky 7 - jackpot!
-    "🎰": 25,     # Slot machine
-    "🎁": 20      # Scatter pays + triggers bonus
-}
 
-# Win lines
-WIN_LINES = [
-    [1, 1, 1, 1, 1],  # Middle line
-    [0, 0, 0, 0, 0],  # Top line
-    [2, 2, 2, 2, 2],  # Bottom line
-    [0, 1, 2, 1, 0],  # V shape
-    [2, 1, 0, 1, 2],  # Inverse V
-    [0, 0, 1, 2, 2],  # Down stairs
-    [2, 2, 1, 0, 0],  # Up stairs
-    [1, 0, 1, 2, 1],  # Zig-zag
-    [1, 2, 1, 0, 1],  # Zag-zig
-]
+def init_display(size=None):
+    """Initialize pygame and size the game to the current display, or to a fixed (width, height) window"""
+    global SCREEN_WIDTH, SCREEN_HEIGHT, SCREEN_FLAGS
+    pygame.init()
+    pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=2, buffer=512)
+    
+    if size:
+        SCREEN_WIDTH, SCREEN_HEIGHT = size
+        SCREEN_FLAGS = 0
+        return
+    
+    # Get display info for fullscreen
+    SCREEN_FLAGS = pygame.FULLSCREEN
+    display_info = pygame.display.Info()
+    SCREEN_WIDTH = display_info.current_w
+    SCREEN_HEIGHT = display_info.current_h
+
+
+def _engine_attr(name):
+    """Expose a SlotEngine attribute as an attribute of the game"""
+    return property(lambda self: getattr(self.engine, name),
+                    lambda self, value: setattr(self.engine, name, value))
 
 # Colors
 WHITE = (255, 255, 255)
@@ -93,6 +87,24 @@ MAGENTA = (255, 0, 255)
 ELECTRIC_BLUE = (125, 249, 255)
 HOT_PINK = (255, 105, 180)
 
+def merge_rects(rects, bounds):
+    """Clip rects to bounds and union the ones that overlap"""
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        overlapping = rect.collidelistall(merged)
+        while overlapping:
+            for index in reversed(overlapping):
+                rect.union_ip(merged.pop(index))
+            overlapping = rect.collidelistall(merged)
+        merged.append(rect)
+    return merged
+
+# Room around a button's rect for its glowing border
+BUTTON_PAD = 2
+
 class Button:
     def __init__(self, x, y, width, height, text, color, text_color=WHITE, font_size=32):
         self.rect = pygame.Rect(x, y, width, height)
@@ -103,37 +115,55 @@ class Button:
         self.hover = False
         self.font_size = font_size
         
+        # Pre-rendered surface for the current visual state
+        self.cache_key = None
+        self.cache_surface = None
+    
     def draw(self, screen, font):
+        # Only re-render when something visible about the button changed
+        key = (self.enabled, self.hover and self.enabled, self.rect.size, font,
+               self.text, self.color, self.text_color)
+        if key != self.cache_key:
+            self.cache_surface = self.render(font)
+            self.cache_key = key
+        screen.blit(self.cache_surface, (self.rect.x - BUTTON_PAD, self.rect.y - BUTTON_PAD))
+    
+    def render(self, font):
+        """Render the button into its own surface, padded for the glowing border"""
+        surface = pygame.Surface((self.rect.width + 2 * BUTTON_PAD, self.rect.height + 2 * BUTTON_PAD), pygame.SRCALPHA)
+        rect = pygame.Rect(BUTTON_PAD, BUTTON_PAD, self.rect.width, self.rect.height)
+        
         color = self.color if self.enabled else DARK_GRAY
         if self.hover and self.enabled:
             color = tuple(min(c + 50, 255) for c in color)
         
         # Draw gradient background
-        for i in range(int(self.rect.height)):
-            progress = i / self.rect.height
+        for i in range(int(rect.height)):
+            progress = i / rect.height
             r = int(color[0] * (0.7 + 0.3 * progress))
             g = int(color[1] * (0.7 + 0.3 * progress))
             b = int(color[2] * (0.7 + 0.3 * progress))
-            pygame.draw.rect(screen, (r, g, b), 
-                           pygame.Rect(self.rect.x, self.rect.y + i, self.rect.width, 1))
+            pygame.draw.rect(surface, (r, g, b), 
+                           pygame.Rect(rect.x, rect.y + i, rect.width, 1))
         
         # Glowing border
         if self.enabled:
             border_colors = [color, tuple(min(c + 30, 255) for c in color), BLACK]
             for i, bcolor in enumerate(border_colors):
-                pygame.draw.rect(screen, bcolor, self.rect.inflate(i*2, i*2), 2, border_radius=15 + i)
+                pygame.draw.rect(surface, bcolor, rect.inflate(i*2, i*2), 2, border_radius=15 + i)
         else:
-            pygame.draw.rect(screen, BLACK, self.rect, 3, border_radius=15)
+            pygame.draw.rect(surface, BLACK, rect, 3, border_radius=15)
         
         text_surf = font.render(self.text, True, self.text_color if self.enabled else LIGHT_GRAY)
-        text_rect = text_surf.get_rect(center=self.rect.center)
+        text_rect = text_surf.get_rect(center=rect.center)
         
         # Add glow to enabled buttons
         if self.enabled:
             text_glow = font.render(self.text, True, BLACK)
-            screen.blit(text_glow, (text_rect.x + 2, text_rect.y + 2))
+            surface.blit(text_glow, (text_rect.x + 2, text_rect.y + 2))
         
-        screen.blit(text_surf, text_rect)
+        surface.blit(text_surf, text_rect)
+        return surface
     
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
@@ -143,58 +173,623 @@ class Button:
                 return True
         return False
 
+class GlyphAtlas:
+    """Reel symbols rendered once into a single sheet and blitted from there.
+    
+    Glyphs are rendered at the size the font was opened with (color emoji
+    fonts only have one bitmap size) and scaled once to the target height.
+    Symbols missing from the sheet are rendered lazily on first use.
+    """
+    def __init__(self, font, font_size, target_size, symbol_list=(), color=BLACK):
+        self.font = font
+        self.color = color
+        self.scale = target_size / font_size if font_size else 1.0
+        self.sheet = None
+        self.areas = {}
+        self.extra = {}
+        if symbol_list:
+            self.build(symbol_list)
+    
+    def render_glyph(self, symbol):
+        """Render one symbol at native size and scale it to the target size"""
+        surf = self.font.render(symbol, True, self.color)
+        if abs(self.scale - 1.0) > 0.01:
+            size = (max(1, round(surf.get_width() * self.scale)), max(1, round(surf.get_height() * self.scale)))
+            surf = pygame.transform.smoothscale(surf.convert_alpha(), size)
+        return surf
+    
+    def build(self, symbol_list):
+        """Pack the given symbols into one sheet surface"""
+        glyphs = [(symbol, self.render_glyph(symbol)) for symbol in symbol_list]
+        width = sum(surf.get_width() for _, surf in glyphs) + len(glyphs)
+        height = max(surf.get_height() for _, surf in glyphs)
+        self.sheet = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA)
+        self.areas = {}
+        x = 0
+        for symbol, surf in glyphs:
+            self.sheet.blit(surf, (x, 0))
+            self.areas[symbol] = pygame.Rect(x, 0, surf.get_width(), surf.get_height())
+            x += surf.get_width() + 1
+        if pygame.display.get_surface() is not None:
+            self.sheet = self.sheet.convert_alpha()
+    
+    def blit(self, screen, symbol, center):
+        """Draw a symbol centered on the given point"""
+        area = self.areas.get(symbol)
+        if area is not None:
+            screen.blit(self.sheet, area.move(center[0] - area.centerx, center[1] - area.height // 2).topleft, area)
+            return
+        surf = self.extra.get(symbol)
+        if surf is None:
+            surf = self.extra[symbol] = self.render_glyph(symbol)
+        screen.blit(surf, surf.get_rect(center=center))
+
+class GradientBackground:
+    """Animated background gradient baked once into a tall strip.
+    
+    The gradient color of row y at phase p is a function of
+    y / height * pi + p / 360 * 2, so each phase step just slides the
+    gradient by height / (180 * pi) rows. The strip covers every row the
+    screen can show over the 360 phases and a frame is one blit from an
+    offset into it.
+    
+    Memory: width * height * (1 + 2 / pi) * 4 bytes, about 14 MB at 1080p
+    and 54 MB at 4K.
+    """
+    def __init__(self, width, height, phases=360):
+        self.width = width
+        self.height = height
+        self.phases = phases
+        self.rows_per_radian = height / math.pi
+        strip_rows = height + int(math.ceil(2 * self.rows_per_radian)) + 1
+        
+        angle = np.arange(strip_rows) / height * math.pi
+        column = np.empty((1, strip_rows, 3), dtype=np.uint8)
+        column[0, :, 0] = (20 + 40 * np.sin(angle) + 20).astype(np.uint8)
+        column[0, :, 1] = (25 + 35 * np.sin(angle + 2) + 15).astype(np.uint8)
+        column[0, :, 2] = (35 + 45 * np.sin(angle + 4) + 25).astype(np.uint8)
+        
+        strip = pygame.transform.scale(pygame.surfarray.make_surface(column), (width, strip_rows))
+        self.strip = strip.convert() if pygame.display.get_surface() is not None else strip
+    
+    def draw(self, screen, phase):
+        """Draw the gradient at the given phase (0 to phases - 1)"""
+        offset = int(round(phase / self.phases * 2 * self.rows_per_radian))
+        screen.blit(self.strip, (0, 0), pygame.Rect(0, offset, self.width, self.height))
+
+class WinLineSprites:
+    """Pre-rendered pieces of the animated win lines.
+    
+    A win line is a chain of glow segments between reel centers with a glow
+    node on every matched reel. A segment only depends on its row step,
+    pixel rise, color phase and pulse, and a node only on its color phase and
+    pulse, so
+    each piece is baked once into a tight sprite and reused for every line
+    and match count. The pulse is quantized to PULSE_LEVELS steps and baked
+    into the pixels: blending a surface alpha on top of per-pixel alpha is
+    several times slower than a plain per-pixel alpha blit.
+    """
+    COLORS = [NEON_PINK, NEON_ORANGE, NEON_YELLOW, NEON_GREEN, NEON_BLUE, ELECTRIC_BLUE, PURPLE, MAGENTA, HOT_PINK]
+    ALPHA = 220
+    PULSE_LEVELS = 8
+    MAX_SPRITES = 512
+    GLOW = 25  # Outer node glow radius
+    PAD = 13   # Half of the widest glow layer, plus a pixel
+    
+    def __init__(self, reel_pitch):
+        self.reel_pitch = int(round(reel_pitch))
+        self.sprites = {}
+    
+    def new_surface(self, width, height):
+        surf = pygame.Surface((width, height), pygame.SRCALPHA)
+        return surf.convert_alpha() if pygame.display.get_surface() is not None else surf
+    
+    def cached(self, key, render):
+        surf = self.sprites.get(key)
+        if surf is None:
+            if len(self.sprites) >= self.MAX_SPRITES:
+                self.sprites.clear()
+            surf = self.sprites[key] = render(*key[1:])
+        return surf
+    
+    def render_segment(self, step, color_idx, alpha):
+        """Glow segment from one reel center to the next, ``step`` pixels down"""
+        pad = self.PAD
+        rise = abs(step)
+        surf = self.new_surface(self.reel_pitch + pad * 2, rise + pad * 2)
+        start = (pad, pad + (rise if step < 0 else 0))
+        end = (pad + self.reel_pitch, pad + (0 if step < 0 else rise))
+        # Multiple gradient layers for glow effect, alternating rainbow colors
+        for layer in range(5, 0, -1):
+            layer_color = self.COLORS[(color_idx + layer) % len(self.COLORS)]
+            pygame.draw.line(surf, (*layer_color, alpha // (6 - layer)), start, end, 4 + layer * 4)
+        return surf
+    
+    def render_node(self, color_idx, alpha):
+        """Glowing circle drawn at a connection point"""
+        center = (self.GLOW, self.GLOW)
+        surf = self.new_surface(self.GLOW * 2 + 1, self.GLOW * 2 + 1)
+        # Outer glow
+        for radius in range(self.GLOW, 5, -4):
+            glow_color = self.COLORS[(color_idx + radius // 5) % len(self.COLORS)]
+            pygame.draw.circle(surf, (*glow_color, min(255, alpha // (26 - radius) * 2)), center, radius)
+        # Bright center
+        pygame.draw.circle(surf, (255, 255, 255, alpha), center, 6)
+        return surf
+    
+    def render_sparkle(self, size, alpha):
+        """Sparkle ring around a connection point"""
+        surf = self.new_surface(size * 2 + 1, size * 2 + 1)
+        pygame.draw.circle(surf, (*NEON_YELLOW, alpha), (size, size), size, 2)
+        return surf
+    
+    def draw(self, screen, points, color_idx, pulse, sparkle_size=0):
+        """Draw one win line through ``points`` (reel center x, cell center y, y) at the given pulse (0-1)"""
+        alpha = self.ALPHA * round(pulse * self.PULSE_LEVELS) // self.PULSE_LEVELS
+        pieces = []
+        for (x0, center0, y0), (x1, center1, y1) in zip(points, points[1:]):
+            step = int(round(center1 - center0))
+            surf = self.cached(('segment', step, color_idx, alpha), self.render_segment)
+            # Both ends share the average wave offset of the pair
+            top = (y0 + y1) / 2 - abs(step) / 2
+            pieces.append((surf, (int(x0) - self.PAD, int(top) - self.PAD)))
+        
+        node = self.cached(('node', color_idx, alpha), self.render_node)
+        sparkle = self.cached(('sparkle', sparkle_size, alpha), self.render_sparkle) if sparkle_size else None
+        for x, _, y in points:
+            pieces.append((node, (int(x) - self.GLOW, int(y) - self.GLOW)))
+            if sparkle:
+                pieces.append((sparkle, (int(x) - sparkle_size, int(y) - sparkle_size)))
+        screen.blits(pieces, doreturn=False)
+
+class BonusAnimation:
+    """Bonus trigger celebration baked into cached sprites.
+    
+    Every frame of the animation is a function of its frame index: the
+    dimming pulse, the zoom/bounce scale of the "BONUS!" title and its
+    rainbow color. The title with its glow is rendered once per (font size,
+    color) and the free spin texts once per scatter count, so playback is a
+    dim blit plus three sprite blits. Fonts are cached by size.
+    
+    bake() renders all title frames up front (98 sprites, about 9 MB and
+    0.1 s at 1024x768) so a trigger never waits on font rendering.
+    """
+    FRAMES = 120
+    TITLE = "🎁 BONUS! 🎁"
+    TITLE_COLORS = [NEON_PINK, NEON_ORANGE, NEON_YELLOW, NEON_GREEN, NEON_BLUE, MAGENTA]
+    
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.fonts = {}
+        self.titles = {}
+        self.texts = {}
+        self.dim = pygame.Surface((width, height))
+        self.dim.fill(BLACK)
+        if pygame.display.get_surface() is not None:
+            self.dim = self.dim.convert()
+    
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+    
+    def frame(self, timer):
+        """Dim alpha, title font size and title color for a frame"""
+        # Pulsing background
+        alpha = int(100 + 50 * math.sin(timer / 5))
+        
+        progress = (self.FRAMES - timer) / self.FRAMES
+        if progress < 0.5:
+            # Zoom in
+            scale = progress * 2
+        else:
+            # Slight bounce
+            scale = 1.0 + 0.1 * math.sin((progress - 0.5) * 10)
+        
+        # Rainbow color cycling
+        color = self.TITLE_COLORS[(timer * 10) % 360 // 60]
+        return alpha, int(self.height * 0.15 * scale), color
+    
+    def title(self, size, color):
+        """The "BONUS!" title with its glow trail"""
+        key = (size, color)
+        surf = self.titles.get(key)
+        if surf is None:
+            font = self.font(size)
+            main_text = font.render(self.TITLE, True, WHITE)
+            surf = pygame.Surface((main_text.get_width() + 10, main_text.get_height() + 10), pygame.SRCALPHA)
+            glow_text = font.render(self.TITLE, True, color)
+            for offset in range(10, 0, -2):
+                glow_text.set_alpha(int(150 * (offset / 10)))
+                surf.blit(glow_text, (offset, offset))
+            surf.blit(main_text, (0, 0))
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert_alpha()
+            self.titles[key] = surf
+        return surf
+    
+    def text(self, text, size, color):
+        key = (text, size, color)
+        surf = self.texts.get(key)
+        if surf is None:
+            surf = self.texts[key] = self.font(size).render(text, True, color)
+        return surf
+    
+    def bake(self):
+        """Render every title frame ahead of playback"""
+        for timer in range(self.FRAMES, 0, -1):
+            _, size, color = self.frame(timer)
+            self.title(size, color)
+    
+    def draw(self, screen, timer, scatter_count, free_spins):
+        """Draw the animation frame for the given countdown timer"""
+        alpha, size, color = self.frame(timer)
+        self.dim.set_alpha(alpha)
+        screen.blit(self.dim, (0, 0))
+        
+        # Big "BONUS!" text, placed by its main (unshifted) text rect
+        title = self.title(size, color)
+        screen.blit(title, (self.width // 2 - (title.get_width() - 10) // 2,
+                            self.height // 2 - 100 - (title.get_height() - 10) // 2))
+        
+        # Free spins count
+        fs_text = self.text(f"{free_spins} FREE SPINS!", int(self.height * 0.08), NEON_YELLOW)
+        screen.blit(fs_text, fs_text.get_rect(center=(self.width // 2, self.height // 2)))
+        
+        # Scatter count
+        scatter_text = self.text(f"({scatter_count} Scatters!)", int(self.height * 0.05), NEON_GREEN)
+        screen.blit(scatter_text, scatter_text.get_rect(center=(self.width // 2, self.height // 2 + 80)))
+
+# Frame phases timed by FrameProfiler, in frame order ("wait" is the sleep in clock.tick)
+FRAME_PHASES = ['events', 'update', 'transition', 'layout', 'background', 'static', 'reels', 'particles',
+                'win_lines', 'bonus', 'text', 'buttons', 'overlay', 'hud', 'flip', 'wait']
+# Phase charged for drawing each screen layer (anything else counts as text)
+LAYER_PHASES = {'particles': 'particles', 'win_lines': 'win_lines', 'bonus': 'bonus', 'hud': 'hud'}
+LAYER_PHASES.update((name, 'buttons') for name in [
+    'spin', 'lines_down', 'lines_up', 'bet_config', 'exit', 'back', 'bet_down', 'bet_up', 'bet_min', 'bet_half',
+    'bet_double', 'bet_max', 'preset_bet_1', 'preset_bet_5', 'preset_bet_10', 'preset_bet_25', 'preset_bet_50',
+    'preset_bet_100'
+])
+
+class FrameProfiler:
+    """Per-phase frame timings with a rolling percentile HUD.
+    
+    The game loop calls lap(phase) after each piece of work, which charges
+    the time since the previous lap to that phase, and end_frame() once per
+    frame. The last `history` frames are kept in a NumPy ring buffer;
+    capture() additionally runs cProfile over the next `frames` frames and
+    then writes a pstats file, a text summary and a CSV of the buffered
+    per-frame timings.
+    """
+    WINDOW = 600  # Frames in the rolling HUD percentiles
+    HUD_REFRESH = 15
+    
+    def __init__(self, history=36000, output_dir="profiles"):
+        self.index = {phase: i for i, phase in enumerate(FRAME_PHASES)}
+        self.times = np.zeros((history, len(FRAME_PHASES)))
+        self.row = [0.0] * len(FRAME_PHASES)
+        self.frames = 0
+        self.mark = time.perf_counter()
+        self.output_dir = output_dir
+        self.hud = False
+        self.hud_surface = None
+        self.profile = None
+        self.capture_left = 0
+    
+    def start(self):
+        """Start timing from now (skips whatever ran before the loop)"""
+        self.mark = time.perf_counter()
+    
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.row[self.index[phase]] += now - self.mark
+        self.mark = now
+    
+    def end_frame(self):
+        self.times[self.frames % len(self.times)] = self.row
+        self.row = [0.0] * len(FRAME_PHASES)
+        self.frames += 1
+        if self.hud and self.frames % self.HUD_REFRESH == 0:
+            self.hud_surface = None
+        if self.capture_left:
+            self.capture_left -= 1
+            if not self.capture_left:
+                self.finish_capture()
+    
+    def recent(self, count):
+        """Timings of the last `count` frames in order, in milliseconds"""
+        count = min(count, self.frames, len(self.times))
+        rows = np.arange(self.frames - count, self.frames) % len(self.times)
+        return self.times[rows] * 1000
+    
+    def percentiles(self, count=WINDOW):
+        """p50 and p99 per phase, plus work (everything but wait) and whole frame, in ms"""
+        times = self.recent(count)
+        if not len(times):
+            return {}
+        work = times[:, :self.index['wait']].sum(axis=1)
+        columns = np.column_stack([times, work, times.sum(axis=1)])
+        p50, p99 = np.percentile(columns, [50, 99], axis=0).tolist()
+        return dict(zip(FRAME_PHASES + ['work', 'frame'], zip(p50, p99)))
+    
+    def toggle_hud(self):
+        self.hud = not self.hud
+        self.hud_surface = None
+    
+    def render_hud(self, font):
+        """Semi-transparent HUD panel with rolling p50/p99 per phase"""
+        if self.hud_surface is not None:
+            return self.hud_surface
+        stats = self.percentiles()
+        rows = [("ms", "p50", "p99")]
+        for name in ['frame', 'work'] + FRAME_PHASES:
+            if name in stats:
+                p50, p99 = stats[name]
+                rows.append((name, f"{p50:.2f}", f"{p99:.2f}"))
+        footer = f"fps {1000 / max(stats['frame'][0], 1e-3):.0f}" if 'frame' in stats else "collecting..."
+        if self.capture_left:
+            footer += "  [capturing]"
+        
+        # Name column left-aligned, number columns right-aligned
+        cells = [[font.render(text, True, WHITE) for text in row] for row in rows]
+        widths = [max(row[col].get_width() for row in cells) for col in range(3)]
+        line_height = font.get_linesize()
+        footer_surf = font.render(footer, True, NEON_YELLOW)
+        width = max(sum(widths) + 32, footer_surf.get_width()) + 16
+        panel = pygame.Surface((width, line_height * (len(cells) + 1) + 16), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        for i, (name, p50, p99) in enumerate(cells):
+            y = 8 + i * line_height
+            panel.blit(name, (8, y))
+            panel.blit(p50, (8 + widths[0] + 16 + widths[1] - p50.get_width(), y))
+            panel.blit(p99, (width - 8 - p99.get_width(), y))
+        panel.blit(footer_surf, (8, 8 + len(cells) * line_height))
+        self.hud_surface = panel
+        return panel
+    
+    def capture(self, frames=300):
+        """Profile the next `frames` frames, then dump the results"""
+        if self.capture_left:
+            return
+        self.profile = cProfile.Profile()
+        self.capture_left = frames
+        self.profile.enable()
+    
+    def finish_capture(self):
+        self.profile.disable()
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, time.strftime("pyslot-%Y%m%d-%H%M%S"))
+        self.profile.dump_stats(base + ".prof")
+        with open(base + ".txt", "w") as f:
+            pstats.Stats(self.profile, stream=f).sort_stats("cumulative").print_stats(40)
+        self.profile = None
+        self.write_csv(base + ".csv")
+        print(f"✓ Profile written to {base}.prof / .txt / .csv")
+    
+    def write_csv(self, path):
+        """Write the buffered per-frame timings (ms) as CSV"""
+        count = min(self.frames, len(self.times))
+        times = self.recent(count)
+        first = self.frames - count
+        with open(path, "w") as f:
+            f.write(",".join(["frame"] + FRAME_PHASES + ["work", "total"]) + "\n")
+            for i, row in enumerate(times):
+                values = [f"{value:.4f}" for value in row]
+                f.write(f"{first + i}," + ",".join(values) + f",{row[:-1].sum():.4f},{row.sum():.4f}\n")
+
+def celebration_emitter(rng, n):
+    """Velocity, life and size for celebration particles"""
+    return (rng.uniform(-8, 8, n), rng.uniform(-15, -5, n),
+            rng.integers(30, 61, n), rng.uniform(3, 8, n))
+
+def win_line_emitter(rng, n):
+    """Velocity, life and size for win line particles"""
+    speed = rng.uniform(2, 6, n)
+    return (speed * rng.uniform(-1, 1, n), speed * rng.uniform(-1, 1, n),
+            rng.integers(20, 41, n), rng.uniform(4, 10, n))
+
+class ParticlePool:
+    """Fixed-capacity particle system stored as NumPy arrays.
+    
+    Particles are updated with vector ops and drawn from circle sprites
+    cached per (color, radius, alpha bucket). Spawns are queued and at most
+    spawn_budget enter the pool per frame, so a big win spreads its burst
+    over a few frames; anything beyond capacity is dropped.
+    """
+    ALPHA_STEP = 16
+    MAX_SPRITES = 1024
+    
+    def __init__(self, capacity, colors, emitter, fade_life, gravity=0.0, shrink=0.0, spawn_budget=64):
+        self.capacity = capacity
+        self.colors = list(colors)
+        self.emitter = emitter
+        self.fade_life = fade_life
+        self.gravity = gravity
+        self.shrink = shrink
+        self.spawn_budget = spawn_budget
+        self.rng = np.random.default_rng()
+        
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)
+        self.vy = np.zeros(capacity)
+        self.life = np.zeros(capacity)
+        self.size = np.zeros(capacity)
+        self.color = np.zeros(capacity, dtype=np.intp)
+        self.count = 0
+        self.pending = []
+        self.sprites = {}
+    
+    def __len__(self):
+        return self.count
+    
+    def spawn(self, x, y, count=1):
+        """Queue count particles at a point"""
+        if len(self.pending) < self.capacity:
+            self.pending.append((x, y, count))
+    
+    def clear(self):
+        self.count = 0
+        self.pending = []
+    
+    def emit(self):
+        """Move up to spawn_budget queued particles into the pool"""
+        budget = self.spawn_budget
+        while self.pending and budget > 0:
+            x, y, count = self.pending[0]
+            n = min(count, budget, self.capacity - self.count)
+            if n <= 0:
+                self.pending = []
+                break
+            start, end = self.count, self.count + n
+            self.x[start:end] = x
+            self.y[start:end] = y
+            self.vx[start:end], self.vy[start:end], self.life[start:end], self.size[start:end] = self.emitter(self.rng, n)
+            self.color[start:end] = self.rng.integers(0, len(self.colors), n)
+            self.count = end
+            budget -= n
+            if n < count:
+                self.pending[0] = (x, y, count - n)
+            else:
+                self.pending.pop(0)
+    
+    def update(self):
+        """Spawn queued particles, move everything one frame and drop dead particles"""
+        self.emit()
+        n = self.count
+        if not n:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        if self.gravity:
+            self.vy[:n] += self.gravity
+        self.life[:n] -= 1
+        if self.shrink:
+            np.maximum(self.size[:n] - self.shrink, 1, out=self.size[:n])
+        
+        alive = self.life[:n] > 0
+        if not alive.all():
+            keep = np.flatnonzero(alive)
+            for array in (self.x, self.y, self.vx, self.vy, self.life, self.size, self.color):
+                array[:len(keep)] = array[keep]
+            self.count = len(keep)
+    
+    def sprite(self, color, radius, bucket):
+        """Cached circle sprite for a color, radius and alpha bucket"""
+        key = (color, radius, bucket)
+        surf = self.sprites.get(key)
+        if surf is None:
+            if len(self.sprites) >= self.MAX_SPRITES:
+                self.sprites.clear()
+            surf = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (*color, min(255, bucket * self.ALPHA_STEP)), (radius, radius), radius)
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert_alpha()
+            self.sprites[key] = surf
+        return surf
+    
+    def positions(self):
+        """Top-left sprite positions and radii of the live particles"""
+        n = self.count
+        return ((self.x[:n] - self.size[:n]).astype(int), (self.y[:n] - self.size[:n]).astype(int),
+                self.size[:n].astype(int))
+    
+    def bounds(self):
+        """Bounding rect of the live particles, or None"""
+        if not self.count:
+            return None
+        px, py, radius = self.positions()
+        left, top = int(px.min()), int(py.min())
+        return pygame.Rect(left, top, int((px + radius * 2).max()) + 2 - left, int((py + radius * 2).max()) + 2 - top)
+    
+    def draw(self, screen):
+        n = self.count
+        if not n:
+            return
+        px, py, radius = self.positions()
+        alpha = np.clip(self.life[:n] / self.fade_life * 255, 0, 255).astype(int)
+        buckets = (alpha + self.ALPHA_STEP // 2) // self.ALPHA_STEP
+        colors = self.colors
+        screen.blits([(self.sprite(colors[c], r, b), (x, y))
+                      for c, r, b, x, y in zip(self.color[:n].tolist(), radius.tolist(), buckets.tolist(),
+                                               px.tolist(), py.tolist()) if r > 0 and b > 0], doreturn=False)
+
 class SlotMachineGame:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
+    # Player state lives in the headless engine
+    coins = _engine_attr('coins')
+    bet_per_line = _engine_attr('bet_per_line')
+    min_bet = _engine_attr('min_bet')
+    max_bet = _engine_attr('max_bet')
+    lines = _engine_attr('lines')
+    total_bet = _engine_attr('total_bet')
+    win_streak = _engine_attr('win_streak')
+    multiplier = _engine_attr('multiplier')
+    max_streak = _engine_attr('max_streak')
+    free_spins = _engine_attr('free_spins')
+    free_spins_active = _engine_attr('free_spins_active')
+    
+    def __init__(self, engine=None, dirty_rendering=False, profile_dir="profiles", assets=None):
+        if not SCREEN_WIDTH:
+            init_display()
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), SCREEN_FLAGS)
         pygame.display.set_caption("PySlot - Professional Slot Machine")
         self.clock = pygame.time.Clock()
         
+        # Synthesized sounds and the resolved emoji font survive restarts here
+        self.assets = assets if assets is not None else AssetCache()
+        
+        # Game state
+        self.engine = engine or SlotEngine(coins)
+        reels, rows = self.engine.game.reels, self.engine.game.rows
+        # Reel layers are named per reel; charge them all to the reels phase
+        self.layer_phases = dict(LAYER_PHASES)
+        self.layer_phases.update(('reel%d' % i, 'reels') for i in range(reels))
+        
         # Initialize sounds
         self.sounds = self.create_sounds()
         
-        # Load fonts
-        self.emoji_font = self.load_emoji_font(int(SCREEN_HEIGHT * 0.08))
+        # Load fonts (symbols are sized for 4 rows and shrink on taller grids)
+        emoji_size = int(SCREEN_HEIGHT * 0.32 / max(4, rows))
+        self.emoji_font = self.load_emoji_font(emoji_size)
+        self.glyphs = GlyphAtlas(self.emoji_font, self.emoji_font_size, emoji_size, self.engine.game.symbols)
         self.title_font = pygame.font.Font(None, int(SCREEN_HEIGHT * 0.06))
         self.text_font = pygame.font.Font(None, int(SCREEN_HEIGHT * 0.04))
         self.button_font = pygame.font.Font(None, int(SCREEN_HEIGHT * 0.035))
         self.small_font = pygame.font.Font(None, int(SCREEN_HEIGHT * 0.025))
         
-        # Game state
-        self.coins = coins
-        self.bet_per_line = 1
-        self.min_bet = 1
-        self.max_bet = 100  # Increased from 10 to 100
-        self.lines = 9
-        self.total_bet = 0
-        
-        # Slot state - 5 reels x 4 rows
-        self.reels = [[random.choice(symbols) for _ in range(ROWS + 6)] for _ in range(REELS)]
+        # Slot state - strip index at the top of each reel while it scrolls
+        self.reel_pos = list(self.engine.stops)
         
         # Animation state
         self.spinning = False
-        self.reel_spinning = [False] * REELS
-        self.reel_offset = [0] * REELS
-        self.reel_speed = [0] * REELS
-        self.reel_stop_time = [0] * REELS
-        self.spin_time = 0
+        self.reel_spinning = [False] * reels
+        self.reel_offset = [0] * reels
+        self.reel_speed = [0] * reels
+        self.reel_stop_time = [0] * reels
+        # Strip positions each reel scrolls before it lands on its stop
+        self.reel_left = [0] * reels
+        # Rows from reel_splice down show the run-in to the stop: strip index + reel_jump
+        self.reel_splice = [0] * reels
+        self.reel_jump = [0] * reels
         
         # Win state
         self.winning_lines = []
         self.win_animation_timer = 0
         self.win_flash = 0
         self.total_win = 0
-        self.particles = []
+        self.particles = ParticlePool(
+            MAX_PARTICLES, [GOLD, NEON_PINK, NEON_GREEN, NEON_BLUE, CYAN, ORANGE, NEON_YELLOW, MAGENTA],
+            celebration_emitter, fade_life=60, gravity=0.5, shrink=0.1
+        )
         self.background_phase = 0
-        self.win_particles = []
-        
-        # Multiplier/Combo system
-        self.win_streak = 0
-        self.multiplier = 1
-        self.max_streak = 0
+        self.win_particles = ParticlePool(
+            MAX_WIN_PARTICLES, [GOLD, NEON_YELLOW, ORANGE, WHITE, ELECTRIC_BLUE],
+            win_line_emitter, fade_life=40
+        )
         
         # Free spins bonus
-        self.free_spins = 0
-        self.free_spins_active = False
         self.scatter_count = 0
         self.bonus_triggered = False
         self.bonus_animation_timer = 0
@@ -202,13 +797,31 @@ class SlotMachineGame:
         # Screen management
         self.screen_state = "main"  # "main" or "bet_config"
         self.transition_progress = 0  # 0 to 1, for smooth animations
+        
+        # Fixed-timestep simulation: real time not yet simulated, and how far (0-1) into the next tick we draw
+        self.tick_time = 0.0
+        self.tick_alpha = 0.0
         self.transitioning = False
         self.transition_target = "main"
         
         self.message = "Select lines and press SPIN!"
         
+        # Rendering: full frames, or dirty rectangles over a cached static layer per screen
+        self.dirty_rendering = dirty_rendering
+        self.static_layers = {}
+        self.layer_state = None
+        self.layer_state_screen = None
+        self.text_cache = {}
+        
+        # Frame timing (F3 toggles the HUD, F12 captures a profile)
+        self.profiler = FrameProfiler(output_dir=profile_dir)
+        
         # Calculate UI positions
         self.calculate_layout()
+        self.background = GradientBackground(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.win_line_sprites = WinLineSprites(self.reel_width + self.reel_spacing)
+        self.bonus_animation = BonusAnimation(SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.bonus_animation.bake()
         
         # Create buttons
         btn_width = SCREEN_WIDTH * 0.15
@@ -318,102 +931,30 @@ class SlotMachineGame:
         self.running = True
     
     def create_sounds(self):
-        """Create simple sound effects using pygame"""
-        import numpy as np
-        
+        """Create simple sound effects, from the asset cache when it has them"""
         sounds = {}
-        sample_rate = 22050
+        sample_rate = SAMPLE_RATE
         
         try:
-            # Spin sound - rising tone
-            duration = 0.1
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            frequency = np.linspace(200, 400, len(t))
-            spin_wave = np.sin(2 * np.pi * frequency * t) * 0.3
-            spin_wave = (spin_wave * 32767).astype(np.int16)
-            stereo_wave = np.column_stack((spin_wave, spin_wave))
-            sounds['spin'] = pygame.sndarray.make_sound(stereo_wave)
-            
-            # Reel stop sound - quick beep
-            duration = 0.08
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            stop_wave = np.sin(2 * np.pi * 600 * t) * 0.2 * np.exp(-t * 20)
-            stop_wave = (stop_wave * 32767).astype(np.int16)
-            stereo_wave = np.column_stack((stop_wave, stop_wave))
-            sounds['stop'] = pygame.sndarray.make_sound(stereo_wave)
-            
-            # Win sound - happy ascending tones
-            duration = 0.5
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            win_wave = np.zeros_like(t)
-            for freq in [523, 659, 784, 1047]:  # C, E, G, C (major chord)
-                win_wave += np.sin(2 * np.pi * freq * t) * 0.15
-            win_wave *= np.exp(-t * 3)  # Fade out
-            win_wave = (win_wave * 32767).astype(np.int16)
-            stereo_wave = np.column_stack((win_wave, win_wave))
-            sounds['win'] = pygame.sndarray.make_sound(stereo_wave)
-            
-            # Big win sound - celebration
-            duration = 0.8
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            bigwin_wave = np.zeros_like(t)
-            for freq in [523, 659, 784, 1047, 1319]:  # Extended chord
-                bigwin_wave += np.sin(2 * np.pi * freq * t) * 0.12
-            # Add some sparkle
-            bigwin_wave += np.sin(2 * np.pi * 2093 * t) * 0.1 * np.sin(t * 20)
-            bigwin_wave *= np.exp(-t * 2)
-            bigwin_wave = (bigwin_wave * 32767).astype(np.int16)
-            stereo_wave = np.column_stack((bigwin_wave, bigwin_wave))
-            sounds['bigwin'] = pygame.sndarray.make_sound(stereo_wave)
-            
-            # Button click sound
-            duration = 0.05
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            click_wave = np.sin(2 * np.pi * 800 * t) * 0.2 * np.exp(-t * 50)
-            click_wave = (click_wave * 32767).astype(np.int16)
-            stereo_wave = np.column_stack((click_wave, click_wave))
-            sounds['click'] = pygame.sndarray.make_sound(stereo_wave)
-            
-            # Coin sound - metallic ping
-            duration = 0.15
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            coin_wave = np.sin(2 * np.pi * 1200 * t) * 0.2 * np.exp(-t * 15)
-            coin_wave += np.sin(2 * np.pi * 1800 * t) * 0.1 * np.exp(-t * 20)
-            coin_wave = (coin_wave * 32767).astype(np.int16)
-            stereo_wave = np.column_stack((coin_wave, coin_wave))
-            sounds['coin'] = pygame.sndarray.make_sound(stereo_wave)
-            
-            # Multiplier sound - power up
-            duration = 0.3
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            mult_wave = np.zeros_like(t)
-            for freq in [440, 554, 659]:  # A, C#, E (ascending)
-                mult_wave += np.sin(2 * np.pi * freq * t) * 0.12
-            mult_wave *= np.exp(-t * 5)
-            mult_wave = (mult_wave * 32767).astype(np.int16)
-            stereo_wave = np.column_stack((mult_wave, mult_wave))
-            sounds['multiplier'] = pygame.sndarray.make_sound(stereo_wave)
-            
-            # Bonus trigger sound - fanfare
-            duration = 1.0
-            t = np.linspace(0, duration, int(sample_rate * duration))
-            bonus_wave = np.zeros_like(t)
-            # Triumphant fanfare
-            for i, freq in enumerate([523, 659, 784, 1047, 1319]):
-                segment = (t >= i*0.15) & (t < (i+1)*0.15)
-                bonus_wave += np.sin(2 * np.pi * freq * t) * segment * 0.15
-            bonus_wave *= np.exp(-t * 2)
-            bonus_wave = (bonus_wave * 32767).astype(np.int16)
-            stereo_wave = np.column_stack((bonus_wave, bonus_wave))
-            sounds['bonus'] = pygame.sndarray.make_sound(stereo_wave)
+            cached = 0
+            for name, recipe in SOUND_RECIPES.items():
+                key = cache_key(recipe, sample_rate)
+                wave = self.assets.load_array(f"sound-{name}", key, np.int16, (int(sample_rate * recipe['duration']),))
+                if wave is None:
+                    wave = synthesize(recipe, sample_rate)
+                    self.assets.save_array(f"sound-{name}", key, wave)
+                else:
+                    cached += 1
+                stereo_wave = np.column_stack((wave, wave))
+                sounds[name] = pygame.sndarray.make_sound(stereo_wave)
             
-            print("✓ Sound effects created successfully")
+            print(f"✓ Sound effects created successfully ({cached}/{len(SOUND_RECIPES)} from cache)")
         except Exception as e:
             print(f"⚠ Could not create sounds: {e}")
             print("  Game will run without sound effects")
             # Create silent sounds as fallback
             silent = np.zeros((100, 2), dtype=np.int16)
-            for key in ['spin', 'stop', 'win', 'bigwin', 'click', 'coin', 'multiplier', 'bonus']:
+            for key in SOUND_RECIPES:
                 sounds[key] = pygame.sndarray.make_sound(silent)
         
         return sounds
@@ -431,23 +972,55 @@ class SlotMachineGame:
         reel_margin = self.machine_width * 0.02
         total_reel_width = self.machine_width - 2 * reel_margin
         self.reel_spacing = total_reel_width * 0.02
-        self.reel_width = (total_reel_width - self.reel_spacing * (REELS - 1)) / REELS
+        reels = self.engine.game.reels
+        self.reel_width = (total_reel_width - self.reel_spacing * (reels - 1)) / reels
         self.reel_height = self.machine_height * 0.85
         
-        self.symbol_height = self.reel_height / ROWS
         
         # Calculate reel positions
         self.reel_positions = []
-        for i in range(REELS):
+        for i in range(reels):
             x = self.machine_x + reel_margin + i * (self.reel_width + self.reel_spacing)
             y = self.machine_y + self.machine_height * 0.08
             self.reel_positions.append((x, y))
+        
+        # Reel background gradient, drawn once
+        self.reel_surface = pygame.Surface((int(self.reel_width), int(self.reel_height)))
+        for i in range(int(self.reel_height)):
+            progress = i / self.reel_height
+            brightness = int(230 + 25 * math.sin(progress * 3.14159))
+            blue_brightness = min(255, brightness + 15)
+            pygame.draw.rect(self.reel_surface, (brightness, brightness, blue_brightness),
+                           pygame.Rect(0, i, self.reel_width, 1))
+        
+        # Machine frame: gradient background and rainbow border, drawn once
+        machine_rect = pygame.Rect(SCREEN_WIDTH * 0.15, SCREEN_HEIGHT * 0.22, SCREEN_WIDTH * 0.7, SCREEN_HEIGHT * 0.42)
+        pad = 8
+        self.machine_frame = pygame.Surface((machine_rect.width + pad * 2, machine_rect.height + pad * 2), pygame.SRCALPHA)
+        self.machine_frame_pos = (machine_rect.x - pad, machine_rect.y - pad)
+        frame_rect = machine_rect.move(-self.machine_frame_pos[0], -self.machine_frame_pos[1])
+        for i in range(int(frame_rect.height)):
+            progress = i / frame_rect.height
+            brightness = int(50 + 30 * math.sin(progress * 3.14159))
+            pygame.draw.rect(self.machine_frame, (brightness, brightness, brightness + 20),
+                           pygame.Rect(frame_rect.x, frame_rect.y + i, frame_rect.width, 1))
+        for i, color in enumerate([GOLD, ORANGE, NEON_YELLOW, NEON_GREEN]):
+            pygame.draw.rect(self.machine_frame, color, frame_rect.inflate(i*4, i*4), 3, border_radius=15 + i*2)
     
     def load_emoji_font(self, size):
         """Load emoji font for Linux"""
-        import os
-        import platform
-        import subprocess
+        # Size the font was opened at; GlyphAtlas scales from this to the requested size
+        self.emoji_font_size = size
+        
+        # Font file resolved on an earlier launch, unless it changed since
+        cached = self.assets.get('emoji_font')
+        if cached and file_signature(cached.get('path', '')) == cached.get('file'):
+            try:
+                font = self.open_font_file(cached['path'], size)
+                print(f"✓ Loaded emoji font: {cached['path']} (cached)")
+                return font
+            except Exception:
+                self.emoji_font_size = size
         
         emoji_fonts = []
         
@@ -478,12 +1051,14 @@ class SlotMachineGame:
             try:
                 if os.path.isabs(font_path):
                     if os.path.exists(font_path):
-                        font = pygame.font.Font(font_path, size)
+                        font = self.open_font_file(font_path, size)
                         print(f"✓ Loaded emoji font: {font_path}")
+                        self.remember_emoji_font(font_path)
                         return font
                 else:
                     font = pygame.font.SysFont(font_path, size)
                     print(f"✓ Loaded emoji font: {font_path}")
+                    self.remember_emoji_font(pygame.font.match_font(font_path))
                     return font
             except:
                 continue
@@ -491,23 +1066,31 @@ class SlotMachineGame:
         print("⚠ Using default font")
         return pygame.font.Font(None, size)
     
+    def open_font_file(self, font_path, size):
+        """Open a font file, falling back to the native size of bitmap emoji fonts"""
+        try:
+            return pygame.font.Font(font_path, size)
+        except Exception:
+            # Bitmap color emoji fonts only open at their native size
+            font = pygame.font.Font(font_path, EMOJI_BITMAP_SIZE)
+            self.emoji_font_size = EMOJI_BITMAP_SIZE
+            return font
+    
+    def remember_emoji_font(self, font_path):
+        """Store the resolved emoji font file so later launches skip the probing"""
+        if font_path and os.path.isabs(font_path):
+            self.assets.set('emoji_font', {'path': font_path, 'file': file_signature(font_path)})
+    
     def start_spin(self):
         if self.spinning:
             return
         
-        self.total_bet = self.bet_per_line * self.lines
-        
-        # Check if using free spin or regular spin
-        if self.free_spins > 0:
-            self.free_spins -= 1
-            self.free_spins_active = True
+        # Pay for the spin (or use a free spin) and draw the result
+        if self.engine.start_spin() is None:
+            self.message = "Not enough coins!"
+            return
+        if self.free_spins_active:
             self.message = f"FREE SPIN! {self.free_spins} remaining"
-        else:
-            if self.coins < self.total_bet:
-                self.message = "Not enough coins!"
-                return
-            self.coins -= self.total_bet
-            self.free_spins_active = False
         
         self.spinning = True
         self.winning_lines = []
@@ -519,42 +1102,60 @@ class SlotMachineGame:
         self.sounds['spin'].play()
         
         # Start all reels
-        self.reel_spinning = [True] * REELS
-        self.reel_offset = [0] * REELS
-        self.reel_speed = [30] * REELS
-        self.spin_time = 0
+        reels = self.engine.game.reels
+        self.reel_spinning = [True] * reels
+        self.reel_offset = [0] * reels
+        self.reel_speed = [REEL_SPEED] * reels
         
-        # Set stop times
-        for i in range(REELS):
+        # Set stop times (in ticks) and plan how far every reel scrolls to land on its stop
+        for i in range(reels):
             self.reel_stop_time[i] = 60 + i * 15
-        
-        # Generate result
-        for reel in range(REELS):
-            for row in range(ROWS):
-                self.reels[reel][row] = random.choices(symbols, weights=symbol_weights, k=1)[0]
+            self.plan_reel_stop(i)
         
         self.message = "Spinning..."
     
+    def plan_reel_stop(self, reel_idx):
+        """Pick the travel of a reel so that it lands on the engine's stop.
+        
+        The reel scrolls on from what it shows, for about as far as it
+        covers in its stop time plus braking. Symbols entering below the
+        window are the run-up to the stop on the strip, so the landing
+        window scrolls in continuously instead of being swapped in.
+        """
+        rows = self.engine.heights[reel_idx] + 2
+        travel = REEL_SPEED * self.reel_stop_time[reel_idx] + REEL_SPEED ** 2 / (2 * REEL_DECELERATION)
+        left = max(rows, round(travel / self.symbol_height(reel_idx)))
+        self.reel_left[reel_idx] = left
+        self.reel_splice[reel_idx] = rows
+        self.reel_jump[reel_idx] = self.engine.stops[reel_idx] - left - self.reel_pos[reel_idx]
+    
+    def advance_reel(self, reel_idx):
+        """Scroll a reel by one strip position"""
+        self.reel_pos[reel_idx] += 1
+        self.reel_left[reel_idx] -= 1
+        self.reel_splice[reel_idx] -= 1
+        if self.reel_splice[reel_idx] <= 0:
+            # The run-up fills the window: continue from it
+            self.reel_pos[reel_idx] += self.reel_jump[reel_idx]
+            self.reel_jump[reel_idx] = 0
+        self.reel_pos[reel_idx] %= len(self.engine.strips[reel_idx])
+    
     def update_spin_animation(self):
         # Update background animation
         self.background_phase = (self.background_phase + 1) % 360
         
+        # Advance the bonus animation frame drawn last, with fireworks particles
+        if self.bonus_animation_timer > 0:
+            if self.bonus_animation_timer % 5 == 0:
+                for _ in range(5):
+                    x = random.randint(0, SCREEN_WIDTH)
+                    y = random.randint(0, SCREEN_HEIGHT)
+                    self.create_particle(x, y)
+            self.bonus_animation_timer -= 1
+        
         # Update particles
-        self.particles = [p for p in self.particles if p['life'] > 0]
-        for particle in self.particles:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['vy'] += 0.5  # gravity
-            particle['life'] -= 1
-            particle['size'] = max(1, particle['size'] - 0.1)
-        
-        # Update win particles
-        self.win_particles = [p for p in self.win_particles if p['life'] > 0]
-        for particle in self.win_particles:
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['life'] -= 1
-            particle['alpha'] = int((particle['life'] / particle['max_life']) * 255)
+        self.particles.update()
+        self.win_particles.update()
         
         if not self.spinning:
             if self.win_animation_timer > 0:
@@ -568,133 +1169,74 @@ class SlotMachineGame:
                         reel = random.randint(0, win_info['count'] - 1)
                         x, y = self.reel_positions[reel]
                         row = line[reel]
+                        symbol_height = self.symbol_height(reel)
                         px = x + self.reel_width // 2
-                        py = y + row * self.symbol_height + self.symbol_height // 2
+                        py = y + row * symbol_height + symbol_height // 2
                         
-                        for _ in range(2):
-                            self.create_win_particle(px, py)
+                        self.create_win_particle(px, py, 2)
             return
         
-        self.spin_time += 1
         all_stopped = True
         
-        for i in range(REELS):
+        for i in range(self.engine.game.reels):
             if self.reel_spinning[i]:
                 all_stopped = False
+                symbol_height = self.symbol_height(i)
                 
-                # Move reel
-                self.reel_offset[i] += self.reel_speed[i]
+                # Full speed until the brakes bring the reel to rest exactly on its stop (v^2 = 2ad)
+                distance = self.reel_left[i] * symbol_height - self.reel_offset[i]
+                self.reel_speed[i] = min(REEL_SPEED, max(1, math.sqrt(2 * REEL_DECELERATION * distance)))
                 
-                # Cycle symbols
-                if self.reel_offset[i] >= self.symbol_height:
+                if self.reel_speed[i] < distance:
+                    # Move reel, advancing a strip position per symbol height
+                    self.reel_offset[i] += self.reel_speed[i]
+                    while self.reel_offset[i] >= symbol_height:
+                        self.reel_offset[i] -= symbol_height
+                        self.advance_reel(i)
+                else:
+                    # Last step onto the stop picked by the engine
+                    while self.reel_left[i] > 0:
+                        self.advance_reel(i)
+                    self.reel_spinning[i] = False
                     self.reel_offset[i] = 0
-                    self.reels[i].pop(0)
-                    self.reels[i].append(random.choices(symbols, weights=symbol_weights, k=1)[0])
-                
-                # Check if should stop
-                if self.spin_time >= self.reel_stop_time[i]:
-                    self.reel_speed[i] = max(5, self.reel_speed[i] - 3)
+                    self.reel_speed[i] = 0
                     
-                    if self.reel_speed[i] <= 5 and self.reel_offset[i] < 5:
-                        self.reel_spinning[i] = False
-                        self.reel_offset[i] = 0
-                        # Set final symbols
-                        for row in range(ROWS):
-                            self.reels[i][row] = self.reels[i][row]
-                        
-                        # Play stop sound
-                        self.sounds['stop'].play()
-                        
-                        # Create particles when reel stops
-                        x, y = self.reel_positions[i]
-                        for _ in range(10):
-                            self.create_particle(x + self.reel_width // 2, y + self.reel_height // 2)
+                    # Play stop sound
+                    self.sounds['stop'].play()
+                    
+                    # Create particles when reel stops
+                    x, y = self.reel_positions[i]
+                    self.create_particle(x + self.reel_width // 2, y + self.reel_height // 2, 10)
         
         if all_stopped:
             self.spinning = False
             self.check_wins()
     
     def check_wins(self):
-        """Check for winning lines"""
-        self.winning_lines = []
-        self.total_win = 0
-        
-        # Count scatter symbols (🎁) anywhere on the reels
-        self.scatter_count = 0
-        for reel in range(REELS):
-            for row in range(ROWS):
-                if self.reels[reel][row] == "🎁":
-                    self.scatter_count += 1
-        
-        # Check regular win lines
-        for line_idx in range(self.lines):
-            line = WIN_LINES[line_idx]
-            symbols_on_line = [self.reels[reel][line[reel]] for reel in range(REELS)]
-            
-            # Check for matches
-            first_symbol = symbols_on_line[0]
-            match_count = 1
-            
-            for i in range(1, REELS):
-                if symbols_on_line[i] == first_symbol:
-                    match_count += 1
-                else:
-                    break
-            
-            if match_count >= 3:
-                win_amount = symbol_rewards[first_symbol] * self.bet_per_line * match_count
-                self.total_win += win_amount
-                self.winning_lines.append({
-                    'line_idx': line_idx,
-                    'line': line,
-                    'symbol': first_symbol,
-                    'count': match_count,
-                    'win': win_amount
-                })
+        """Settle the spin in the engine and celebrate the result"""
+        result = self.engine.settle()
+        self.winning_lines = result.winning_lines
+        self.total_win = result.total_win
+        self.scatter_count = result.scatter_count
         
         # Check for scatter bonus (3+ scatter symbols triggers free spins)
-        if self.scatter_count >= 3:
+        if result.bonus_triggered:
             self.bonus_triggered = True
-            bonus_spins = 5 + (self.scatter_count - 3) * 2  # 5 spins for 3 scatters, +2 for each extra
-            self.free_spins += bonus_spins
-            scatter_win = symbol_rewards["🎁"] * self.scatter_count * self.bet_per_line
-            self.total_win += scatter_win
-            self.bonus_animation_timer = 120
+            self.bonus_animation_timer = BonusAnimation.FRAMES
             # Play bonus sound
             self.sounds['bonus'].play()
         
         if self.total_win > 0:
-            # Increase win streak and multiplier
-            old_multiplier = self.multiplier
-            self.win_streak += 1
-            self.max_streak = max(self.max_streak, self.win_streak)
-            
-            # Calculate multiplier based on streak (caps at 10x)
-            if self.win_streak >= 10:
-                self.multiplier = 10
-            elif self.win_streak >= 7:
-                self.multiplier = 5
-            elif self.win_streak >= 5:
-                self.multiplier = 3
-            elif self.win_streak >= 3:
-                self.multiplier = 2
-            else:
-                self.multiplier = 1
-            
             # Play multiplier sound when it increases
-            if self.multiplier > old_multiplier:
+            if result.multiplier_increased:
                 self.sounds['multiplier'].play()
             
-            # Apply multiplier to win (extra bonus during free spins)
-            bonus_multiplier = 2 if self.free_spins_active else 1
-            final_multiplier = self.multiplier * bonus_multiplier
-            final_win = int(self.total_win * final_multiplier)
-            
-            self.coins += final_win
+            final_multiplier = result.final_multiplier
+            final_win = result.final_win
             
             # Create message
             if self.bonus_triggered:
-                self.message = f"🎁 BONUS! {bonus_spins} FREE SPINS! Won {final_win} coins!"
+                self.message = f"🎁 BONUS! {result.bonus_spins} FREE SPINS! Won {final_win} coins!"
             elif final_multiplier > 1:
                 self.message = f"WIN! {final_win} coins ({self.total_win} x{final_multiplier}) - STREAK {self.win_streak}!"
             else:
@@ -721,42 +1263,17 @@ class SlotMachineGame:
                 y = random.randint(int(self.machine_y), int(self.machine_y + self.machine_height))
                 self.create_particle(x, y)
         else:
-            # Reset streak on loss
-            self.win_streak = 0
-            self.multiplier = 1
             self.message = "No win. Try again!"
         
         self.spin_button.enabled = True
     
-    def create_particle(self, x, y):
-        """Create a celebration particle"""
-        particle = {
-            'x': x,
-            'y': y,
-            'vx': random.uniform(-8, 8),
-            'vy': random.uniform(-15, -5),
-            'life': random.randint(30, 60),
-            'size': random.uniform(3, 8),
-            'color': random.choice([GOLD, NEON_PINK, NEON_GREEN, NEON_BLUE, CYAN, ORANGE, NEON_YELLOW, MAGENTA])
-        }
-        self.particles.append(particle)
-    
-    def create_win_particle(self, x, y):
-        """Create a win line particle"""
-        angle = random.uniform(0, 2 * 3.14159)
-        speed = random.uniform(2, 6)
-        particle = {
-            'x': x,
-            'y': y,
-            'vx': speed * random.uniform(-1, 1),
-            'vy': speed * random.uniform(-1, 1),
-            'life': random.randint(20, 40),
-            'max_life': 40,
-            'size': random.uniform(4, 10),
-            'color': random.choice([GOLD, NEON_YELLOW, ORANGE, WHITE, ELECTRIC_BLUE]),
-            'alpha': 255
-        }
-        self.win_particles.append(particle)
+    def create_particle(self, x, y, count=1):
+        """Create celebration particles"""
+        self.particles.spawn(x, y, count)
+    
+    def create_win_particle(self, x, y, count=1):
+        """Create win line particles"""
+        self.win_particles.spawn(x, y, count)
     
     def handle_events(self):
         for event in pygame.event.get():
@@ -771,6 +1288,10 @@ class SlotMachineGame:
                         self.running = False
                 elif event.key == pygame.K_SPACE and not self.spinning and self.screen_state == "main":
                     self.start_spin()
+                elif event.key == pygame.K_F3:
+                    self.profiler.toggle_hud()
+                elif event.key == pygame.K_F12:
+                    self.profiler.capture()
             
             if self.exit_button.handle_event(event):
                 self.sounds['click'].play()
@@ -796,52 +1317,72 @@ class SlotMachineGame:
                 # Line controls
                 if self.lines_up.handle_event(event):
                     self.sounds['click'].play()
-                    self.lines = min(9, self.lines + 1)
+                    self.engine.set_lines(self.lines + 1)
                 if self.lines_down.handle_event(event):
                     self.sounds['click'].play()
-                    self.lines = max(1, self.lines - 1)
+                    self.engine.set_lines(self.lines - 1)
                 
                 # Basic bet controls
                 if self.bet_up.handle_event(event):
                     self.sounds['click'].play()
-                    self.bet_per_line = min(self.max_bet, self.bet_per_line + 1)
+                    self.engine.set_bet(self.bet_per_line + 1)
                 if self.bet_down.handle_event(event):
                     self.sounds['click'].play()
-                    self.bet_per_line = max(self.min_bet, self.bet_per_line - 1)
+                    self.engine.set_bet(self.bet_per_line - 1)
                 
                 # Quick bet controls
                 if self.bet_min.handle_event(event):
                     self.sounds['click'].play()
-                    self.bet_per_line = self.min_bet
+                    self.engine.set_bet(self.min_bet)
                 if self.bet_max.handle_event(event):
                     self.sounds['click'].play()
-                    self.bet_per_line = self.max_bet
+                    self.engine.set_bet(self.max_bet)
                 if self.bet_half.handle_event(event):
                     self.sounds['click'].play()
-                    self.bet_per_line = max(self.min_bet, self.bet_per_line // 2)
+                    self.engine.set_bet(self.bet_per_line // 2)
                 if self.bet_double.handle_event(event):
                     self.sounds['click'].play()
-                    self.bet_per_line = min(self.max_bet, self.bet_per_line * 2)
+                    self.engine.set_bet(self.bet_per_line * 2)
                 
                 # Preset bet buttons
                 if self.preset_bet_1.handle_event(event):
                     self.sounds['click'].play()
-                    self.bet_per_line = 1
+                    self.engine.set_bet(1)
                 if self.preset_bet_5.handle_event(event):
                     self.sounds['click'].play()
-                    self.bet_per_line = 5
+                    self.engine.set_bet(5)
                 if self.preset_bet_10.handle_event(event):
                     self.sounds['click'].play()
-                    self.bet_per_line = 10
+                    self.engine.set_bet(10)
                 if self.preset_bet_25.handle_event(event):
                     self.sounds['click'].play()
-                    self.bet_per_line = 25
+                    self.engine.set_bet(25)
                 if self.preset_bet_50.handle_event(event):
                     self.sounds['click'].play()
-                    self.bet_per_line = 50
+                    self.engine.set_bet(50)
                 if self.preset_bet_100.handle_event(event):
                     self.sounds['click'].play()
-                    self.bet_per_line = 100
+                    self.engine.set_bet(100)
+    
+    def advance(self, dt):
+        """Run the simulation ticks covered by dt seconds of real time; returns the tick count.
+        
+        Animation runs at TICK_RATE whatever the render frame rate: slow
+        frames run several ticks, fast frames may run none and draw
+        interpolated between ticks (see tick_alpha).
+        """
+        tick = 1.0 / TICK_RATE
+        self.tick_time = min(self.tick_time + dt, tick * MAX_TICKS_PER_FRAME)
+        ticks = 0
+        while self.tick_time >= tick:
+            self.update_spin_animation()
+            self.profiler.lap('update')
+            self.update_transition()  # Update screen transitions
+            self.profiler.lap('transition')
+            self.tick_time -= tick
+            ticks += 1
+        self.tick_alpha = self.tick_time / tick
+        return ticks
     
     def start_transition(self, target_screen):
         """Start screen transition animation"""
@@ -855,7 +1396,7 @@ class SlotMachineGame:
             return
         
         # Smooth easing function
-        self.transition_progress += 0.08  # Speed of transition
+        self.transition_progress += TRANSITION_SPEED
         
         if self.transition_progress >= 1.0:
             self.transition_progress = 1.0
@@ -863,18 +1404,16 @@ class SlotMachineGame:
             self.screen_state = self.transition_target
     
     def draw(self):
-        import math
+        if self.dirty_rendering and not self.transitioning:
+            self.draw_dirty()
+            return
+        
+        # Full redraw; dirty mode repaints everything when it resumes
+        self.layer_state = None
         
         # Animated background gradient
-        for y in range(SCREEN_HEIGHT):
-            progress = y / SCREEN_HEIGHT
-            phase = self.background_phase / 360.0
-            
-            r = int(20 + 40 * math.sin(progress * 3.14159 + phase * 2) + 20)
-            g = int(25 + 35 * math.sin(progress * 3.14159 + phase * 2 + 2) + 15)
-            b = int(35 + 45 * math.sin(progress * 3.14159 + phase * 2 + 4) + 25)
-            
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (SCREEN_WIDTH, y))
+        self.background.draw(self.screen, (self.background_phase + self.tick_alpha) % 360)
+        self.profiler.lap('background')
         
         # Choose which screen to draw based on state
         if self.screen_state == "main":
@@ -885,13 +1424,118 @@ class SlotMachineGame:
         # Draw transition overlay if transitioning
         if self.transitioning:
             self.draw_transition()
+            self.profiler.lap('overlay')
+        
+        if self.profiler.hud:
+            self.draw_hud()
+            self.profiler.lap('hud')
         
         pygame.display.flip()
+        self.profiler.lap('flip')
     
-    def draw_main_screen(self):
-        """Draw the main game screen"""
-        import math
+    def draw_dirty(self):
+        """Repaint only the regions whose layers changed since the last frame"""
+        screen_rect = self.screen.get_rect()
+        static = self.static_layers.get(self.screen_state)
+        if static is None:
+            static = self.static_layers[self.screen_state] = self.build_static_layer(self.screen_state)
         
+        if self.screen_state == "main":
+            layers = self.main_screen_layers()
+        else:
+            layers = self.bet_config_layers()
+        if self.profiler.hud:
+            layers.append(self.hud_layer())
+        self.profiler.lap('layout')
+        
+        # Dirty regions: layers whose key changed (old and new rect), animated layers, removed layers
+        regions = []
+        if self.layer_state is None or self.layer_state_screen != self.screen_state:
+            self.layer_state = {}
+            self.layer_state_screen = self.screen_state
+            regions.append(screen_rect)
+        state = {}
+        for name, rect, key, draw in layers:
+            last = self.layer_state.pop(name, None)
+            if key is None or last is None or last[1] != key:
+                regions.append(rect)
+                if last is not None:
+                    regions.append(last[0])
+            state[name] = (rect, key)
+        regions.extend(rect for rect, key in self.layer_state.values())
+        self.layer_state = state
+        
+        regions = merge_rects(regions, screen_rect)
+        
+        # Grow regions to cover whole layers: pygame draws rounded borders differently when clipped
+        layer_rects = [rect for name, rect, key, draw in layers]
+        while True:
+            grown = []
+            for region in regions:
+                hits = [rect for rect in layer_rects if rect.colliderect(region)]
+                grown.append(region.unionall(hits) if hits else region)
+            grown = merge_rects(grown, screen_rect)
+            if grown == regions:
+                break
+            regions = grown
+        
+        for region in regions:
+            self.screen.set_clip(region)
+            self.screen.blit(static, region, region)
+            self.profiler.lap('background')
+            self.draw_layers(layer for layer in layers if layer[1].colliderect(region))
+        self.screen.set_clip(None)
+        
+        if regions:
+            pygame.display.update(regions)
+        self.profiler.lap('flip')
+    
+    def build_static_layer(self, screen_state):
+        """Render everything on a screen that never changes into one surface"""
+        layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self.background.draw(layer, 0)
+        if screen_state == "main":
+            self.draw_main_static(layer)
+        else:
+            self.draw_bet_config_static(layer)
+        return layer
+    
+    def render_text(self, font, text, color):
+        """Render text through a small cache of recently used strings"""
+        key = (font, text, color)
+        surf = self.text_cache.get(key)
+        if surf is None:
+            if len(self.text_cache) > 512:
+                self.text_cache.clear()
+            surf = self.text_cache[key] = font.render(text, True, color)
+        return surf
+    
+    def text_layer(self, name, font, text, color, pos=None, center=None, glow=None, offsets=()):
+        """Layer for a (optionally glowing) line of text at a topleft or center position"""
+        surf = self.render_text(font, text, color)
+        if center is not None:
+            rect = surf.get_rect(center=center)
+        else:
+            # Blit positions truncate floats, rect attributes would round them
+            rect = pygame.Rect((int(pos[0]), int(pos[1])), surf.get_size())
+        glow_surf = self.render_text(font, text, glow) if glow is not None else None
+        spread = max([max(abs(dx), abs(dy)) for dx, dy in offsets] or [0])
+        
+        def draw():
+            if glow_surf is not None:
+                for dx, dy in offsets:
+                    self.screen.blit(glow_surf, (rect.x + dx, rect.y + dy))
+            self.screen.blit(surf, rect)
+        return (name, rect.inflate(spread * 2, spread * 2), (text, color), draw)
+    
+    def button_layer(self, name, button, font):
+        """Layer for a button (its cached surface is padded for the glowing border)"""
+        key = (button.enabled, button.hover and button.enabled, button.text, font)
+        return (name, button.rect.inflate(BUTTON_PAD * 2, BUTTON_PAD * 2), key,
+                lambda: button.draw(self.screen, font))
+    
+    def draw_main_static(self, surface):
+        """Draw the parts of the main screen that never change"""
         # Title with glow effect
         title_text = "PYSLOT CASINO 🎰"
         title_surf = self.title_font.render(title_text, True, NEON_YELLOW)
@@ -900,84 +1544,129 @@ class SlotMachineGame:
         # Glowing title
         title_glow = self.title_font.render(title_text, True, GOLD)
         for offset in [(4, 4), (-4, 4), (4, -4), (-4, -4), (0, 4), (4, 0), (0, -4), (-4, 0)]:
-            self.screen.blit(title_glow, (title_rect.x + offset[0], title_rect.y + offset[1]))
-        self.screen.blit(title_surf, title_rect)
+            surface.blit(title_glow, (title_rect.x + offset[0], title_rect.y + offset[1]))
+        surface.blit(title_surf, title_rect)
+        
+        # Machine frame (pre-rendered gradient and rainbow border)
+        surface.blit(self.machine_frame, self.machine_frame_pos)
+        
+        # Instructions
+        inst_text = self.small_font.render("SPACE to spin | ► for bet config | ESC to exit", True, LIGHT_GRAY)
+        surface.blit(inst_text, (20, SCREEN_HEIGHT - 30))
+    
+    def main_screen_layers(self):
+        """Changing parts of the main screen as (name, rect, key, draw), in drawing order.
+        
+        A layer is redrawn when its key changes; a key of None means it
+        changes every frame.
+        """
+        layers = []
         
         # Coins display with animated glow
         brightness = int(255 * (0.8 + 0.2 * math.sin(self.background_phase / 10)))
-        coin_color = (255, 215, brightness) 
-        coins_text = f"Coins: ${self.coins}"
-        coins_surf = self.text_font.render(coins_text, True, coin_color)
-        self.screen.blit(coins_surf, (SCREEN_WIDTH * 0.02, SCREEN_HEIGHT * 0.12))
+        layers.append(self.text_layer('coins', self.text_font, f"Coins: ${self.coins}", (255, 215, brightness),
+                                      pos=(SCREEN_WIDTH * 0.02, SCREEN_HEIGHT * 0.12)))
         
         # Bet display
-        bet_text = f"Total Bet: ${self.bet_per_line * self.lines}"
-        bet_surf = self.text_font.render(bet_text, True, NEON_PINK)
-        self.screen.blit(bet_surf, (SCREEN_WIDTH * 0.02, SCREEN_HEIGHT * 0.16))
+        layers.append(self.text_layer('bet', self.text_font, f"Total Bet: ${self.bet_per_line * self.lines}", NEON_PINK,
+                                      pos=(SCREEN_WIDTH * 0.02, SCREEN_HEIGHT * 0.16)))
         
         # Multiplier display (when active)
         if self.multiplier > 1:
-            mult_text = f"🔥 {self.multiplier}x MULTIPLIER! 🔥"
-            mult_surf = self.text_font.render(mult_text, True, NEON_ORANGE)
-            mult_glow = self.text_font.render(mult_text, True, ORANGE)
-            mult_rect = mult_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 0.12))
-            
-            # Glow effect
-            for offset in [(3, 3), (-3, 3), (3, -3), (-3, -3)]:
-                self.screen.blit(mult_glow, (mult_rect.x + offset[0], mult_rect.y + offset[1]))
-            self.screen.blit(mult_surf, mult_rect)
+            layers.append(self.text_layer('multiplier', self.text_font, f"🔥 {self.multiplier}x MULTIPLIER! 🔥", NEON_ORANGE,
+                                          center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 0.12), glow=ORANGE,
+                                          offsets=[(3, 3), (-3, 3), (3, -3), (-3, -3)]))
         
         # Free spins display
         if self.free_spins > 0:
-            free_text = f"🌟 FREE SPINS: {self.free_spins} 🌟"
-            free_surf = self.text_font.render(free_text, True, NEON_YELLOW)
-            free_glow = self.text_font.render(free_text, True, GOLD)
-            free_rect = free_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 0.16))
-            
-            # Glow effect
-            for offset in [(3, 3), (-3, 3), (3, -3), (-3, -3)]:
-                self.screen.blit(free_glow, (free_rect.x + offset[0], free_rect.y + offset[1]))
-            self.screen.blit(free_surf, free_rect)
+            layers.append(self.text_layer('free_spins', self.text_font, f"🌟 FREE SPINS: {self.free_spins} 🌟", NEON_YELLOW,
+                                          center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 0.16), glow=GOLD,
+                                          offsets=[(3, 3), (-3, 3), (3, -3), (-3, -3)]))
         
-        # Draw machine frame
-        machine_rect = pygame.Rect(SCREEN_WIDTH * 0.15, SCREEN_HEIGHT * 0.22, SCREEN_WIDTH * 0.7, SCREEN_HEIGHT * 0.42)
+        # Reels
+        for reel_idx in range(self.engine.game.reels):
+            x, y = self.reel_positions[reel_idx]
+            rect = pygame.Rect(x, y, self.reel_width, self.reel_height).inflate(4, 4)
+            rect.union_ip(self.render_text(self.small_font, f"{reel_idx + 1}", WHITE).get_rect(topleft=(x + 5, y - 25)))
+            layers.append(('reel%d' % reel_idx, rect, self.reel_key(reel_idx),
+                           lambda reel_idx=reel_idx: self.draw_reel(reel_idx)))
         
-        # Machine gradient background
-        for i in range(int(machine_rect.height)):
-            progress = i / machine_rect.height
-            brightness = int(50 + 30 * math.sin(progress * 3.14159))
-            pygame.draw.rect(self.screen, (brightness, brightness, brightness + 20),
-                           pygame.Rect(machine_rect.x, machine_rect.y + i, machine_rect.width, 1))
+        # Particles
+        if self.particles:
+            layers.append(('particles', self.particles.bounds(), None, self.draw_particles))
         
-        # Rainbow border
-        for i, color in enumerate([GOLD, ORANGE, NEON_YELLOW, NEON_GREEN]):
-            pygame.draw.rect(self.screen, color, machine_rect.inflate(i*4, i*4), 3, border_radius=15 + i*2)
+        # Win lines
+        if self.winning_lines and self.win_animation_timer > 0:
+            first_x, first_y = self.reel_positions[0]
+            last_x, _ = self.reel_positions[-1]
+            rect = pygame.Rect(first_x, first_y, last_x + self.reel_width - first_x, self.reel_height).inflate(60, 60)
+            if self.win_particles:
+                rect.union_ip(self.win_particles.bounds())
+            layers.append(('win_lines', rect, None, self.draw_win_lines))
+        
+        # Bonus trigger animation
+        if self.bonus_animation_timer > 0:
+            layers.append(('bonus', self.screen.get_rect(), None, self.draw_bonus_animation))
         
-        # Draw reels
-        self.draw_reels()
+        # Message box
+        msg_bg = pygame.Rect(SCREEN_WIDTH * 0.2, SCREEN_HEIGHT * 0.74, SCREEN_WIDTH * 0.6, SCREEN_HEIGHT * 0.055)
+        msg_surf = self.render_text(self.text_font, self.message, WHITE)
+        rect = msg_bg.inflate(10, 10).union(msg_surf.get_rect(center=msg_bg.center).inflate(6, 6))
+        win_message = self.total_win > 0 and self.win_animation_timer > 0
+        key = (self.message, win_message, self.win_flash if win_message else None)
+        layers.append(('message', rect, key, self.draw_message))
         
-        # Draw particles
-        for particle in self.particles:
-            particle_surface = pygame.Surface((int(particle['size'] * 2), int(particle['size'] * 2)), pygame.SRCALPHA)
-            alpha = int((particle['life'] / 60) * 255)
-            pygame.draw.circle(particle_surface, (*particle['color'], alpha), 
-                             (int(particle['size']), int(particle['size'])), int(particle['size']))
-            self.screen.blit(particle_surface, (int(particle['x'] - particle['size']), int(particle['y'] - particle['size'])))
+        # Buttons
+        layers.append(self.button_layer('spin', self.spin_button, self.button_font))
         
-        # Draw win lines
-        if self.winning_lines and self.win_animation_timer > 0:
-            self.draw_win_lines()
+        # Lines controls
+        lines_text = self.ways_text().capitalize() if self.engine.game.ways else f"Lines: {self.lines}"
+        lines_label = self.render_text(self.small_font, lines_text, WHITE)
+        lines_x = self.lines_down.rect.centerx + (self.lines_up.rect.centerx - self.lines_down.rect.centerx) // 2
+        layers.append(self.text_layer('lines_label', self.small_font, lines_text, WHITE,
+                                      pos=(lines_x - lines_label.get_width() // 2, self.lines_down.rect.y - 30)))
+        layers.append(self.button_layer('lines_down', self.lines_down, self.button_font))
+        layers.append(self.button_layer('lines_up', self.lines_up, self.button_font))
         
-        # Draw bonus trigger animation
-        if self.bonus_animation_timer > 0:
-            self.draw_bonus_animation()
-            self.bonus_animation_timer -= 1
+        # Bet configuration arrow button
+        layers.append(self.button_layer('bet_config', self.bet_config_button, self.button_font))
         
-        # Message with rainbow effect for wins
+        # Exit button
+        layers.append(self.button_layer('exit', self.exit_button, self.button_font))
+        return layers
+    
+    def draw_main_screen(self):
+        """Draw the main game screen"""
+        self.draw_main_static(self.screen)
+        self.profiler.lap('static')
+        layers = self.main_screen_layers()
+        self.profiler.lap('layout')
+        self.draw_layers(layers)
+    
+    def draw_layers(self, layers):
+        """Draw screen layers in order, timing each under its frame phase"""
+        lap = self.profiler.lap
+        for name, rect, key, draw in layers:
+            draw()
+            lap(self.layer_phases.get(name, 'text'))
+    
+    def hud_layer(self):
+        """Layer for the frame timing HUD"""
+        hud = self.profiler.render_hud(self.small_font)
+        return ('hud', hud.get_rect(topright=(SCREEN_WIDTH - 10, 10)), None, self.draw_hud)
+    
+    def draw_hud(self):
+        """Draw the frame timing HUD in the top right corner"""
+        hud = self.profiler.render_hud(self.small_font)
+        self.screen.blit(hud, hud.get_rect(topright=(SCREEN_WIDTH - 10, 10)))
+    
+    def draw_message(self):
+        """Draw the message box, with a rainbow effect for wins"""
         msg_bg = pygame.Rect(SCREEN_WIDTH * 0.2, SCREEN_HEIGHT * 0.74, SCREEN_WIDTH * 0.6, SCREEN_HEIGHT * 0.055)
+        win_message = self.total_win > 0 and self.win_animation_timer > 0
         
         # Gradient background for message
-        if self.total_win > 0 and self.win_animation_timer > 0:
+        if win_message:
             # Animated gradient for win message
             for i in range(int(msg_bg.height)):
                 progress = i / msg_bg.height
@@ -993,49 +1682,29 @@ class SlotMachineGame:
                 border_color = [NEON_YELLOW, GOLD, NEON_ORANGE, ORANGE][i % 4]
                 pygame.draw.rect(self.screen, border_color, msg_bg.inflate(i*2, i*2), 2, border_radius=10 + i)
             
-            # Pulsing text
-            scale = 1.0 + 0.1 * math.sin(self.win_flash / 3)
             msg_color = NEON_YELLOW if self.win_flash % 10 < 5 else GOLD
         else:
             pygame.draw.rect(self.screen, (20, 20, 30), msg_bg, border_radius=10)
             pygame.draw.rect(self.screen, BLUE, msg_bg, 3, border_radius=10)
             msg_color = WHITE
         
-        msg_text = self.text_font.render(self.message, True, msg_color)
+        msg_text = self.render_text(self.text_font, self.message, msg_color)
         msg_rect = msg_text.get_rect(center=msg_bg.center)
         
         # Add glow to win messages
-        if self.total_win > 0 and self.win_animation_timer > 0:
-            msg_glow = self.text_font.render(self.message, True, ORANGE)
+        if win_message:
+            msg_glow = self.render_text(self.text_font, self.message, ORANGE)
             for offset in [(3, 3), (-3, 3), (3, -3), (-3, -3), (0, 3), (3, 0), (0, -3), (-3, 0)]:
                 self.screen.blit(msg_glow, (msg_rect.x + offset[0], msg_rect.y + offset[1]))
         
         self.screen.blit(msg_text, msg_rect)
-        
-        # Buttons
-        self.spin_button.draw(self.screen, self.button_font)
-        
-        # Lines controls
-        lines_label = self.small_font.render(f"Lines: {self.lines}", True, WHITE)
-        lines_x = self.lines_down.rect.centerx + (self.lines_up.rect.centerx - self.lines_down.rect.centerx) // 2
-        self.screen.blit(lines_label, (lines_x - lines_label.get_width() // 2, self.lines_down.rect.y - 30))
-        self.lines_down.draw(self.screen, self.button_font)
-        self.lines_up.draw(self.screen, self.button_font)
-        
-        # Bet configuration arrow button
-        self.bet_config_button.draw(self.screen, self.button_font)
-        
-        # Exit button
-        self.exit_button.draw(self.screen, self.button_font)
-        
-        # Instructions
-        inst_text = self.small_font.render("SPACE to spin | ► for bet config | ESC to exit", True, LIGHT_GRAY)
-        self.screen.blit(inst_text, (20, SCREEN_HEIGHT - 30))
     
-    def draw_bet_config_screen(self):
-        """Draw the bet configuration screen"""
-        import math
-        
+    def draw_particles(self):
+        """Draw the celebration particles"""
+        self.particles.draw(self.screen)
+    
+    def draw_bet_config_static(self, surface):
+        """Draw the parts of the bet configuration screen that never change"""
         # Title
         title_text = "⚙️ BET CONFIGURATION ⚙️"
         title_surf = self.title_font.render(title_text, True, NEON_YELLOW)
@@ -1044,69 +1713,71 @@ class SlotMachineGame:
         # Glowing title
         title_glow = self.title_font.render(title_text, True, GOLD)
         for offset in [(4, 4), (-4, 4), (4, -4), (-4, -4)]:
-            self.screen.blit(title_glow, (title_rect.x + offset[0], title_rect.y + offset[1]))
-        self.screen.blit(title_surf, title_rect)
-        
-        # Back button
-        self.back_button.draw(self.screen, self.button_font)
+            surface.blit(title_glow, (title_rect.x + offset[0], title_rect.y + offset[1]))
+        surface.blit(title_surf, title_rect)
         
-        # Current bet display (large)
-        current_bet_text = f"Current Bet Per Line: ${self.bet_per_line}"
-        current_bet_surf = self.text_font.render(current_bet_text, True, NEON_PINK)
-        current_bet_rect = current_bet_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 0.2))
-        
-        # Glowing current bet
-        bet_glow = self.text_font.render(current_bet_text, True, MAGENTA)
-        for offset in [(3, 3), (-3, 3), (3, -3), (-3, -3)]:
-            self.screen.blit(bet_glow, (current_bet_rect.x + offset[0], current_bet_rect.y + offset[1]))
-        self.screen.blit(current_bet_surf, current_bet_rect)
-        
-        # Total bet preview
-        total_text = f"Total Bet: ${self.bet_per_line * self.lines} ({self.lines} lines)"
-        total_surf = self.text_font.render(total_text, True, NEON_GREEN)
-        total_rect = total_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 0.26))
-        self.screen.blit(total_surf, total_rect)
-        
-        # Basic bet controls (larger, centered)
-        bet_label = self.small_font.render(f"Bet: {self.bet_per_line}", True, WHITE)
-        bet_x = self.bet_down.rect.centerx + (self.bet_up.rect.centerx - self.bet_down.rect.centerx) // 2
-        self.screen.blit(bet_label, (bet_x - bet_label.get_width() // 2, self.bet_down.rect.y - 30))
-        self.bet_down.draw(self.screen, self.button_font)
-        self.bet_up.draw(self.screen, self.button_font)
-        
-        # Quick bet controls (with more space)
+        # Section labels
         quick_label = self.small_font.render("Quick Bet Controls:", True, NEON_YELLOW)
         quick_label_rect = quick_label.get_rect(center=(SCREEN_WIDTH // 2, self.bet_min.rect.y - 35))
-        self.screen.blit(quick_label, quick_label_rect)
+        surface.blit(quick_label, quick_label_rect)
         
-        self.bet_min.draw(self.screen, self.small_font)
-        self.bet_half.draw(self.screen, self.small_font)
-        self.bet_double.draw(self.screen, self.small_font)
-        self.bet_max.draw(self.screen, self.small_font)
-        
-        # Preset bet buttons (nicely spaced)
         preset_label = self.small_font.render("Preset Bet Amounts:", True, NEON_GREEN)
         preset_label_rect = preset_label.get_rect(center=(SCREEN_WIDTH // 2, self.preset_bet_1.rect.y - 35))
-        self.screen.blit(preset_label, preset_label_rect)
-        
-        self.preset_bet_1.draw(self.screen, self.small_font)
-        self.preset_bet_5.draw(self.screen, self.small_font)
-        self.preset_bet_10.draw(self.screen, self.small_font)
-        self.preset_bet_25.draw(self.screen, self.small_font)
-        self.preset_bet_50.draw(self.screen, self.small_font)
-        self.preset_bet_100.draw(self.screen, self.small_font)
+        surface.blit(preset_label, preset_label_rect)
         
         # Instructions
         inst_text = self.small_font.render("Configure your bet | Press ◄ or ESC to return to game", True, LIGHT_GRAY)
         inst_rect = inst_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30))
-        self.screen.blit(inst_text, inst_rect)
+        surface.blit(inst_text, inst_rect)
+    
+    def ways_text(self):
+        """Active lines, or the ways of a ways game, for labels"""
+        game = self.engine.game
+        if not game.ways:
+            return f"{self.lines} lines"
+        return f"{game.max_ways:,} ways" if game.fixed_heights else f"up to {game.max_ways:,} ways"
+    
+    def bet_config_layers(self):
+        """Changing parts of the bet configuration screen, like main_screen_layers()"""
+        layers = [self.button_layer('back', self.back_button, self.button_font)]
+        
+        # Current bet display (large, glowing)
+        layers.append(self.text_layer('current_bet', self.text_font, f"Current Bet Per Line: ${self.bet_per_line}", NEON_PINK,
+                                      center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 0.2), glow=MAGENTA,
+                                      offsets=[(3, 3), (-3, 3), (3, -3), (-3, -3)]))
+        
+        # Total bet preview
+        layers.append(self.text_layer('total_bet', self.text_font, f"Total Bet: ${self.bet_per_line * self.lines} ({self.ways_text()})",
+                                      NEON_GREEN, center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 0.26)))
+        
+        # Basic bet controls (larger, centered)
+        bet_label = self.render_text(self.small_font, f"Bet: {self.bet_per_line}", WHITE)
+        bet_x = self.bet_down.rect.centerx + (self.bet_up.rect.centerx - self.bet_down.rect.centerx) // 2
+        layers.append(self.text_layer('bet_label', self.small_font, f"Bet: {self.bet_per_line}", WHITE,
+                                      pos=(bet_x - bet_label.get_width() // 2, self.bet_down.rect.y - 30)))
+        layers.append(self.button_layer('bet_down', self.bet_down, self.button_font))
+        layers.append(self.button_layer('bet_up', self.bet_up, self.button_font))
+        
+        # Quick bet controls and preset bet buttons
+        for name in ['bet_min', 'bet_half', 'bet_double', 'bet_max', 'preset_bet_1', 'preset_bet_5',
+                     'preset_bet_10', 'preset_bet_25', 'preset_bet_50', 'preset_bet_100']:
+            layers.append(self.button_layer(name, getattr(self, name), self.small_font))
+        return layers
+    
+    def draw_bet_config_screen(self):
+        """Draw the bet configuration screen"""
+        self.draw_bet_config_static(self.screen)
+        self.profiler.lap('static')
+        layers = self.bet_config_layers()
+        self.profiler.lap('layout')
+        self.draw_layers(layers)
     
     def draw_transition(self):
         """Draw transition overlay effect"""
         import math
         
         # Calculate transition progress
-        t = self.transition_progress
+        t = min(1.0, self.transition_progress + TRANSITION_SPEED * self.tick_alpha)
         eased_progress = t * t * (3.0 - 2.0 * t)  # Smoothstep
         
         # Fade overlay
@@ -1115,231 +1786,190 @@ class SlotMachineGame:
         overlay.fill((0, 0, 0, alpha))
         self.screen.blit(overlay, (0, 0))
     
+    def reel_border_colors(self, reel_idx):
+        """Border colors for a reel: animated rainbow while spinning"""
+        if self.reel_spinning[reel_idx]:
+            color_phase = (self.background_phase + reel_idx * 60) % 360
+            return [
+                NEON_BLUE if color_phase < 120 else NEON_GREEN if color_phase < 240 else NEON_PINK,
+                CYAN,
+                BLUE
+            ]
+        return [GOLD, ORANGE, DARK_GRAY]
+    
+    def reel_window(self, reel_idx):
+        """(symbols, first index, rows, splice row, jump) to draw: the scrolling strip, or the settled grid column"""
+        if self.reel_spinning[reel_idx]:
+            return (self.engine.strips[reel_idx], self.reel_pos[reel_idx], self.engine.heights[reel_idx] + 2,
+                    self.reel_splice[reel_idx], self.reel_jump[reel_idx])
+        return self.engine.grid[reel_idx], 0, self.engine.heights[reel_idx], 0, 0
+    
+    def symbol_height(self, reel_idx):
+        """Height of one cell of a reel: reels of a ways game show a different number of cells every spin"""
+        return self.reel_height / self.engine.heights[reel_idx]
+    
+    def reel_draw_offset(self, reel_idx):
+        """Scroll offset of a reel, interpolated towards the next tick while it spins"""
+        if self.reel_spinning[reel_idx]:
+            return int(self.reel_offset[reel_idx] + self.reel_speed[reel_idx] * self.tick_alpha)
+        return self.reel_offset[reel_idx]
+    
+    def reel_key(self, reel_idx):
+        """Everything that changes how a reel looks"""
+        if self.reel_spinning[reel_idx]:
+            shown = (self.reel_pos[reel_idx], self.reel_splice[reel_idx])
+        else:
+            shown = tuple(self.engine.grid[reel_idx])
+        return (self.reel_draw_offset(reel_idx), shown, self.engine.heights[reel_idx],
+                tuple(self.reel_border_colors(reel_idx)))
+    
     def draw_reels(self):
         """Draw all reels with symbols"""
-        import math
-        for reel_idx in range(REELS):
-            x, y = self.reel_positions[reel_idx]
-            
-            # Reel background with gradient
-            reel_rect = pygame.Rect(x, y, self.reel_width, self.reel_height)
-            
-            # Draw gradient for reel
-            for i in range(int(self.reel_height)):
-                progress = i / self.reel_height
-                brightness = int(230 + 25 * math.sin(progress * 3.14159))
-                blue_brightness = min(255, brightness + 15)
-                pygame.draw.rect(self.screen, (brightness, brightness, blue_brightness), 
-                               pygame.Rect(x, y + i, self.reel_width, 1))
-            
-            # Colorful border with glow
-            if self.reel_spinning[reel_idx]:
-                # Spinning reel gets animated rainbow border
-                color_phase = (self.background_phase + reel_idx * 60) % 360
-                border_colors = [
-                    NEON_BLUE if color_phase < 120 else NEON_GREEN if color_phase < 240 else NEON_PINK,
-                    CYAN,
-                    BLUE
-                ]
-            else:
-                border_colors = [GOLD, ORANGE, DARK_GRAY]
-            
-            for i, color in enumerate(border_colors):
-                pygame.draw.rect(self.screen, color, reel_rect.inflate(i*2, i*2), 2, border_radius=10 + i)
-            
-            # Clip to reel area
-            clip_rect = pygame.Rect(x + 5, y + 5, self.reel_width - 10, self.reel_height - 10)
-            self.screen.set_clip(clip_rect)
-            
-            # Draw symbols
-            for row in range(ROWS + 2):
-                symbol_y = y + row * self.symbol_height - self.reel_offset[reel_idx]
-                
-                if self.reel_spinning[reel_idx]:
-                    symbol = self.reels[reel_idx][row % len(self.reels[reel_idx])]
-                else:
-                    if row < ROWS:
-                        symbol = self.reels[reel_idx][row]
-                    else:
-                        continue
-                
-                symbol_surf = self.emoji_font.render(symbol, True, BLACK)
-                symbol_rect = symbol_surf.get_rect(center=(x + self.reel_width // 2, symbol_y + self.symbol_height // 2))
-                self.screen.blit(symbol_surf, symbol_rect)
-            
-            self.screen.set_clip(None)
-            
-            # Reel number
-            reel_num = self.small_font.render(f"{reel_idx + 1}", True, WHITE)
-            self.screen.blit(reel_num, (x + 5, y - 25))
+        for reel_idx in range(self.engine.game.reels):
+            self.draw_reel(reel_idx)
+    
+    def draw_reel(self, reel_idx):
+        """Draw one reel: background, border and symbols"""
+        x, y = self.reel_positions[reel_idx]
+        reel_rect = pygame.Rect(x, y, self.reel_width, self.reel_height)
+        
+        # Reel background with gradient (pre-rendered)
+        self.screen.blit(self.reel_surface, (x, y))
+        
+        # Colorful border with glow
+        for i, color in enumerate(self.reel_border_colors(reel_idx)):
+            pygame.draw.rect(self.screen, color, reel_rect.inflate(i*2, i*2), 2, border_radius=10 + i)
+        
+        # Clip to reel area (inside any clip already set)
+        old_clip = self.screen.get_clip()
+        clip_rect = pygame.Rect(x + 5, y + 5, self.reel_width - 10, self.reel_height - 10)
+        self.screen.set_clip(clip_rect.clip(old_clip))
+        
+        # Draw symbols
+        offset = self.reel_draw_offset(reel_idx)
+        strip, first, rows, splice, jump = self.reel_window(reel_idx)
+        symbol_height = self.symbol_height(reel_idx)
+        for row in range(rows):
+            symbol = strip[(first + row + (jump if row >= splice else 0)) % len(strip)]
+            symbol_y = y + row * symbol_height - offset
+            self.glyphs.blit(self.screen, symbol, (x + self.reel_width // 2, symbol_y + symbol_height // 2))
+        
+        self.screen.set_clip(old_clip)
+        
+        # Reel number
+        reel_num = self.render_text(self.small_font, f"{reel_idx + 1}", WHITE)
+        self.screen.blit(reel_num, (x + 5, y - 25))
     
     def draw_win_lines(self):
         """Draw animated rainbow win lines with particles"""
-        import math
-        
         # Pulsing alpha animation
         pulse = math.sin(self.win_flash / 3) * 0.3 + 0.7
-        alpha = int(220 * pulse)
         
-        line_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        # Sparkle effect
+        sparkle_size = 15 + int(5 * math.sin(self.win_flash / 2)) if self.win_flash % 8 < 4 else 0
         
-        # Rainbow colors that cycle
-        rainbow_colors = [
-            NEON_PINK, NEON_ORANGE, NEON_YELLOW, NEON_GREEN, 
-            NEON_BLUE, ELECTRIC_BLUE, PURPLE, MAGENTA, HOT_PINK
-        ]
-        
-        for idx, win_info in enumerate(self.winning_lines):
+        colors = len(WinLineSprites.COLORS)
+        for win_info in self.winning_lines:
             line = win_info['line']
-            line_idx = win_info['line_idx']
             match_count = win_info['count']
+            if match_count < 2:
+                continue
             
-            # Cycle through rainbow colors with animation
-            color_idx = (line_idx + self.win_flash // 4) % len(rainbow_colors)
-            color = rainbow_colors[color_idx]
+            # Cycle through rainbow colors with animation: a color per win line, or per symbol for ways
+            key = win_info['symbol_id'] if self.engine.game.ways else win_info['line_idx']
+            color_idx = (key + self.win_flash // 4) % colors
             
-            # Calculate line path
+            # Line path through the matched reels, with a wave effect
             points = []
             for reel in range(match_count):
                 x, y = self.reel_positions[reel]
-                row = line[reel]
-                point_x = x + self.reel_width // 2
-                point_y = y + row * self.symbol_height + self.symbol_height // 2
-                
-                # Add wave effect to points
+                symbol_height = self.symbol_height(reel)
+                center = y + line[reel] * symbol_height + symbol_height // 2
                 wave_offset = math.sin(self.win_flash / 5 + reel * 0.5) * 5
-                points.append((point_x, point_y + wave_offset))
+                points.append((x + self.reel_width // 2, center, center + wave_offset))
             
-            if len(points) >= 2:
-                # Draw multiple gradient layers for glow effect
-                for layer in range(5, 0, -1):
-                    layer_alpha = alpha // (6 - layer)
-                    layer_width = 4 + layer * 4
-                    
-                    # Alternate colors for rainbow effect
-                    layer_color_idx = (color_idx + layer) % len(rainbow_colors)
-                    layer_color = rainbow_colors[layer_color_idx]
-                    color_with_alpha = (*layer_color, layer_alpha)
-                    
-                    pygame.draw.lines(line_surface, color_with_alpha, False, points, layer_width)
-                
-                # Draw glowing circles at connection points
-                for i, point in enumerate(points):
-                    # Outer glow
-                    for radius in range(25, 5, -4):
-                        circle_alpha = alpha // (26 - radius) * 2
-                        glow_color_idx = (color_idx + radius // 5) % len(rainbow_colors)
-                        glow_color = rainbow_colors[glow_color_idx]
-                        circle_color = (*glow_color, min(255, circle_alpha))
-                        pygame.draw.circle(line_surface, circle_color, (int(point[0]), int(point[1])), radius)
-                    
-                    # Bright center
-                    pygame.draw.circle(line_surface, (255, 255, 255, alpha), (int(point[0]), int(point[1])), 6)
-                    
-                    # Sparkle effect
-                    if self.win_flash % 8 < 4:
-                        sparkle_size = 15 + int(5 * math.sin(self.win_flash / 2))
-                        pygame.draw.circle(line_surface, (*NEON_YELLOW, alpha), (int(point[0]), int(point[1])), sparkle_size, 2)
-        
-        self.screen.blit(line_surface, (0, 0))
+            self.win_line_sprites.draw(self.screen, points, color_idx, pulse, sparkle_size)
         
         # Draw win particles
-        for particle in self.win_particles:
-            particle_surface = pygame.Surface((int(particle['size']*2), int(particle['size']*2)), pygame.SRCALPHA)
-            pygame.draw.circle(particle_surface, (*particle['color'], particle['alpha']), 
-                             (int(particle['size']), int(particle['size'])), int(particle['size']))
-            self.screen.blit(particle_surface, (int(particle['x'] - particle['size']), int(particle['y'] - particle['size'])))
+        self.win_particles.draw(self.screen)
     
     def draw_bonus_animation(self):
         """Draw bonus trigger celebration overlay"""
-        import math
-        
-        # Create semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        
-        # Pulsing background
-        alpha = int(100 + 50 * math.sin(self.bonus_animation_timer / 5))
-        overlay.fill((0, 0, 0, alpha))
-        
-        # Big "BONUS!" text
-        progress = (120 - self.bonus_animation_timer) / 120
-        if progress < 0.5:
-            # Zoom in
-            scale = progress * 2
-        else:
-            # Slight bounce
-            scale = 1.0 + 0.1 * math.sin((progress - 0.5) * 10)
-        
-        bonus_font = pygame.font.Font(None, int(SCREEN_HEIGHT * 0.15 * scale))
-        
-        # Rainbow color cycling
-        color_phase = (self.bonus_animation_timer * 10) % 360
-        if color_phase < 60:
-            text_color = NEON_PINK
-        elif color_phase < 120:
-            text_color = NEON_ORANGE
-        elif color_phase < 180:
-            text_color = NEON_YELLOW
-        elif color_phase < 240:
-            text_color = NEON_GREEN
-        elif color_phase < 300:
-            text_color = NEON_BLUE
-        else:
-            text_color = MAGENTA
-        
-        # Draw "BONUS!" with glow
-        bonus_text = "🎁 BONUS! 🎁"
-        for offset in range(10, 0, -2):
-            glow_alpha = int(150 * (offset / 10))
-            glow_color = (*text_color, glow_alpha)
-            glow_surf = bonus_font.render(bonus_text, True, text_color)
-            glow_surf.set_alpha(glow_alpha)
-            glow_rect = glow_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100))
-            overlay.blit(glow_surf, (glow_rect.x + offset, glow_rect.y + offset))
-        
-        main_text = bonus_font.render(bonus_text, True, WHITE)
-        main_rect = main_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 100))
-        overlay.blit(main_text, main_rect)
-        
-        # Free spins count
-        fs_font = pygame.font.Font(None, int(SCREEN_HEIGHT * 0.08))
-        bonus_spins = 5 + (self.scatter_count - 3) * 2
-        fs_text = fs_font.render(f"{bonus_spins} FREE SPINS!", True, NEON_YELLOW)
-        fs_rect = fs_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        overlay.blit(fs_text, fs_rect)
-        
-        # Scatter count
-        scatter_font = pygame.font.Font(None, int(SCREEN_HEIGHT * 0.05))
-        scatter_text = scatter_font.render(f"({self.scatter_count} Scatters!)", True, NEON_GREEN)
-        scatter_rect = scatter_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 80))
-        overlay.blit(scatter_text, scatter_rect)
-        
-        # Fireworks particles
-        if self.bonus_animation_timer % 5 == 0:
-            for _ in range(5):
-                x = random.randint(0, SCREEN_WIDTH)
-                y = random.randint(0, SCREEN_HEIGHT)
-                self.create_particle(x, y)
-        
-        self.screen.blit(overlay, (0, 0))
+        self.bonus_animation.draw(self.screen, self.bonus_animation_timer, self.scatter_count,
+                                  self.engine.game.bonus_spins_for_scatters(self.scatter_count))
     
-    def run(self):
+    def run(self, fps=FPS):
         print("=" * 60)
         print("PySlot - Professional Casino Slot Machine")
         print("=" * 60)
         print("✓ Game started in fullscreen mode")
         print("=" * 60)
         
+        profiler = self.profiler
+        profiler.start()
+        last = time.perf_counter()
         while self.running:
             self.handle_events()
-            self.update_spin_animation()
-            self.update_transition()  # Update screen transitions
+            profiler.lap('events')
+            now = time.perf_counter()
+            self.advance(now - last)
+            last = now
             self.draw()
-            self.clock.tick(FPS)
-        
+            self.clock.tick(fps)
+            profiler.lap('wait')
+            profiler.end_frame()
+        
+        if self.engine.stats is not None and self.engine.stats.spins:
+            report = self.engine.stats.report()
+            print(f"✓ Session: {report['spins']} spins, RTP {report['rtp']:.2%}, hit rate {report['hit_rate']:.2%}, "
+                  f"99.9th percentile win {report['win_quantiles']['p99.9']:.1f}x bet")
+        if self.engine.journal is not None:
+            self.engine.journal.close()
+        if self.engine.recorder is not None:
+            self.engine.recorder.close()
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
-    game = SlotMachineGame()
-    game.run()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="PySlot - Professional Slot Machine")
+    parser.add_argument("--low-power", action="store_true",
+                        help="redraw only changed screen regions (static background)")
+    parser.add_argument("--profile-dir", default="profiles",
+                        help="where F12 writes profiler captures and frame timing CSVs")
+    parser.add_argument("--cache-dir", default=None,
+                        help="asset cache for sounds and the emoji font (default: ~/.cache/pyslot)")
+    parser.add_argument("--no-cache", action="store_true", help="synthesize and probe everything at startup")
+    parser.add_argument("--fps", type=int, default=FPS,
+                        help="render frame cap, e.g. 120 or 144 for high-refresh panels (animation speed is unaffected)")
+    parser.add_argument("--game", default=DEFAULT_GAME,
+                        help="game definition file or bundled game name, e.g. grand_6x5")
+    parser.add_argument("--journal", default=None, help="append every settled spin to this binary journal file")
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="interval",
+                        help="when journal writes are synced to disk (default: at most once a second)")
+    parser.add_argument("--seed", type=int, default=None, help="seed the spin RNG (reproducible outcomes)")
+    parser.add_argument("--record", default=None,
+                        help="record the seed and every input to this file for python -m pyslot.replay")
+    parser.add_argument("--server", default=None, metavar="ADDRESS",
+                        help="play a session on a pyslot.server (host:port or unix:/path) and only render it here")
+    args = parser.parse_args()
+    
+    if args.server and (args.journal or args.record):
+        parser.error("--journal and --record apply to local play; the server owns remote sessions")
+    if args.server:
+        try:
+            engine = RemoteEngine(args.server, args.game, seed=args.seed)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Cannot play on {args.server}: {e}")
+            sys.exit(1)
+    elif args.record:
+        engine = record_session(args.record, coins, args.game, args.seed)
+    else:
+        engine = SlotEngine(coins, seed=args.seed, game=load_game(args.game))
+    engine.stats = StreamingStats()
+    if args.journal:
+        engine.journal = JournalWriter(args.journal, engine.game, fsync=args.fsync)
+    game = SlotMachineGame(engine, dirty_rendering=args.low_power,
+                           profile_dir=args.profile_dir, assets=AssetCache(args.cache_dir, enabled=not args.no_cache))
+    game.run(args.fps)
@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+from pyslot.engine import STARTING_COINS
+from pyslot.server import GameServer
+
+MALFORMED = [
+    b'{"op":"spin","session":[1]}\n',
+    b'{"op":"spin","session":{"a":1}}\n',
+    b'{"op":"spin","session":true}\n',
+    b'{"op":"open","game":["x"]}\n',
+    b'{"op":"open","game":{"a":1}}\n',
+    b'{"op":"open","coins":"lots"}\n',
+    b'{"op":["spin"]}\n',
+    b'[1, 2]\n',
+    b'not json\n',
+]
+
+
+async def _exchange(lines):
+    server = GameServer()
+    listener = await asyncio.start_server(server.serve_client, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    async def request(line):
+        writer.write(line)
+        return json.loads(await reader.readline())
+
+    opened = await request(b'{"op":"open","game":"classic"}\n')
+    responses = [await request(line) for line in lines]
+    spin = await request(json.dumps({'op': 'spin', 'session': opened['session']}).encode() + b"\n")
+    sessions = len(server.sessions)
+    writer.close()
+    listener.close()
+    await listener.wait_closed()
+    return opened, responses, spin, sessions
+
+
+def test_malformed_requests_keep_connection_and_sessions():
+    opened, responses, spin, sessions = asyncio.run(_exchange(MALFORMED))
+    assert opened['ok']
+    for response in responses:
+        assert response['ok'] is False
+        assert response['error']
+    assert spin['ok'] and spin['played']
+    assert sessions == 1
+
+
+def test_unexpected_errors_become_error_responses():
+    server = GameServer()
+
+    def broken(request, owned):
+        raise KeyError("boom")
+
+    server.handle = broken
+    response = json.loads(server.respond(b'{"op":"ping","id":3}', set()))
+    assert response == {'ok': False, 'error': "internal error: KeyError", 'id': 3}
+
+
+def test_only_trusted_clients_pick_coins_and_seed():
+    server = GameServer()
+    for fixed in (b'"coins":1000000', b'"seed":1'):
+        response = json.loads(server.respond(b'{"op":"open","game":"classic",' + fixed + b'}', set()))
+        assert response == {'ok': False, 'error': "coins and seed are set by the server"}
+    opened = json.loads(server.respond(b'{"op":"open","game":"classic"}', set()))
+    assert opened['ok'] and opened['state']['coins'] == STARTING_COINS
+
+    trusted = GameServer(trust_clients=True)
+    opened = json.loads(trusted.respond(b'{"op":"open","game":"classic","coins":50,"seed":1}', set()))
+    assert opened['ok'] and opened['state']['coins'] == 50
+    for coins in (0, -5):
+        line = json.dumps({'op': 'open', 'game': 'classic', 'coins': coins}).encode()
+        assert json.loads(trusted.respond(line, set()))['ok'] is False
@@ -0,0 +1,31 @@
+import numpy as np
+
+from pyslot.streaming import StreamingStats
+
+
+def _wins(rng, n):
+    return rng.choice([0, 0, 0, 5, 20, 200], size=n).astype(np.int64)
+
+
+def test_merge_keeps_open_session_boundary():
+    rng = np.random.default_rng(7)
+    before, other, after = _wins(rng, 150), _wins(rng, 230), _wins(rng, 275)
+
+    merged = StreamingStats(session_spins=100)
+    merged.update(before, 10)
+    part = StreamingStats(session_spins=100)
+    part.update(other, 10)
+    merged.merge(part)
+    for win in after[:30]:
+        merged.add(int(win), 10)
+    merged.update(after[30:], 10)
+
+    # The same sessions from one uninterrupted stream plus the other part
+    expected = StreamingStats(session_spins=100)
+    expected.update(np.concatenate([before, after]), 10)
+    expected.drawdowns.merge(part.drawdowns)
+
+    assert merged.spins == 655
+    assert merged.drawdowns.count == expected.drawdowns.count == 6
+    assert np.array_equal(merged.drawdowns.counts, expected.drawdowns.counts)
+    assert merged.drawdowns.zeros == expected.drawdowns.zeros